@@ -0,0 +1,92 @@
+"""
+Micro-benchmark of the extraction of image URLs and chapter notes from viewer pages.
+
+It compares the incremental scan used by `WebtoonViewerPageExtractor` with a full BeautifulSoup parse of the same
+pages, and reports the mean time per page of each. Without saved pages, it uses a synthetic viewer page shaped like
+the real ones: a large head of inline scripts, the image area, then the notes, comments and recommendations.
+
+Usage:
+    python -m benchmarks.extract
+    python -m benchmarks.extract saved/viewer-1.html saved/viewer-2.html --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from rich.console import Console
+from rich.table import Table
+
+from webtoon_downloader.core.webtoon.extractor import scan_img_urls, scan_text
+
+
+def synthetic_viewer_page(pages: int = 100, comments: int = 200) -> str:
+    """Returns a viewer page with `pages` images, followed by `comments` comments and the usual trailing markup."""
+    script = "<script>var config = {" + ", ".join(f"key{n}: 'value {n}'" for n in range(2000)) + "};</script>"
+    imgs = "".join(
+        f"<img src='https://webtoons-static.pstatic.net/image/bg_transparency.png' class='_images' "
+        f"data-url='https://webtoon-phinf.pstatic.net/img/1/{page}.jpg?type=q90' width='800' height='1280' />"
+        for page in range(1, pages + 1)
+    )
+    trailer = "".join(
+        f"<li class='comment'><span class='author'>Reader {n}</span><p class='text'>Comment number {n}</p></li>"
+        for n in range(comments)
+    )
+    return (
+        f"<html><head><title>Episode 1</title>{script}</head><body>"
+        "<div id='header'><ul class='menu'>" + "<li><a href='#'>Menu</a></li>" * 50 + "</ul></div>"
+        f"<div class='viewer_lst'><div class='viewer_img _img_viewer_area'>{imgs}</div></div>"
+        "<div class='creator_note'><p class='author_text'>Notes of the episode</p></div>"
+        f"<ul class='comments'>{trailer}</ul>{script}"
+        "</body></html>"
+    )
+
+
+def _scan(html: str) -> None:
+    scan_img_urls(html)
+    scan_text(html, "author_text")
+
+
+def _soup(html: str) -> None:
+    soup = BeautifulSoup(html, "lxml")
+    soup.find(class_="viewer_img _img_viewer_area").find_all("img")  # type: ignore[union-attr]
+    soup.find(class_="author_text")
+
+
+def _time(extract: Callable[[str], None], pages: list[str], repeat: int) -> float:
+    """Returns the mean number of seconds taken to extract a page."""
+    seconds = timeit.timeit(lambda: [extract(page) for page in pages], number=repeat)
+    return seconds / repeat / len(pages)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.extract", description=__doc__.splitlines()[1])
+    parser.add_argument("pages", nargs="*", type=Path, help="Saved viewer pages, a synthetic page if none")
+    parser.add_argument("--repeat", type=int, default=50, help="Number of times every page is extracted")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    pages = [path.read_text(encoding="utf-8") for path in args.pages] or [synthetic_viewer_page()]
+
+    scan = _time(_scan, pages, args.repeat)
+    soup = _time(_soup, pages, args.repeat)
+
+    table = Table(title=f"Extraction of {len(pages)} viewer page(s)")
+    table.add_column("Parser")
+    table.add_column("ms/page", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_row("BeautifulSoup (lxml)", f"{soup * 1000:.2f}", "1.0x")
+    table.add_row("Incremental scan", f"{scan * 1000:.2f}", f"{soup / scan:.1f}x")
+    Console().print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
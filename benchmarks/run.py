@@ -0,0 +1,272 @@
+"""
+End-to-end throughput benchmark of `download_webtoon` against a local fake Webtoon server.
+
+Every storage type is downloaded in a child process of its own, so that its peak RSS and CPU time are measured
+in isolation. The fake server runs in this process and counts the bytes and the 429 responses it serves.
+
+Usage:
+    python -m benchmarks.run --episodes 20 --pages 20 --latency-ms 20 --bandwidth-mbps 50 --rate-limit 0.02
+    python -m benchmarks.run --json results.json
+    python -m benchmarks.run --baseline results.json --tolerance 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import get_args
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.server import FakeSeriesConfig, FakeWebtoonServer, LocalTransport
+from webtoon_downloader.core.webtoon.downloaders import comic
+from webtoon_downloader.core.webtoon.downloaders.options import StorageType, WebtoonDownloadOptions
+
+STORAGE_TYPES: tuple[StorageType, ...] = get_args(StorageType)
+
+MB = 1024 * 1024
+
+
+@dataclass
+class WorkerResult:
+    """
+    Measurements of a single download, taken by the child process running it.
+
+    Attributes:
+        pages       : The number of pages downloaded.
+        seconds     : The wall-clock duration of the download.
+        peak_rss_mb : The peak resident set size of the child process, in MiB.
+        cpu_seconds : The user and system CPU time of the child process and its own children.
+    """
+
+    pages: int
+    seconds: float
+    peak_rss_mb: float
+    cpu_seconds: float
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements of the download of the synthetic series with a storage type.
+
+    Attributes:
+        storage         : The storage type.
+        pages           : The number of pages downloaded.
+        seconds         : The wall-clock duration of the download.
+        pages_per_s     : The number of pages downloaded per second.
+        mb_per_s        : The number of image MiB served per second.
+        peak_rss_mb     : The peak resident set size of the process downloading, in MiB.
+        cpu_seconds     : The CPU time of the process downloading, including the transcoding workers.
+        requests        : The number of requests served.
+        rate_limited    : The number of requests answered with a 429 status.
+    """
+
+    storage: StorageType
+    pages: int
+    seconds: float
+    pages_per_s: float
+    mb_per_s: float
+    peak_rss_mb: float
+    cpu_seconds: float
+    requests: int
+    rate_limited: int
+
+
+def _peak_rss_mb() -> float:
+    """Returns the peak resident set size of this process, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes
+    return peak / MB if sys.platform == "darwin" else peak / 1024
+
+
+def _cpu_seconds() -> float:
+    """Returns the CPU time used by this process and its terminated children."""
+    usages = [resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)]
+    return sum(usage.ru_utime + usage.ru_stime for usage in usages)
+
+
+async def _run_worker(args: argparse.Namespace) -> WorkerResult:
+    """Downloads the synthetic series once, from within the child process."""
+    config = FakeSeriesConfig(title_no=args.title_no)
+    with tempfile.TemporaryDirectory(prefix="webtoon-bench-") as destination:
+        opts = WebtoonDownloadOptions(
+            url=config.series_url,
+            destination=destination,
+            save_as=args.worker,
+            image_format=args.image_format,
+            resume=False,
+            concurrent_chapters=args.concurrent_chapters,
+            concurrent_pages=args.concurrent_pages,
+            adaptive_concurrency=args.adaptive_concurrency,
+            transcode_workers=args.transcode_workers,
+            retry_strategy="fixed",
+            transport=LocalTransport(args.base_url),
+        )
+        cpu_before = _cpu_seconds()
+        started = time.perf_counter()
+        results = await comic.download_webtoon(opts)
+        seconds = time.perf_counter() - started
+
+    return WorkerResult(
+        pages=sum(len(chapter) for chapter in results),
+        seconds=seconds,
+        peak_rss_mb=_peak_rss_mb(),
+        cpu_seconds=_cpu_seconds() - cpu_before,
+    )
+
+
+async def _benchmark(server: FakeWebtoonServer, storage: StorageType, args: argparse.Namespace) -> BenchmarkResult:
+    """Downloads the synthetic series with a storage type in a child process."""
+    requests, rate_limited, image_bytes = server.stats.requests, server.stats.rate_limited, server.stats.image_bytes
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "benchmarks.run",
+        *_forwarded_args(args),
+        "--worker",
+        storage,
+        "--base-url",
+        server.base_url,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    stdout, _ = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"Benchmark of {storage} failed with exit code {process.returncode}")  # noqa: TRY003
+
+    worker = WorkerResult(**json.loads(stdout.decode().splitlines()[-1]))
+    return BenchmarkResult(
+        storage=storage,
+        pages=worker.pages,
+        seconds=worker.seconds,
+        pages_per_s=worker.pages / worker.seconds,
+        mb_per_s=(server.stats.image_bytes - image_bytes) / MB / worker.seconds,
+        peak_rss_mb=worker.peak_rss_mb,
+        cpu_seconds=worker.cpu_seconds,
+        requests=server.stats.requests - requests,
+        rate_limited=server.stats.rate_limited - rate_limited,
+    )
+
+
+def _forwarded_args(args: argparse.Namespace) -> list[str]:
+    """Returns the options of the child process, which are the download options of this one."""
+    forwarded = [
+        f"--title-no={args.title_no}",
+        f"--image-format={args.image_format}",
+        f"--concurrent-chapters={args.concurrent_chapters}",
+        f"--concurrent-pages={args.concurrent_pages}",
+    ]
+    if args.transcode_workers:
+        forwarded.append(f"--transcode-workers={args.transcode_workers}")
+    if args.adaptive_concurrency:
+        forwarded.append("--adaptive-concurrency")
+    return forwarded
+
+
+async def _run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    config = FakeSeriesConfig(
+        title_no=args.title_no,
+        episodes=args.episodes,
+        pages=args.pages,
+        image_width=args.image_width,
+        image_height=args.image_height,
+        latency=args.latency_ms / 1000,
+        bandwidth=args.bandwidth_mbps * MB if args.bandwidth_mbps else None,
+        rate_limit_ratio=args.rate_limit,
+    )
+    async with FakeWebtoonServer(config) as server:
+        return [await _benchmark(server, storage, args) for storage in args.storage]
+
+
+def _print_results(console: Console, results: list[BenchmarkResult]) -> None:
+    table = Table(title="Download throughput")
+    for column in ("storage", "pages", "seconds", "pages/s", "MiB/s", "peak RSS (MiB)", "CPU (s)", "requests", "429"):
+        table.add_column(column, justify="left" if column == "storage" else "right")
+    for result in results:
+        table.add_row(
+            result.storage,
+            str(result.pages),
+            f"{result.seconds:.2f}",
+            f"{result.pages_per_s:.1f}",
+            f"{result.mb_per_s:.1f}",
+            f"{result.peak_rss_mb:.0f}",
+            f"{result.cpu_seconds:.2f}",
+            str(result.requests),
+            str(result.rate_limited),
+        )
+    console.print(table)
+
+
+def _find_regressions(results: list[BenchmarkResult], baseline_path: Path, tolerance: float) -> list[str]:
+    """Compares the results with a previous run, returning a message for every metric worse than the tolerance."""
+    baseline = {entry["storage"]: BenchmarkResult(**entry) for entry in json.loads(baseline_path.read_text())}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.storage)
+        if previous is None:
+            continue
+        if result.pages_per_s < previous.pages_per_s * (1 - tolerance):
+            regressions.append(f"{result.storage}: {result.pages_per_s:.1f} pages/s, was {previous.pages_per_s:.1f}")
+        if result.peak_rss_mb > previous.peak_rss_mb * (1 + tolerance):
+            regressions.append(
+                f"{result.storage}: {result.peak_rss_mb:.0f} MiB peak RSS, was {previous.peak_rss_mb:.0f}"
+            )
+        if result.cpu_seconds > previous.cpu_seconds * (1 + tolerance):
+            regressions.append(f"{result.storage}: {result.cpu_seconds:.2f}s CPU, was {previous.cpu_seconds:.2f}")
+    return regressions
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[1])
+    parser.add_argument("--storage", nargs="+", choices=STORAGE_TYPES, default=list(STORAGE_TYPES))
+    parser.add_argument("--title-no", type=int, default=1000)
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=20, help="Pages per episode")
+    parser.add_argument("--image-width", type=int, default=800)
+    parser.add_argument("--image-height", type=int, default=1280)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before every response")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0.0, help="Server bandwidth in MiB/s, 0 for unlimited")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Ratio of image requests answered with a 429")
+    parser.add_argument("--image-format", choices=["JPG", "PNG"], default="JPG")
+    parser.add_argument("--concurrent-chapters", type=int, default=6)
+    parser.add_argument("--concurrent-pages", type=int, default=120)
+    parser.add_argument("--adaptive-concurrency", action="store_true")
+    parser.add_argument("--transcode-workers", type=int, default=None)
+    parser.add_argument("--json", type=Path, help="Write the results to a JSON file")
+    parser.add_argument("--baseline", type=Path, help="Fail if the results are worse than those of a JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression from the baseline")
+    parser.add_argument("--worker", choices=STORAGE_TYPES, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.worker:
+        result = asyncio.run(_run_worker(args))
+        print(json.dumps(asdict(result)))
+        return 0
+
+    console = Console()
+    results = asyncio.run(_run(args))
+    _print_results(console, results)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(result) for result in results], indent=2))
+    if args.baseline:
+        regressions = _find_regressions(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            console.print(f"[red]Regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from types import TracebackType
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import httpx
+from PIL import Image
+
+log = logging.getLogger(__name__)
+
+SERIES_PATH = "/en/fantasy/benchmark/list"
+"""Path of the synthetic series page. Its URL is `https://www.webtoons.com{SERIES_PATH}?title_no={title_no}`."""
+
+_EPISODES_PATH = re.compile(r"^/api/v1/(webtoon|canvas)/(?P<title_no>\d+)/episodes$")
+_VIEWER_PATH = re.compile(r"^/en/fantasy/benchmark/ep-(?P<episode_no>\d+)/viewer$")
+_IMAGE_PATH = re.compile(r"^/img/(?P<episode_no>\d+)/(?P<page>\d+)\.jpg$")
+
+
+@dataclass
+class FakeSeriesConfig:
+    """
+    Shape of the synthetic series and behavior of the fake server.
+
+    Attributes:
+        title_no            : The title number of the series.
+        episodes            : The number of episodes of the series.
+        pages               : The number of pages of each episode.
+        image_width         : The width of the page images in pixels.
+        image_height        : The height of the page images in pixels.
+        image_variants      : The number of distinct images served, so that pages are not all identical.
+        latency             : Delay in seconds before every response.
+        bandwidth           : Maximum number of body bytes per second sent by the server, across all streams.
+                              None for unlimited.
+        rate_limit_ratio    : Ratio of image requests answered with a 429 status.
+        retry_after         : Value of the Retry-After header of the injected 429 responses, in seconds.
+        seed                : Seed of the random generator used for the images and the 429 injection.
+    """
+
+    title_no: int = 1000
+    episodes: int = 20
+    pages: int = 20
+    image_width: int = 800
+    image_height: int = 1280
+    image_variants: int = 4
+    latency: float = 0.0
+    bandwidth: float | None = None
+    rate_limit_ratio: float = 0.0
+    retry_after: float = 0.0
+    seed: int = 0
+
+    @property
+    def series_url(self) -> str:
+        return f"https://www.webtoons.com{SERIES_PATH}?title_no={self.title_no}"
+
+
+@dataclass
+class ServerStats:
+    """
+    Counters of the fake server.
+
+    Attributes:
+        requests        : The number of requests received.
+        rate_limited    : The number of requests answered with a 429 status.
+        image_bytes     : The number of image body bytes sent.
+    """
+
+    requests: int = 0
+    rate_limited: int = 0
+    image_bytes: int = 0
+
+
+def _make_images(config: FakeSeriesConfig) -> list[bytes]:
+    """Encodes noisy JPEG images, which do not compress much further, like real pages."""
+    rng = random.Random(config.seed)
+    images = []
+    for _ in range(max(1, config.image_variants)):
+        noise = rng.randbytes(config.image_width * config.image_height * 3)
+        image = Image.frombytes("RGB", (config.image_width, config.image_height), noise)
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+@dataclass
+class _Pacer:
+    """Spreads the bytes sent by the server over time so that they never exceed the configured bandwidth."""
+
+    bandwidth: float | None
+    _next_send: float = field(init=False, default=0.0)
+
+    async def wait(self, size: int) -> None:
+        if not self.bandwidth:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_send)
+        self._next_send = start + size / self.bandwidth
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+@dataclass
+class _Response:
+    status: int
+    body: bytes = b""
+    content_type: str = "text/html; charset=utf-8"
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    is_image: bool = False
+
+
+@dataclass
+class FakeWebtoonServer:
+    """
+    Local HTTP/2 stand-in for the Webtoon site and its image CDN, serving a synthetic series.
+
+    The server speaks cleartext HTTP/2 with prior knowledge. Use `transport()` to route the requests of a
+    `WebtoonHttpClient` to it regardless of the host they target.
+
+    It serves:
+    - the series page, on both the desktop and the mobile site
+    - the `/api/v1/webtoon/{title_no}/episodes` JSON API, with cursor pagination
+    - the viewer page of every episode
+    - the page images
+
+    Attributes:
+        config  : Shape of the synthetic series and behavior of the server.
+        host    : The address to listen on.
+        port    : The port to listen on. 0 picks a free port, available in `port` once started.
+        stats   : Counters of the requests served.
+    """
+
+    config: FakeSeriesConfig = field(default_factory=FakeSeriesConfig)
+    host: str = "127.0.0.1"
+    port: int = 0
+    stats: ServerStats = field(init=False, default_factory=ServerStats)
+
+    _server: asyncio.Server | None = field(init=False, default=None)
+    _images: list[bytes] = field(init=False, default_factory=list)
+    _pacer: _Pacer = field(init=False)
+    _rng: random.Random = field(init=False)
+    _writers: set[asyncio.StreamWriter] = field(init=False, default_factory=set)
+
+    def __post_init__(self) -> None:
+        self._pacer = _Pacer(self.config.bandwidth)
+        self._rng = random.Random(self.config.seed)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """Generates the images and starts listening."""
+        self._images = await asyncio.to_thread(_make_images, self.config)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info("Fake Webtoon server listening on %s", self.base_url)
+
+    async def close(self) -> None:
+        """Stops listening and closes the open connections."""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._writers:
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> FakeWebtoonServer:
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """Returns a transport sending every request to this server. See `LocalTransport`."""
+        return LocalTransport(self.base_url)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = _H2Connection(reader, writer, self)
+        self._writers.add(writer)
+        try:
+            await connection.serve()
+        except (ConnectionError, h2.exceptions.ProtocolError) as exc:
+            log.debug("Connection closed: %s", exc)
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _route(self, path: str, query: dict[str, str]) -> _Response:
+        """Builds the response to a request."""
+        self.stats.requests += 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+
+        if path == SERIES_PATH:
+            return _Response(200, self._series_page().encode())
+        if match := _EPISODES_PATH.match(path):
+            body = self._episodes(int(query.get("pageSize", 30)), int(query.get("cursor", 0)))
+            return _Response(200, json.dumps(body).encode(), content_type="application/json")
+        if match := _VIEWER_PATH.match(path):
+            return _Response(200, self._viewer_page(int(match["episode_no"])).encode())
+        if match := _IMAGE_PATH.match(path):
+            if self._rng.random() < self.config.rate_limit_ratio:
+                self.stats.rate_limited += 1
+                return _Response(429, headers=[("retry-after", f"{self.config.retry_after:g}")])
+            index = (int(match["episode_no"]) * self.config.pages + int(match["page"])) % len(self._images)
+            return _Response(200, self._images[index], content_type="image/jpeg", is_image=True)
+        return _Response(404)
+
+    def _series_page(self) -> str:
+        url = self.config.series_url
+        return (
+            f"<html><head><link rel='canonical' href='{url}' /></head><body>"
+            "<h1 class='subj'>Benchmark</h1><p class='summary'>A synthetic series.</p>"
+            "<strong class='subject'>Benchmark</strong></body></html>"
+        )
+
+    def _episodes(self, page_size: int, cursor: int) -> dict:
+        first = cursor + 1
+        last = min(self.config.episodes, cursor + page_size)
+        return {"result": {"episodeList": [self._episode(n) for n in range(first, last + 1)]}}
+
+    def _episode(self, episode_no: int) -> dict:
+        return {
+            "episodeNo": episode_no,
+            "thumbnail": "",
+            "episodeTitle": f"Episode {episode_no}",
+            "viewerLink": f"/en/fantasy/benchmark/ep-{episode_no}/viewer?title_no={self.config.title_no}&episode_no={episode_no}",
+            "exposureDateMillis": episode_no * 1000,
+            "displayUp": False,
+            "hasBgm": False,
+        }
+
+    def _viewer_page(self, episode_no: int) -> str:
+        imgs = "".join(
+            f"<img data-url='https://webtoon-phinf.pstatic.net/img/{episode_no}/{page}.jpg?type=q90' />"
+            for page in range(1, self.config.pages + 1)
+        )
+        return (
+            "<html><body>"
+            f"<div class='viewer_img _img_viewer_area'>{imgs}</div>"
+            f"<div class='author_text'>Notes of episode {episode_no}</div>"
+            "</body></html>"
+        )
+
+
+class _H2Connection:
+    """Serves the streams of a single HTTP/2 connection, each in its own task."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, server: FakeWebtoonServer):
+        self._reader = reader
+        self._writer = writer
+        self._server = server
+        self._conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self._window_updated = asyncio.Event()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def serve(self) -> None:
+        self._conn.initiate_connection()
+        await self._flush()
+        try:
+            while data := await self._reader.read(65536):
+                for event in self._conn.receive_data(data):
+                    self._handle_event(event)
+                await self._flush()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _handle_event(self, event: h2.events.Event) -> None:
+        if isinstance(event, h2.events.RequestReceived):
+            headers = {_decode(name): _decode(value) for name, value in event.headers or []}
+            task = asyncio.create_task(self._respond(event.stream_id, headers[":path"]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif isinstance(event, h2.events.WindowUpdated | h2.events.RemoteSettingsChanged | h2.events.StreamReset):
+            # Wake up the streams waiting for the flow control window, or for a stream that will never get one
+            self._window_updated.set()
+
+    async def _respond(self, stream_id: int, target: str) -> None:
+        path, _, raw_query = target.partition("?")
+        query = dict(item.partition("=")[::2] for item in raw_query.split("&") if item)
+        response = await self._server._route(path, query)
+        headers = [
+            (":status", str(response.status)),
+            ("content-type", response.content_type),
+            ("content-length", str(len(response.body))),
+            *response.headers,
+        ]
+        try:
+            self._conn.send_headers(stream_id, headers, end_stream=not response.body)
+            await self._flush()
+            await self._send_body(stream_id, response)
+        except h2.exceptions.StreamClosedError:
+            log.debug("Stream %d was closed by the client", stream_id)
+
+    async def _send_body(self, stream_id: int, response: _Response) -> None:
+        """Sends the body in frames, waiting for the client's flow control window and the server's bandwidth."""
+        body = memoryview(response.body)
+        while body:
+            window = min(self._conn.local_flow_control_window(stream_id), self._conn.max_outbound_frame_size)
+            if window <= 0:
+                self._window_updated.clear()
+                await self._window_updated.wait()
+                continue
+
+            chunk = body[:window]
+            await self._server._pacer.wait(len(chunk))
+            self._conn.send_data(stream_id, chunk.tobytes(), end_stream=len(chunk) == len(body))
+            await self._flush()
+            if response.is_image:
+                self._server.stats.image_bytes += len(chunk)
+            body = body[len(chunk) :]
+
+    async def _flush(self) -> None:
+        if data := self._conn.data_to_send():
+            self._writer.write(data)
+            await self._writer.drain()
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class LocalTransport(httpx.AsyncBaseTransport):
+    """
+    Transport sending every request to a local server over cleartext HTTP/2, whatever host it targets.
+
+    Paths and queries are kept, so that a single server can stand in for the Webtoon site, its mobile site
+    and its image CDN.
+
+    Args:
+        base_url: The URL of the local server.
+    """
+
+    def __init__(self, base_url: str):
+        self._base_url = httpx.URL(base_url)
+        self._transport = httpx.AsyncHTTPTransport(
+            http1=False, http2=True, limits=httpx.Limits(max_connections=200, max_keepalive_connections=200)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(
+            scheme=self._base_url.scheme, host=self._base_url.host, port=self._base_url.port
+        )
+        request.headers["host"] = request.url.netloc.decode()
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,110 @@
+"""
+Import-time benchmark of the CLI and of the download pipeline.
+
+It imports each module in a fresh interpreter with `python -X importtime`, and reports the cumulative import time
+of the module, the packages taking the longest to import, and whether the optional backends were loaded. PyMuPDF,
+Pillow and the HTML parsers are only meant to be imported once a download needs them.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup webtoon_downloader.core.webtoon.downloaders.comic --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from rich.console import Console
+from rich.table import Table
+
+DEFAULT_MODULES = ("webtoon_downloader.cmd.cli", "webtoon_downloader.core.webtoon.downloaders.comic")
+"""Modules measured when none are given."""
+
+OPTIONAL_BACKENDS = {"fitz": "PyMuPDF", "PIL": "Pillow", "bs4": "BeautifulSoup", "lxml": "lxml"}
+"""Top-level packages of the heavy backends that only some downloads need, by package name."""
+
+
+@dataclass
+class ImportReport:
+    """
+    Import times of a module imported in a fresh interpreter.
+
+    Attributes:
+        module      : The module imported.
+        cumulative  : The cumulative import time of every module imported, in seconds, by module name.
+    """
+
+    module: str
+    cumulative: dict[str, float]
+
+    @property
+    def seconds(self) -> float:
+        """The cumulative import time of the module itself."""
+        return self.cumulative[self.module]
+
+    @property
+    def packages(self) -> set[str]:
+        """The top-level packages imported."""
+        return {name for name in self.cumulative if "." not in name}
+
+
+def measure_imports(module: str) -> ImportReport:
+    """Imports a module in a fresh interpreter with `-X importtime`, and returns its import times."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, float] = {}
+    started = False
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        if started and total.isdigit():
+            cumulative[name] = int(total) / 1e6
+        # Modules imported until `site` completes are imported by the interpreter startup, not by the module
+        started = started or name == "site"
+    return ImportReport(module, cumulative)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES), help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times every module is imported")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest packages shown")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+
+    table = Table(title="Import time in a fresh interpreter")
+    table.add_column("Module", no_wrap=True)
+    table.add_column("ms (median)", justify="right")
+    table.add_column("Slowest packages")
+    table.add_column("Optional backends loaded")
+    for module in args.modules:
+        reports = [measure_imports(module) for _ in range(args.repeat)]
+        median = statistics.median(report.seconds for report in reports)
+        last = reports[-1]
+        packages = last.packages - {module.split(".")[0]}
+        slowest = sorted(packages, key=lambda name: last.cumulative[name])
+        table.add_row(
+            module,
+            f"{median * 1000:.0f}",
+            ", ".join(f"{name} {last.cumulative[name] * 1000:.0f}ms" for name in reversed(slowest[-args.top :])),
+            ", ".join(label for name, label in OPTIONAL_BACKENDS.items() if name in last.packages) or "none",
+        )
+    Console().print(table)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@ import customtkinter as ctk
 import os
 import threading
 import asyncio
+import multiprocessing
 import sys
 from typing import Optional
 from tkinter import filedialog, messagebox
@@ -186,5 +187,7 @@ class WebtoonDownloaderGUI(ctk.CTk):
         self.p_bar.set(0)
 
 if __name__ == "__main__":
+    # In the frozen executable, worker processes of the transcoding and parsing pools start here and must not open the GUI
+    multiprocessing.freeze_support()
     app = WebtoonDownloaderGUI()
     app.mainloop()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.server import FakeSeriesConfig, FakeWebtoonServer
+from benchmarks.startup import measure_imports
+from webtoon_downloader.core.webtoon.downloaders import comic
+from webtoon_downloader.core.webtoon.downloaders.options import WebtoonDownloadOptions
+
+
+@pytest.mark.asyncio
+async def test_download_webtoon_from_fake_server(tmp_path: Path) -> None:
+    config = FakeSeriesConfig(episodes=3, pages=4, image_width=32, image_height=48, rate_limit_ratio=0.5)
+    async with FakeWebtoonServer(config) as server:
+        opts = WebtoonDownloadOptions(
+            url=config.series_url,
+            destination=str(tmp_path),
+            save_as="cbz",
+            retry_strategy="fixed",
+            transport=server.transport(),
+        )
+        results = await comic.download_webtoon(opts)
+
+    assert [len(chapter) for chapter in results] == [4, 4, 4]
+    assert sorted(path.name for path in tmp_path.glob("*.cbz")) == ["1.cbz", "2.cbz", "3.cbz"]
+    assert server.stats.rate_limited > 0
+    assert server.stats.image_bytes > 0
+
+
+@pytest.mark.parametrize(
+    ("module", "unloaded"),
+    [
+        ("webtoon_downloader.cmd.cli", {"fitz", "PIL", "bs4", "lxml"}),
+        ("webtoon_downloader.core.webtoon.downloaders.comic", {"fitz", "PIL"}),
+    ],
+)
+def test_import_leaves_optional_backends_unloaded(module: str, unloaded: set[str]) -> None:
+    report = measure_imports(module)
+
+    assert not report.packages & unloaded, f"{module} imported in {report.seconds * 1000:.0f}ms"
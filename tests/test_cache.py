@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from webtoon_downloader.core.webtoon.cache import HttpCache, classify_url
+from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
+
+SERIES_URL = "https://www.webtoons.com/en/fantasy/tower-of-god/list?title_no=95"
+EPISODES_URL = "https://m.webtoons.com/api/v1/webtoon/95/episodes?pageSize=30"
+VIEWER_URL = "https://www.webtoons.com/en/fantasy/tower-of-god/ep-1/viewer?title_no=95&episode_no=1"
+
+
+def _cached_client(cache: HttpCache, requests: list[httpx.Request]) -> WebtoonHttpClient:
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"etag": '"v1"'}, text=f"body of {request.url}")
+
+    client = WebtoonHttpClient(cache=cache)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    return client
+
+
+def test_classify_url() -> None:
+    assert classify_url(SERIES_URL) == "series"
+    assert classify_url(EPISODES_URL) == "episodes"
+    assert classify_url(VIEWER_URL) == "viewer"
+
+
+@pytest.mark.asyncio
+async def test_cached_get_skips_fresh_responses_and_revalidates_stale_ones(tmp_path: Path) -> None:
+    requests: list[httpx.Request] = []
+    client = _cached_client(HttpCache(tmp_path), requests)
+    await client.get(VIEWER_URL)
+    await client.get(EPISODES_URL)
+
+    # A new cache reads the responses back from disk
+    requests.clear()
+    client = _cached_client(HttpCache(tmp_path), requests)
+    viewer = await client.get(VIEWER_URL)
+    episodes = await client.get(EPISODES_URL)
+
+    assert viewer.text == f"body of {VIEWER_URL}"
+    assert episodes.status_code == 200
+    assert episodes.text == f"body of {EPISODES_URL}"
+    # Viewer pages are fresh for days, episode lists are always revalidated
+    assert [str(request.url) for request in requests] == [EPISODES_URL]
+    assert requests[0].headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_responses(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path, max_size=100)
+    request = httpx.Request("GET", SERIES_URL)
+    for n in range(3):
+        await cache.store(httpx.Response(200, content=bytes([n]) * 40, request=request), url=f"{SERIES_URL}&n={n}")
+        if n == 1:
+            # Using the first response makes the second one the least recently used
+            assert await cache.load(f"{SERIES_URL}&n=0")
+
+    assert await cache.load(f"{SERIES_URL}&n=1") is None
+    assert await cache.load(f"{SERIES_URL}&n=0")
+    assert await cache.load(f"{SERIES_URL}&n=2")
+    assert cache.size == 80
+    assert len([path for path in (tmp_path / "blobs").rglob("*") if path.is_file()]) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_eviction_counts_shared_bodies_once(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path, max_size=100)
+    request = httpx.Request("GET", SERIES_URL)
+    for n, body in enumerate([b"a", b"a", b"b", b"c"]):
+        await cache.store(httpx.Response(200, content=body * 40, request=request), url=f"{SERIES_URL}&n={n}")
+
+    # The first two responses share a body, which is only freed once both are evicted
+    assert await cache.load(f"{SERIES_URL}&n=0") is None
+    assert await cache.load(f"{SERIES_URL}&n=1") is None
+    blobs = [path for path in (tmp_path / "blobs").rglob("*") if path.is_file()]
+    assert cache.size == sum(path.stat().st_size for path in blobs) == 80
@@ -1,6 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import json
+import zipfile
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import httpx
 import pytest
+from PIL import Image
 
+from webtoon_downloader.core.downloaders.image import (
+    DeduplicatingImageDownloader,
+    HttpImageDownloader,
+    ImageDownloadResult,
+)
+from webtoon_downloader.core.downloaders.limiter import AdaptiveConcurrencyLimiter
+from webtoon_downloader.core.exceptions import ChapterDownloadError
+from webtoon_downloader.core.timing import LATENCY_BUCKETS, RUN_REPORT_FILENAME, StageTimings
 from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
+from webtoon_downloader.core.webtoon.downloaders.chapter import ChapterDownloader
+from webtoon_downloader.core.webtoon.downloaders.comic import BatchDownloader, SeriesPlan, WebtoonDownloader
+from webtoon_downloader.core.webtoon.fetchers import WebtoonFetcher
+from webtoon_downloader.core.webtoon.namer import NonSeparateFileNameGenerator
+from webtoon_downloader.storage import AioFolderWriter, AioWriter, BlobStore
+from webtoon_downloader.transformers.image import AioImageFormatTransformer
 
 
 @pytest.mark.network
@@ -43,3 +70,581 @@ async def test_webtoon_downloader() -> None:
         content = await img.aread()
         assert content.startswith(b"\x89PNG\r\n\x1a\n")
         assert len(content) > 0
+
+
+def _make_response(url: str, *, text: str = "", json: dict | None = None) -> httpx.Response:
+    if json is not None:
+        return httpx.Response(200, json=json, request=httpx.Request("GET", url))
+    return httpx.Response(200, text=text, request=httpx.Request("GET", url))
+
+
+class DummyClient(WebtoonHttpClient):
+    def __init__(self, responses: dict[str, httpx.Response]):
+        self.responses = responses
+        self.requested: list[str] = []
+
+    async def get(self, url: str) -> httpx.Response:
+        if url not in self.responses:
+            raise AssertionError(url)
+        self.requested.append(url)
+        return self.responses[url]
+
+
+SERIES_URL = "https://www.webtoons.com/en/fantasy/tower-of-god/list?title_no=95"
+MOBILE_URL = "https://m.webtoons.com/en/fantasy/tower-of-god/list?title_no=95"
+MAIN_HTML = """
+<html><head>
+  <link rel='canonical' href='https://www.webtoons.com/en/fantasy/tower-of-god/list?title_no=95' />
+</head><body><strong class='subject'>Tower of God</strong></body></html>
+"""
+
+
+def _viewer_url(episode_no: int) -> str:
+    return (
+        f"https://www.webtoons.com/en/fantasy/tower-of-god/ep-{episode_no}/viewer?title_no=95&episode_no={episode_no}"
+    )
+
+
+def _episode(episode_no: int) -> dict:
+    return {
+        "episodeNo": episode_no,
+        "thumbnail": "",
+        "episodeTitle": f"Ep. {episode_no}",
+        "viewerLink": f"/en/fantasy/tower-of-god/ep-{episode_no}/viewer?title_no=95&episode_no={episode_no}",
+        "exposureDateMillis": episode_no * 1000,
+        "displayUp": False,
+        "hasBgm": False,
+    }
+
+
+def _series_responses(episodes: int, pages: int = 2) -> dict[str, httpx.Response]:
+    api_url = "https://m.webtoons.com/api/v1/webtoon/95/episodes?pageSize=99999"
+    responses = {
+        SERIES_URL: _make_response(SERIES_URL, text=MAIN_HTML),
+        MOBILE_URL: _make_response(MOBILE_URL, text=MAIN_HTML),
+        api_url: _make_response(
+            api_url, json={"result": {"episodeList": [_episode(n) for n in range(1, episodes + 1)]}}
+        ),
+    }
+    for n in range(1, episodes + 1):
+        imgs = "".join(f"<img data-url='https://img/{n}/{p}.jpg?type=q90' />" for p in range(1, pages + 1))
+        html = f"<html><body><div class='viewer_img _img_viewer_area'>{imgs}</div></body></html>"
+        responses[_viewer_url(n)] = _make_response(_viewer_url(n), text=html)
+    return responses
+
+
+class DummyImageDownloader:
+    def __init__(self, before_write: Callable[[str], Awaitable[None]] | None = None, suffix: str | None = None):
+        self.before_write = before_write
+        self.suffix = suffix
+        self.downloaded: list[str] = []
+
+    async def run(self, url: str, target: str, storage: AioWriter, quality: int | None = 100) -> ImageDownloadResult:
+        self.downloaded.append(url)
+        if self.before_write:
+            await self.before_write(url)
+
+        async def _stream() -> AsyncIterator[bytes]:
+            yield url.encode()
+
+        if self.suffix:
+            target = str(Path(target).with_suffix(self.suffix))
+        size = await storage.write(_stream(), target)
+        return ImageDownloadResult(name=target, size=size)
+
+
+def _make_downloader(
+    client: DummyClient, image_downloader: DummyImageDownloader, directory: Path, **kwargs: Any
+) -> WebtoonDownloader:
+    timings = kwargs.pop("timings", StageTimings())
+    chapter_downloader = ChapterDownloader(
+        client=client,
+        image_downloader=image_downloader,
+        file_name_generator=NonSeparateFileNameGenerator(),
+        concurrent_downloads_limit=kwargs.pop("concurrent_chapters", 1),
+        timings=timings,
+    )
+    return WebtoonDownloader(
+        url=SERIES_URL,
+        client=client,
+        chapter_downloader=chapter_downloader,
+        storage_type=kwargs.pop("storage_type", "images"),
+        quality=kwargs.pop("quality", 100),
+        directory=str(directory),
+        timings=timings,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_prefetches_viewer_pages_while_images_download(tmp_path: Path) -> None:
+    client = DummyClient(_series_responses(episodes=3))
+
+    async def _wait_for_next_viewer_page(url: str) -> None:
+        # Images of chapter 1 only complete once chapter 2's viewer page has been fetched in the meantime
+        if url.startswith("https://img/1/"):
+            while _viewer_url(2) not in client.requested:
+                await asyncio.sleep(0)
+
+    downloader = _make_downloader(
+        client, DummyImageDownloader(_wait_for_next_viewer_page), tmp_path, prefetch_chapters=2
+    )
+    results = await asyncio.wait_for(downloader.run(), timeout=5)
+
+    assert [[res.name for res in chapter] for chapter in results] == [
+        ["1_1.jpg", "1_2.jpg"],
+        ["2_1.jpg", "2_2.jpg"],
+        ["3_1.jpg", "3_2.jpg"],
+    ]
+    assert (tmp_path / "3_2.jpg").read_bytes() == b"https://img/3/2.jpg"
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_streams_chapter_results(tmp_path: Path) -> None:
+    client = DummyClient(_series_responses(episodes=20, pages=3))
+    downloader = _make_downloader(client, DummyImageDownloader(), tmp_path, concurrent_chapters=4, prefetch_chapters=2)
+
+    numbers = []
+    async for result in downloader.stream():
+        numbers.append(result.chapter_info.number)
+        assert len(result.pages) == 3
+
+    assert sorted(numbers) == list(range(1, 21))
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_stream_raises_first_chapter_error(tmp_path: Path) -> None:
+    responses = _series_responses(episodes=10)
+    responses[_viewer_url(3)] = httpx.Response(500, request=httpx.Request("GET", _viewer_url(3)))
+    downloader = _make_downloader(DummyClient(responses), DummyImageDownloader(), tmp_path, concurrent_chapters=2)
+
+    with pytest.raises(ChapterDownloadError) as exc_info:
+        async for _ in downloader.stream():
+            pass
+
+    assert exc_info.value.chapter_info is not None
+    assert exc_info.value.chapter_info.number == 3
+    assert not [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_resumes_from_manifest(tmp_path: Path) -> None:
+    await _make_downloader(DummyClient(_series_responses(episodes=3)), DummyImageDownloader(), tmp_path).run()
+    assert (tmp_path / ".webtoon-manifest.jsonl").exists()
+
+    # Complete chapters are skipped without fetching their viewer page
+    client = DummyClient(_series_responses(episodes=3))
+    image_downloader = DummyImageDownloader()
+    assert await _make_downloader(client, image_downloader, tmp_path).run() == []
+    assert not image_downloader.downloaded
+    assert not [url for url in client.requested if "viewer" in url]
+
+    # Only the truncated page of chapter 3 is downloaded again
+    (tmp_path / "3_2.jpg").write_bytes(b"trunc")
+    image_downloader = DummyImageDownloader()
+    results = await _make_downloader(DummyClient(_series_responses(episodes=3)), image_downloader, tmp_path).run()
+    assert image_downloader.downloaded == ["https://img/3/2.jpg"]
+    assert [res.name for res in results[0]] == ["3_1.jpg", "3_2.jpg"]
+    assert (tmp_path / "3_2.jpg").read_bytes() == b"https://img/3/2.jpg"
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_does_not_resume_another_image_format_or_quality(tmp_path: Path) -> None:
+    await _make_downloader(DummyClient(_series_responses(episodes=1)), DummyImageDownloader(), tmp_path).run()
+
+    image_downloader = DummyImageDownloader(suffix=".png")
+    results = await _make_downloader(
+        DummyClient(_series_responses(episodes=1)), image_downloader, tmp_path, image_format="PNG"
+    ).run()
+    assert [res.name for res in results[0]] == ["1_1.png", "1_2.png"]
+    # The pages in the old format are replaced rather than kept next to the new ones
+    assert sorted(path.name for path in tmp_path.glob("1_*")) == ["1_1.png", "1_2.png"]
+
+    await _make_downloader(
+        DummyClient(_series_responses(episodes=1)), DummyImageDownloader(), tmp_path, storage_type="cbz", quality=80
+    ).run()
+    image_downloader = DummyImageDownloader()
+    await _make_downloader(
+        DummyClient(_series_responses(episodes=1)), image_downloader, tmp_path, storage_type="cbz", quality=100
+    ).run()
+    # The archive downloaded with another quality is downloaded again
+    assert len(image_downloader.downloaded) == 2
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_keeps_images_when_archiving_in_another_format(tmp_path: Path) -> None:
+    await _make_downloader(DummyClient(_series_responses(episodes=1)), DummyImageDownloader(), tmp_path).run()
+
+    await _make_downloader(
+        DummyClient(_series_responses(episodes=1)),
+        DummyImageDownloader(suffix=".png"),
+        tmp_path,
+        storage_type="cbz",
+        image_format="PNG",
+    ).run()
+
+    assert sorted(path.name for path in tmp_path.glob("1*")) == ["1.cbz", "1_1.jpg", "1_2.jpg"]
+    # The pages of the image download are still resumed from the manifest
+    image_downloader = DummyImageDownloader()
+    await _make_downloader(DummyClient(_series_responses(episodes=1)), image_downloader, tmp_path).run()
+    assert not image_downloader.downloaded
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_resumes_archives_as_a_whole(tmp_path: Path) -> None:
+    await _make_downloader(
+        DummyClient(_series_responses(episodes=2)), DummyImageDownloader(), tmp_path, storage_type="cbz"
+    ).run()
+
+    (tmp_path / "2.cbz").unlink()
+    image_downloader = DummyImageDownloader()
+    results = await _make_downloader(
+        DummyClient(_series_responses(episodes=2)), image_downloader, tmp_path, storage_type="cbz"
+    ).run()
+
+    assert len(results) == 1
+    assert sorted(image_downloader.downloaded) == ["https://img/2/1.jpg", "https://img/2/2.jpg"]
+    assert (tmp_path / "2.cbz").exists()
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_stores_chapters_in_volumes(tmp_path: Path) -> None:
+    results = await _make_downloader(
+        DummyClient(_series_responses(episodes=3)),
+        DummyImageDownloader(),
+        tmp_path,
+        storage_type="cbz",
+        chapters_per_volume=2,
+        concurrent_chapters=2,
+    ).run()
+
+    assert len(results) == 3
+    with zipfile.ZipFile(tmp_path / "1-2.cbz") as archive:
+        assert sorted(archive.namelist()) == ["1_1.jpg", "1_2.jpg", "2_1.jpg", "2_2.jpg", "ComicInfo.xml"]
+        assert b"<Number>1-2</Number>" in archive.read("ComicInfo.xml")
+    with zipfile.ZipFile(tmp_path / "3-3.cbz") as archive:
+        assert sorted(archive.namelist()) == ["3_1.jpg", "3_2.jpg", "ComicInfo.xml"]
+
+    # Volumes are resumed as a whole
+    (tmp_path / "3-3.cbz").unlink()
+    image_downloader = DummyImageDownloader()
+    await _make_downloader(
+        DummyClient(_series_responses(episodes=3)),
+        image_downloader,
+        tmp_path,
+        storage_type="cbz",
+        chapters_per_volume=2,
+    ).run()
+    assert sorted(image_downloader.downloaded) == ["https://img/3/1.jpg", "https://img/3/2.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_writes_run_report(tmp_path: Path) -> None:
+    timings = StageTimings()
+    await _make_downloader(
+        DummyClient(_series_responses(episodes=3)), DummyImageDownloader(), tmp_path, timings=timings, run_report=True
+    ).run()
+
+    report = json.loads((tmp_path / RUN_REPORT_FILENAME).read_text(encoding="utf-8"))
+    stages = report["stages"]
+    assert set(stages) == {"chapters.list", "viewer.fetch", "viewer.parse", "chapter.export", "storage.finalize"}
+    assert stages["chapters.list"]["count"] == 1
+    assert stages["viewer.fetch"]["kind"] == "network"
+    assert stages["viewer.fetch"]["bytes"] > 0
+    assert stages["viewer.parse"]["kind"] == "cpu"
+    for name in ("viewer.fetch", "viewer.parse", "chapter.export", "storage.finalize"):
+        assert stages[name]["count"] == 3
+        assert sum(stages[name]["histogram"]) == 3
+    assert len(report["latency_buckets"]) == len(LATENCY_BUCKETS) + 1
+    assert stages["viewer.parse"]["p99_seconds"] <= timings.stages["viewer.parse"].max
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_sync_only_lists_new_episodes(tmp_path: Path) -> None:
+    await _make_downloader(
+        DummyClient(_series_responses(episodes=3)), DummyImageDownloader(), tmp_path, sync=True
+    ).run()
+
+    responses = _series_responses(episodes=5)
+    api_url = "https://m.webtoons.com/api/v1/webtoon/95/episodes"
+    responses[f"{api_url}?pageSize=30&cursor=3"] = _make_response(
+        api_url, json={"result": {"episodeList": [_episode(4), _episode(5)]}}
+    )
+    client = DummyClient(responses)
+    image_downloader = DummyImageDownloader()
+    results = await _make_downloader(client, image_downloader, tmp_path, sync=True).run()
+
+    assert [[res.name for res in chapter] for chapter in results] == [["4_1.jpg", "4_2.jpg"], ["5_1.jpg", "5_2.jpg"]]
+    assert f"{api_url}?pageSize=99999" not in client.requested
+    assert not [url for url in client.requested if "viewer" in url and "episode_no=3" in url]
+
+    # Nothing was published since, so nothing is downloaded
+    responses[f"{api_url}?pageSize=30&cursor=5"] = _make_response(api_url, json={"result": {"episodeList": []}})
+    image_downloader = DummyImageDownloader()
+    assert await _make_downloader(DummyClient(responses), image_downloader, tmp_path, sync=True).run() == []
+    assert not image_downloader.downloaded
+
+
+@pytest.mark.asyncio
+async def test_fetcher_lists_episodes_in_a_single_request_and_keeps_the_series_total() -> None:
+    responses = _series_responses(episodes=0)
+    api_url = "https://m.webtoons.com/api/v1/webtoon/95/episodes?pageSize=99999"
+    responses[api_url] = _make_response(api_url, json={"result": {"episodeList": [_episode(n) for n in range(1, 251)]}})
+    client = DummyClient(responses)
+    fetcher = WebtoonFetcher(client, SERIES_URL)
+
+    chapters = await fetcher.get_chapters_details(SERIES_URL, start_chapter=5, end_chapter=9)
+    assert [chapter.number for chapter in chapters] == list(range(5, 10))
+    assert {chapter.total_chapters for chapter in chapters} == {250}
+
+    chapters = await fetcher.get_chapters_details(SERIES_URL, end_chapter="latest")
+    assert [(chapter.number, chapter.total_chapters) for chapter in chapters] == [(250, 250)]
+    assert len(await fetcher.get_chapters_details(SERIES_URL)) == 250
+    assert [url for url in client.requested if "/episodes" in url] == [api_url] * 3
+
+
+@pytest.mark.asyncio
+async def test_fetcher_counts_chapters_from_the_last_listed_episode() -> None:
+    responses = _series_responses(episodes=0)
+    api_url = "https://m.webtoons.com/api/v1/webtoon/95/episodes"
+    episodes = [_episode(n) for n in range(1, 251)]
+    for url, items in {
+        f"{api_url}?pageSize=99999": episodes,
+        f"{api_url}?pageSize=30&cursor=239": episodes[239:],
+        f"{api_url}?pageSize=9": episodes[:9],
+    }.items():
+        responses[url] = _make_response(url, json={"result": {"episodeList": items}})
+    client = DummyClient(responses)
+    fetcher = WebtoonFetcher(client, SERIES_URL)
+
+    # Episode 240 was the last one, and 10 were published since
+    chapters = await fetcher.get_chapters_details(
+        SERIES_URL, end_chapter="latest", last_episode_no=240, last_chapter_number=240
+    )
+    assert [(chapter.number, chapter.data_episode_no, chapter.total_chapters) for chapter in chapters] == [
+        (250, 250, 250)
+    ]
+    chapters = await fetcher.get_chapters_details(
+        SERIES_URL, start_chapter=5, end_chapter=9, last_episode_no=240, last_chapter_number=240
+    )
+    assert [chapter.number for chapter in chapters] == list(range(5, 10))
+    assert {chapter.total_chapters for chapter in chapters} == {250}
+    assert f"{api_url}?pageSize=99999" not in client.requested
+
+    # The whole list is fetched again when the last listed episode was removed
+    responses[f"{api_url}?pageSize=30&cursor=244"] = _make_response(
+        api_url, json={"result": {"episodeList": episodes[245:]}}
+    )
+    chapters = await fetcher.get_chapters_details(
+        SERIES_URL, end_chapter="latest", last_episode_no=245, last_chapter_number=245
+    )
+    assert [(chapter.number, chapter.total_chapters) for chapter in chapters] == [(250, 250)]
+    assert client.requested[-1] == f"{api_url}?pageSize=99999"
+
+
+@pytest.mark.asyncio
+async def test_webtoon_downloader_lists_latest_chapter_from_the_manifest(tmp_path: Path) -> None:
+    await _make_downloader(DummyClient(_series_responses(episodes=3)), DummyImageDownloader(), tmp_path).run()
+
+    responses = _series_responses(episodes=4)
+    api_url = "https://m.webtoons.com/api/v1/webtoon/95/episodes"
+    responses[f"{api_url}?pageSize=30&cursor=2"] = _make_response(
+        api_url, json={"result": {"episodeList": [_episode(3), _episode(4)]}}
+    )
+    client = DummyClient(responses)
+    results = await _make_downloader(client, DummyImageDownloader(), tmp_path, end_chapter="latest").run()
+
+    assert [[res.name for res in chapter] for chapter in results] == [["4_1.jpg", "4_2.jpg"]]
+    assert f"{api_url}?pageSize=99999" not in client.requested
+
+
+@pytest.mark.asyncio
+async def test_batch_downloader_schedules_series_round_robin(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    closed: list[int] = []
+    close = SeriesPlan.close
+
+    async def _close(plan: SeriesPlan) -> None:
+        closed.append(id(plan))
+        await close(plan)
+
+    monkeypatch.setattr(SeriesPlan, "close", _close)
+    client = DummyClient(_series_responses(episodes=3))
+    image_downloader = DummyImageDownloader()
+    batch = BatchDownloader(
+        downloaders=[
+            _make_downloader(client, image_downloader, tmp_path / "first", storage_type="cbz"),
+            _make_downloader(client, image_downloader, tmp_path / "second", storage_type="cbz"),
+        ],
+        concurrent_chapters=1,
+        prefetch_chapters=1,
+    )
+
+    results = [result async for result in batch.stream()]
+
+    assert [result.chapter_info.number for result in results] == [1, 1, 2, 2, 3, 3]
+    assert len(image_downloader.downloaded) == 12
+    assert not batch.errors
+    assert (tmp_path / "first" / "3.cbz").exists()
+    assert (tmp_path / "second" / "3.cbz").exists()
+    # Each plan is closed once, when its series completes
+    assert len(closed) == len(set(closed)) == 2
+
+
+class RecordingWriter:
+    def __init__(self) -> None:
+        self.chunks: dict[str, list[bytes]] = {}
+
+    async def write(self, stream: AsyncIterator[bytes], item_name: str) -> int:
+        self.chunks[item_name] = [chunk async for chunk in stream]
+        return sum(len(chunk) for chunk in self.chunks[item_name])
+
+    async def __aenter__(self) -> RecordingWriter:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+
+def _mock_client(
+    handler: Callable[[httpx.Request], httpx.Response] | Callable[[httpx.Request], Awaitable[httpx.Response]],
+) -> WebtoonHttpClient:
+    client = WebtoonHttpClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_http_image_downloader_hands_a_single_buffer_to_storage() -> None:
+    png = io.BytesIO()
+    Image.new("RGB", (32, 32), color="blue").save(png, format="PNG")
+    client = _mock_client(lambda request: httpx.Response(200, content=png.getvalue()))
+    downloader = HttpImageDownloader(client, 4, transformers=[AioImageFormatTransformer("JPG")])
+    storage = RecordingWriter()
+
+    result = await downloader.run("https://img/1.png", "01.png", storage)
+
+    assert result.name == "01.jpg"
+    assert len(storage.chunks["01.jpg"]) == 1
+    assert storage.chunks["01.jpg"][0].startswith(b"\xff\xd8\xff")
+    assert result.size == len(storage.chunks["01.jpg"][0])
+
+    assert client.timings.stages["image.first_byte"].count == 1
+    assert client.timings.stages["image.body"].bytes == len(png.getvalue())
+    assert downloader.timings.stages["image.transform"].bytes == result.size
+    assert downloader.timings.stages["image.write"].bytes == result.size
+
+
+@pytest.mark.asyncio
+async def test_http_image_downloader_releases_limiter_slot_before_writing() -> None:
+    client = _mock_client(lambda request: httpx.Response(200, content=b"\xff\xd8\xff image"))
+    limiter = AdaptiveConcurrencyLimiter(max_limit=4)
+    downloader = HttpImageDownloader(client, 4, transformers=[AioImageFormatTransformer("JPG")], limiter=limiter)
+    in_flight_during_write: list[int] = []
+
+    class SlowWriter(RecordingWriter):
+        async def write(self, stream: AsyncIterator[bytes], item_name: str) -> int:
+            in_flight_during_write.append(limiter.in_flight)
+            await asyncio.sleep(0.2)
+            return await super().write(stream, item_name)
+
+    await downloader.run("https://img/1.jpg", "01.jpg", SlowWriter())
+
+    # A slow disk does not count towards the request latency the window adapts to
+    assert in_flight_during_write == [0]
+    assert limiter.p95_latency is not None
+    assert limiter.p95_latency < 0.2
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_concurrent_requests_for_the_same_url() -> None:
+    release = asyncio.Event()
+    requested: list[str] = []
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        await release.wait()
+        return httpx.Response(200, content=str(request.url).encode())
+
+    client = _mock_client(_handler)
+
+    async def _read_image(url: str) -> bytes:
+        async with client.stream_image(url) as response:
+            return await response.aread()
+
+    gets = asyncio.gather(*(client.get("https://page/1") for _ in range(3)))
+    images = asyncio.gather(*(_read_image("https://img/1.jpg") for _ in range(3)), _read_image("https://img/2.jpg"))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert [response.text for response in await gets] == ["https://page/1"] * 3
+    assert await images == [b"https://img/1.jpg"] * 3 + [b"https://img/2.jpg"]
+    assert sorted(requested) == ["https://img/1.jpg", "https://img/2.jpg", "https://page/1"]
+    assert not client._in_flight
+
+
+class _CutOffStream(httpx.AsyncByteStream):
+    """Response body failing with a read timeout after sending part of its bytes."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self.data
+        raise httpx.ReadTimeout("timed out")  # noqa: TRY003
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accept_ranges", [True, False])
+async def test_client_resumes_images_cut_off_mid_body(accept_ranges: bool) -> None:
+    image = bytes(range(256)) * 4
+    requests: list[httpx.Request] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        headers = {"content-length": str(len(image)), "etag": '"v1"'}
+        if accept_ranges:
+            headers["accept-ranges"] = "bytes"
+        if len(requests) == 1:
+            return httpx.Response(200, headers=headers, stream=_CutOffStream(image[:300]))
+        if "range" in request.headers:
+            start = int(request.headers["range"].removeprefix("bytes=").rstrip("-"))
+            headers = {"content-range": f"bytes {start}-{len(image) - 1}/{len(image)}"}
+            return httpx.Response(206, headers=headers, content=image[start:])
+        return httpx.Response(200, headers=headers, content=image)
+
+    client = _mock_client(_handler)
+    async with client.stream_image("https://img/1.jpg") as response:
+        assert response.status_code == 200
+        assert await response.aread() == image
+
+    assert len(requests) == 2
+    if accept_ranges:
+        assert requests[1].headers["range"] == "bytes=300-"
+        assert requests[1].headers["if-range"] == '"v1"'
+    else:
+        assert "range" not in requests[1].headers
+
+
+@pytest.mark.asyncio
+async def test_deduplicating_image_downloader_stores_identical_images_once(tmp_path: Path) -> None:
+    requested: list[str] = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        return httpx.Response(200, content=b"end card")
+
+    store = BlobStore(tmp_path / "blobs")
+    downloader = DeduplicatingImageDownloader(HttpImageDownloader(_mock_client(_handler), 4), store)
+    async with AioFolderWriter(tmp_path / "series") as storage:
+        await downloader.run("https://img/1/end.jpg", "1/end.jpg", storage)
+        await downloader.run("https://img/2/end.jpg", "2/end.jpg", storage)
+        # A new store reads the known URLs back from disk
+        downloader.store = BlobStore(tmp_path / "blobs")
+        result = await downloader.run("https://img/1/end.jpg", "3/end.jpg", storage)
+
+    assert requested == ["https://img/1/end.jpg", "https://img/2/end.jpg"]
+    assert result == ImageDownloadResult("3/end.jpg", 8, hashlib.sha256(b"end card").hexdigest())
+    assert len([path for path in (tmp_path / "blobs" / "blobs").rglob("*") if path.is_file()]) == 1
+    pages = [tmp_path / "series" / str(n) / "end.jpg" for n in (1, 2, 3)]
+    assert all(page.read_bytes() == b"end card" for page in pages)
+    assert len({page.stat().st_ino for page in pages}) == 1
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from webtoon_downloader.core.executors import WorkerPool, WorkerPools
+from webtoon_downloader.core.webtoon.downloaders.comic import _worker_pools
+from webtoon_downloader.core.webtoon.downloaders.options import WebtoonDownloadOptions
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_counts_queued_tasks_and_their_wait() -> None:
+    pool = WorkerPool("io", workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def _block() -> str:
+        started.set()
+        release.wait()
+        return "first"
+
+    try:
+        loop = asyncio.get_running_loop()
+        first = loop.run_in_executor(pool, _block)
+        await asyncio.to_thread(started.wait)
+        second = pool.submit(str.upper, "second")
+        cancelled = pool.submit(str.upper, "cancelled")
+        assert (pool.queued, pool.active) == (2, 1)
+
+        # A task cancelled before it starts leaves the queue
+        assert cancelled.cancel()
+        assert pool.queued == 1
+
+        release.set()
+        assert await first == "first"
+        assert second.result(timeout=5) == "SECOND"
+        assert (pool.queued, pool.active) == (0, 0)
+        assert pool.wait.count == 2
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_worker_pools_are_sized_from_the_options() -> None:
+    pools = WorkerPools.create(cpu_workers=None, io_workers=3)
+    try:
+        assert [pool.name for pool in pools] == ["cpu", "io"]
+        assert pools.cpu.workers >= 1
+        assert pools.io.workers == 3
+    finally:
+        pools.shutdown()
+
+    with pytest.raises(ValueError, match="io workers"):
+        WorkerPool("io", workers=0)
+
+
+@pytest.mark.asyncio
+async def test_worker_pools_drain_without_blocking_the_loop() -> None:
+    started, release = threading.Event(), threading.Event()
+    # Releases the task anyway if the loop is blocked, so that the test fails instead of hanging
+    fallback = threading.Timer(2, release.set)
+    fallback.start()
+
+    async def _download() -> None:
+        async with _worker_pools(WebtoonDownloadOptions("https://www.webtoons.com", io_workers=1)) as pools:
+            pools.io.submit(lambda: started.set() or release.wait())
+            await asyncio.to_thread(started.wait)
+
+    try:
+        download = asyncio.create_task(_download())
+        before = time.monotonic()
+        await asyncio.sleep(0.05)
+        assert time.monotonic() - before < 1
+        assert not download.done()
+
+        release.set()
+        await asyncio.wait_for(download, timeout=5)
+    finally:
+        fallback.cancel()
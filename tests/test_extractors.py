@@ -4,7 +4,14 @@ import pytest
 from bs4 import BeautifulSoup
 
 from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
-from webtoon_downloader.core.webtoon.extractor import WebtoonMainPageExtractor, WebtoonViewerPageExtractor
+from webtoon_downloader.core.webtoon.extractor import (
+    ElementNotFoundError,
+    ViewerPageData,
+    WebtoonMainPageExtractor,
+    WebtoonViewerPageExtractor,
+    parse_viewer_page,
+)
+from webtoon_downloader.core.webtoon.parsing import HtmlParser, ParserExecutorType
 
 
 @dataclass
@@ -158,3 +165,53 @@ def test_get_genre_missing_returns_none_with_debug_log(caplog: pytest.LogCapture
     extractor = WebtoonMainPageExtractor(BeautifulSoup("<html><body></body></html>", "lxml"))
     assert extractor.genre is None
     assert "Genre not found in known selectors" in caplog.text
+
+
+VIEWER_HTML = """
+<html>
+  <head><script>var images = "<img data-url='https://example.com/script.jpg'>";</script></head>
+  <body>
+    <div class='viewer_lst'>
+      <div class='viewer_img _img_viewer_area'>
+        <img data-url='https://example.com/1.jpg?type=q90' />
+        <img data-url='https://example.com/2.jpg?type=q90' />
+      </div>
+    </div>
+    <p class='author_text'>Thanks for <b>reading</b>!\r\nSee you next week</p>
+  </body>
+</html>
+"""
+
+
+def test_viewer_page_fast_path_matches_full_parse() -> None:
+    fast = WebtoonViewerPageExtractor(VIEWER_HTML)
+    full = WebtoonViewerPageExtractor(BeautifulSoup(VIEWER_HTML, "lxml"))
+
+    assert fast.img_urls == full.img_urls == ["https://example.com/1.jpg", "https://example.com/2.jpg"]
+    assert fast.chapter_notes == full.chapter_notes == "Thanks for reading!\nSee you next week"
+    assert "soup" not in vars(fast)
+
+
+def test_viewer_page_fast_path_falls_back_to_full_parse() -> None:
+    assert WebtoonViewerPageExtractor("<html><body><p>Episode removed</p></body></html>").chapter_notes == ""
+    with pytest.raises(ElementNotFoundError):
+        _ = WebtoonViewerPageExtractor("<html><body><p>Episode removed</p></body></html>").img_urls
+    with pytest.raises(KeyError):
+        # An image without data-url is reported by the full parse, as it was before the fast path
+        _ = WebtoonViewerPageExtractor("<div class='viewer_img _img_viewer_area'><img src='x' /></div>").img_urls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("executor_type", ["thread", "process"])
+async def test_html_parser_parses_pages_off_the_event_loop(executor_type: ParserExecutorType) -> None:
+    parser = HtmlParser(executor_type=executor_type, workers=1)
+    try:
+        viewer_page = await parser.parse(parse_viewer_page, VIEWER_HTML)
+        with pytest.raises(ElementNotFoundError, match="'_img_viewer_area' not found"):
+            await parser.parse(parse_viewer_page, "<html><body></body></html>")
+    finally:
+        parser.shutdown()
+
+    assert viewer_page == ViewerPageData(
+        ["https://example.com/1.jpg", "https://example.com/2.jpg"], "Thanks for reading!\nSee you next week"
+    )
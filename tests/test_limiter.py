@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from webtoon_downloader.core.downloaders.limiter import AdaptiveConcurrencyLimiter, is_congestion_signal
+from webtoon_downloader.core.exceptions import ImageDownloadError, RateLimitedError
+from webtoon_downloader.core.webtoon.ratelimit import (
+    HostRateLimiter,
+    HostRateLimitState,
+    RateLimitedTransport,
+    parse_retry_after,
+)
+
+
+async def _run_ok(limiter: AdaptiveConcurrencyLimiter) -> None:
+    async with limiter.slot():
+        await asyncio.sleep(0)
+
+
+async def _run_rate_limited(limiter: AdaptiveConcurrencyLimiter) -> None:
+    with pytest.raises(ImageDownloadError):
+        async with limiter.slot():
+            raise ImageDownloadError(url="https://img", cause=RateLimitedError())
+
+
+def test_is_congestion_signal() -> None:
+    assert is_congestion_signal(ImageDownloadError(url="https://img", cause=RateLimitedError()))
+    assert is_congestion_signal(httpx.ReadTimeout("timed out"))
+    assert not is_congestion_signal(ImageDownloadError(url="https://img", cause=ValueError("boom")))
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_increases_after_healthy_window() -> None:
+    changes: list[int] = []
+
+    async def on_change(limit: int) -> None:
+        changes.append(limit)
+
+    limiter = AdaptiveConcurrencyLimiter(max_limit=6, initial_limit=4, on_limit_change=on_change)
+    for _ in range(4):
+        await _run_ok(limiter)
+
+    assert limiter.limit == 5
+    assert changes == [5]
+
+    for _ in range(20):
+        await _run_ok(limiter)
+
+    assert limiter.limit == 6, "window must not grow past max_limit"
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_halves_once_per_burst_of_rate_limits() -> None:
+    limiter = AdaptiveConcurrencyLimiter(max_limit=16, initial_limit=16, min_limit=2)
+    release = asyncio.Event()
+
+    async def _rate_limited_after_release() -> None:
+        with pytest.raises(ImageDownloadError):
+            async with limiter.slot():
+                await release.wait()
+                raise ImageDownloadError(url="https://img", cause=RateLimitedError())
+
+    # All requests start in the same window, so the burst only counts as one congestion event
+    tasks = [asyncio.create_task(_rate_limited_after_release()) for _ in range(8)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert limiter.limit == 8
+
+    for _ in range(3):
+        await _run_rate_limited(limiter)
+    assert limiter.limit == 2, "window must not shrink below min_limit"
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_bounds_in_flight_requests() -> None:
+    limiter = AdaptiveConcurrencyLimiter(max_limit=3, initial_limit=2)
+    peak = 0
+
+    async def _track() -> None:
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(_track() for _ in range(10)))
+    assert peak <= 3
+    assert limiter.in_flight == 0
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_per_host() -> None:
+    limiter = HostRateLimiter(requests_per_second=100, burst=0.01)
+
+    started = time.monotonic()
+    await asyncio.gather(*(limiter.acquire("a") for _ in range(6)), limiter.acquire("b"))
+
+    # The first request of each host is free, the next five of host "a" are 10ms apart
+    assert time.monotonic() - started >= 0.045
+    assert limiter.state("a").requests == 6
+    assert limiter.state("b").throttled_seconds == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_transport_pauses_host_on_retry_after() -> None:
+    states: list[HostRateLimitState] = []
+
+    async def _on_state_change(state: HostRateLimitState) -> None:
+        states.append(state)
+
+    responses = iter([httpx.Response(429, headers={"retry-after": "0.1"}), httpx.Response(200)])
+    limiter = HostRateLimiter(on_state_change=_on_state_change)
+    transport = RateLimitedTransport(httpx.MockTransport(lambda request: next(responses)), limiter)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert (await client.get("https://cdn/1.jpg")).status_code == 429
+        started = time.monotonic()
+        assert (await client.get("https://cdn/2.jpg")).status_code == 200
+        assert time.monotonic() - started >= 0.09
+        await asyncio.sleep(0.02)
+
+    assert [state.paused_for > 0 for state in states] == [True, False]
+    assert limiter.state("cdn").rate_limited == 1
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from webtoon_downloader.core.downloaders.limiter import FixedConcurrencyLimiter
+from webtoon_downloader.core.executors import WorkerPool
+from webtoon_downloader.core.metrics import METRICS_PATH, DownloadMetrics, MetricsServer
+from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
+from webtoon_downloader.transformers.image import AioImageFormatTransformer
+
+
+@pytest.mark.asyncio
+async def test_metrics_server_serves_download_metrics() -> None:
+    responses = iter([httpx.Response(429), httpx.Response(200, content=b"image")])
+    client = WebtoonHttpClient(retry_strategy="fixed", transport=httpx.MockTransport(lambda request: next(responses)))
+    pool = WorkerPool("io", workers=2)
+    await asyncio.get_running_loop().run_in_executor(pool, sum, [1, 2])
+    pool.shutdown()
+    metrics = DownloadMetrics()
+    metrics.watch(
+        client=client,
+        limiter=FixedConcurrencyLimiter(4),
+        transformers=[AioImageFormatTransformer("JPG")],
+        timings=client.timings,
+        pools=[pool],
+    )
+    # Components shared by several series are only counted once
+    metrics.watch(client=client, timings=client.timings)
+    await metrics.on_webtoon_fetched([])
+
+    async with client, client.stream_image("https://cdn/1.jpg") as response:
+        assert response.content == b"image"
+
+    async with MetricsServer(metrics) as server, httpx.AsyncClient() as scraper:
+        url = f"http://127.0.0.1:{server.bound_port}"
+        scraped = await scraper.get(url + METRICS_PATH)
+        assert (await scraper.get(url + "/other")).status_code == 404
+
+    assert scraped.status_code == 200
+    assert scraped.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = scraped.text.splitlines()
+    assert "# TYPE webtoon_http_retries_total counter" in lines
+    assert 'webtoon_http_requests_total{host="cdn"} 2' in lines
+    assert 'webtoon_http_retries_total{host="cdn"} 1' in lines
+    assert 'webtoon_http_rate_limited_total{host="cdn"} 1' in lines
+    assert "webtoon_requests_in_flight 0" in lines
+    assert "webtoon_image_slots 4" in lines
+    assert "webtoon_transform_queue_depth 0" in lines
+    assert 'webtoon_pool_workers{pool="io"} 2' in lines
+    assert 'webtoon_pool_queue_depth{pool="io"} 0' in lines
+    assert 'webtoon_pool_wait_seconds_count{pool="io"} 1' in lines
+    assert 'webtoon_stage_bytes_total{stage="image.body"} 5' in lines
+    assert 'webtoon_stage_duration_seconds_bucket{stage="image.body",le="+Inf"} 1' in lines
+    assert 'webtoon_stage_duration_seconds_count{stage="image.first_byte"} 1' in lines
@@ -1,21 +1,29 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import os
 import tempfile
 import zipfile
 from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import fitz
 import pytest
 from PIL import Image
 
+from webtoon_downloader.core.imageinfo import read_image_size
 from webtoon_downloader.storage import (
     AioFileBufferedZipWriter,
+    AioFolderWriter,
     AioPdfWriter,
+    AioStreamingZipWriter,
     AioZipWriter,
+    BlobStore,
 )
 from webtoon_downloader.storage.exceptions import StreamWriteError
+from webtoon_downloader.storage.file import PARTIAL_SUFFIX
 
 
 async def async_iter_image(image: Image.Image, chunk_size: int = 1024) -> AsyncIterator[bytes]:
@@ -32,7 +40,9 @@ async def async_iter(data: bytes, chunk_size: int = 1024) -> AsyncIterator[bytes
         yield data[i : i + chunk_size]
 
 
-async def _test_zipwriter(file: str | os.PathLike | io.BytesIO, zip_writer: type[AioZipWriter]) -> None:
+async def _test_zipwriter(
+    file: str | os.PathLike | io.BytesIO, zip_writer: type[AioZipWriter | AioStreamingZipWriter]
+) -> None:
     test_files = [
         ("test.txt", b"Through Heaven and Earth, I Alone am the Honored One."),
         ("唯", "天上天下 唯我独尊".encode()),
@@ -76,15 +86,65 @@ async def test_pdf_writer() -> None:
                 assert pix.width == img.width and pix.height == img.height
 
 
+@pytest.mark.asyncio
+async def test_pdf_writer_embeds_identical_images_once(tmp_path: Path) -> None:
+    end_card, page = io.BytesIO(), io.BytesIO()
+    Image.new("RGB", (40, 60), color="black").save(end_card, format="JPEG")
+    Image.new("RGB", (40, 60), color="white").save(page, format="JPEG")
+
+    destination = tmp_path / "volume.pdf"
+    # Checkpointing after every page checks that embedded images are still referenced once the document is reopened
+    async with AioPdfWriter(destination, checkpoint_size=1) as writer:
+        for chapter in (1, 2):
+            await writer.write(async_iter(page.getvalue()), f"{chapter:02d}_1.jpg")
+            await writer.write(async_iter(end_card.getvalue()), f"{chapter:02d}_2.jpg")
+
+    with fitz.open(destination) as doc:
+        xrefs = [doc.load_page(n).get_images()[0][0] for n in range(len(doc))]  # pyright: ignore[reportAttributeAccessIssue]
+    assert xrefs[0] == xrefs[2] and xrefs[1] == xrefs[3]
+    assert xrefs[0] != xrefs[1]
+
+
+@pytest.mark.asyncio
+async def test_pdf_writer_orders_pages_arriving_out_of_order(tmp_path: Path) -> None:
+    sizes = {n: (40 + n, 60 + n) for n in range(1, 9)}
+    images = {}
+    for n, size in sizes.items():
+        output = io.BytesIO()
+        Image.new("RGB", size, color="red").save(output, format="PNG" if n % 2 else "JPEG")
+        images[n] = output.getvalue()
+
+    destination = tmp_path / "chapter.pdf"
+    # Tiny buffers force out-of-order pages to be spilled and the document to be saved incrementally
+    async with AioPdfWriter(destination, reorder_buffer_size=1, checkpoint_size=1) as writer:
+        for n in [3, 1, 8, 2, 5, 7, 4, 6]:
+            await writer.write(async_iter(images[n]), f"01_{n}.jpg")
+            assert not destination.exists()
+
+    assert not (tmp_path / "chapter.pdf.part").exists()
+    with fitz.open(destination) as doc:
+        assert [(int(page.rect.width), int(page.rect.height)) for page in doc] == list(sizes.values())
+
+
+@pytest.mark.parametrize("image_format", ["JPEG", "PNG", "GIF", "BMP", "WEBP"])
+def test_read_image_size_from_headers(image_format: str) -> None:
+    output = io.BytesIO()
+    Image.new("RGB", (123, 457), color="blue").save(output, format=image_format)
+
+    assert read_image_size(output.getvalue()) == (123, 457)
+    assert read_image_size(output.getvalue()[:8]) is None
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "zip_writer",
     [
         AioZipWriter,
         AioFileBufferedZipWriter,
+        AioStreamingZipWriter,
     ],
 )
-async def test_zipwriter_buffer(zip_writer: type[AioZipWriter]) -> None:
+async def test_zipwriter_buffer(zip_writer: type[AioZipWriter | AioStreamingZipWriter]) -> None:
     await _test_zipwriter(io.BytesIO(), zip_writer)
 
 
@@ -94,9 +154,10 @@ async def test_zipwriter_buffer(zip_writer: type[AioZipWriter]) -> None:
     [
         AioZipWriter,
         AioFileBufferedZipWriter,
+        AioStreamingZipWriter,
     ],
 )
-async def test_zipwriter_file(zip_writer: type[AioZipWriter]) -> None:
+async def test_zipwriter_file(zip_writer: type[AioZipWriter | AioStreamingZipWriter]) -> None:
     fd, path = tempfile.mkstemp(prefix="test_storage", suffix=".zip")
     os.close(fd)
     try:
@@ -107,13 +168,98 @@ async def test_zipwriter_file(zip_writer: type[AioZipWriter]) -> None:
 
 
 @pytest.mark.asyncio
-async def test_write_raises_stream_write_error() -> None:
-    async with AioZipWriter(io.BytesIO()) as writer:
+async def test_streaming_zipwriter_stores_images_and_orders_pages() -> None:
+    buffer = io.BytesIO()
+    image = io.BytesIO()
+    Image.new("RGB", (64, 64), color="red").save(image, format="JPEG")
+    comicinfo = b"<?xml version='1.0'?><ComicInfo>" + b"<Series>Tower of God</Series>" * 20 + b"</ComicInfo>"
+
+    async def _write_after(writer: AioStreamingZipWriter, delay: float, name: str, data: bytes) -> None:
+        await asyncio.sleep(delay)
+        await writer.write(async_iter(data), name)
+
+    async with AioStreamingZipWriter(buffer) as writer:
+        # Pages complete out of order
+        await asyncio.gather(
+            _write_after(writer, 0.02, "01.jpg", image.getvalue()),
+            _write_after(writer, 0.01, "03.jpg", image.getvalue()),
+            _write_after(writer, 0.0, "02.jpg", image.getvalue()),
+        )
+        await writer.write(async_iter(comicinfo), "ComicInfo.xml")
+
+    buffer.seek(0)
+    with zipfile.ZipFile(buffer, "r") as zf:
+        assert zf.namelist() == ["01.jpg", "02.jpg", "03.jpg", "ComicInfo.xml"]
+        assert zf.getinfo("02.jpg").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("ComicInfo.xml").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("03.jpg") == image.getvalue()
+        assert zf.read("ComicInfo.xml") == comicinfo
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("zip_writer", [AioZipWriter, AioStreamingZipWriter])
+async def test_write_raises_stream_write_error(zip_writer: type[AioZipWriter | AioStreamingZipWriter]) -> None:
+    async with zip_writer(io.BytesIO()) as writer:
         with pytest.raises(StreamWriteError):
             # Passing an invalid file name
             await writer.write(async_iter(b"some data"), 12)
 
     with pytest.raises(StreamWriteError), tempfile.TemporaryDirectory() as dir_path:
         # Opening a directory should cause an error
-        async with AioZipWriter(dir_path) as writer:
+        async with zip_writer(dir_path) as writer:
             await writer.write(async_iter(b"some data"), "test.txt")
+
+
+@pytest.mark.asyncio
+async def test_streaming_zipwriter_fails_queued_writes_when_flusher_fails() -> None:
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+
+    with pytest.raises(StreamWriteError):
+        async with AioStreamingZipWriter(io.BytesIO(), executor=executor) as writer:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    writer.write(async_iter(b"first"), "01.jpg"),
+                    writer.write(async_iter(b"second"), "02.jpg"),
+                    return_exceptions=True,
+                ),
+                timeout=5,
+            )
+            assert all(isinstance(result, StreamWriteError) for result in results)
+    # The archive is closed even though its last entries could not be written
+    assert writer._zip_file.fp is None
+
+
+@pytest.mark.asyncio
+async def test_folder_writer_writes_files_atomically(tmp_path: Path) -> None:
+    data = os.urandom(10_000)
+
+    async def failing_stream() -> AsyncIterator[bytes]:
+        async for chunk in async_iter(data):
+            yield chunk
+        raise ConnectionError
+
+    async with AioFolderWriter(tmp_path, buffer_size=4096) as writer:
+        # Flushed three times, then committed along with the last chunks
+        assert await writer.write(async_iter(data), "chapter/01.jpg") == len(data)
+        assert await writer.write(async_iter(b""), "empty.jpg") == 0
+        with pytest.raises(StreamWriteError):
+            await writer.write(failing_stream(), "chapter/02.jpg")
+
+    assert (tmp_path / "chapter" / "01.jpg").read_bytes() == data
+    assert (tmp_path / "empty.jpg").read_bytes() == b""
+    assert not (tmp_path / "chapter" / "02.jpg").exists()
+    assert not [path for path in tmp_path.rglob("*") if path.name.endswith(PARTIAL_SUFFIX)]
+
+
+@pytest.mark.asyncio
+async def test_blob_store_writes_concurrent_identical_images_once(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path)
+    data = os.urandom(4096)
+
+    blobs = await asyncio.gather(*(store.put(data, f"https://img/{index}.jpg", "100", ".jpg") for index in range(8)))
+
+    assert len(set(blobs)) == 1
+    assert await store.read(blobs[0]) == data
+    assert [path.name for path in (tmp_path / "blobs").rglob("*") if path.is_file()] == [blobs[0].sha256]
+    assert await store.lookup("https://img/7.jpg", "100") == blobs[0]
@@ -1,13 +1,17 @@
+import asyncio
 import io
+from multiprocessing.shared_memory import SharedMemory
 
 import pytest
 from PIL import Image
 
+from webtoon_downloader.core.imageinfo import IMAGE_HEADER_SIZE, sniff_image_format
 from webtoon_downloader.transformers.image import (
     AioImageFormatTransformer,
     ImageFormat,
     _bytesio_to_async_gen,
 )
+from webtoon_downloader.transformers.pool import ProcessPoolTranscoder, _transcode_shared
 
 
 @pytest.mark.asyncio
@@ -52,3 +56,66 @@ async def test_image_format_transformer(original_format: str, target_format: Ima
         assert original_stream.read() == transformed_bytes_io.read(), (
             "Transformation should be skipped for same formats"
         )
+
+
+@pytest.mark.asyncio
+async def test_image_format_transformer_buffer_passthrough_without_decoding() -> None:
+    original = io.BytesIO()
+    Image.new("RGB", (10, 10), color="red").save(original, format="JPEG")
+    image_buffer = original.getvalue()
+
+    transformer = AioImageFormatTransformer("JPG")
+    transformed, target = await transformer.transform_buffer(image_buffer, "01.png")
+
+    assert transformed is image_buffer, "Buffers already in the target format must be handed over as is"
+    assert target == "01.jpg"
+
+
+@pytest.mark.parametrize(
+    "image_format",
+    ["JPEG", "PNG", "GIF", "WEBP", "BMP"],
+)
+def test_sniff_image_format(image_format: str) -> None:
+    output = io.BytesIO()
+    Image.new("RGB", (4, 4)).save(output, format=image_format)
+    assert sniff_image_format(output.getvalue()[:IMAGE_HEADER_SIZE]) == image_format
+    assert sniff_image_format(b"<html>not an image</html>") is None
+
+
+@pytest.mark.asyncio
+async def test_image_format_transformer_process_pool() -> None:
+    original_stream = io.BytesIO()
+    Image.new("RGBA", (64, 64), color=(255, 0, 0, 128)).save(original_stream, format="PNG")
+
+    transcoder = ProcessPoolTranscoder(workers=2, max_in_flight=2)
+    transformer = AioImageFormatTransformer("JPG", transcoder=transcoder)
+    try:
+        results = await asyncio.gather(
+            *(transformer.transform_buffer(original_stream.getvalue(), f"{i}.png") for i in range(6))
+        )
+    finally:
+        transcoder.shutdown()
+
+    assert transcoder.in_flight == 0
+    for i, (buffer, name) in enumerate(results):
+        assert name == f"{i}.jpg"
+        with Image.open(io.BytesIO(buffer)) as image:
+            assert image.format == "JPEG"
+            assert image.size == (64, 64)
+
+
+def test_transcode_shared_returns_the_converted_image() -> None:
+    original_stream = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(original_stream, format="PNG")
+    image = original_stream.getvalue()
+
+    # The parent owns the only shared memory block; the worker returns the converted bytes
+    source = SharedMemory(create=True, size=len(image) + 16)
+    try:
+        source.buf[: len(image)] = image
+        output = _transcode_shared(source.name, len(image), "JPEG")
+    finally:
+        source.close()
+        source.unlink()
+
+    assert sniff_image_format(output[:IMAGE_HEADER_SIZE]) == "JPEG"
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import multiprocessing
 import signal
 import sys
-from typing import Any, Literal
+from typing import Any, Literal, TextIO
 
 import rich_click as click
 
@@ -16,18 +17,25 @@ from webtoon_downloader.cmd.exceptions import (
     CLIInvalidStartAndEndRangeError,
     CLILatestWithStartOrEndError,
     CLISeparateOptionWithNonImageSaveAsError,
+    CLISyncWithRangeError,
+    CLIURLWithBatchError,
+    CLIVolumeSizeWithImageSaveAsError,
 )
 from webtoon_downloader.cmd.progress import ChapterProgressManager, init_progress
 from webtoon_downloader.core.exceptions import DownloadError, WebtoonDownloadError
+from webtoon_downloader.core.executors import DEFAULT_IO_WORKERS
+from webtoon_downloader.core.metrics import DownloadMetrics, MetricsServer
+from webtoon_downloader.core.webtoon.cache import DEFAULT_CACHE_MAX_SIZE
 from webtoon_downloader.core.webtoon.client import RetryStrategy
-from webtoon_downloader.core.webtoon.downloaders import comic
 from webtoon_downloader.core.webtoon.downloaders.options import (
     DEFAULT_CONCURRENT_CHAPTER_DOWNLOADS,
     DEFAULT_CONCURRENT_IMAGE_DOWNLOADS,
+    DEFAULT_PREFETCH_CHAPTERS,
     StorageType,
     WebtoonDownloadOptions,
 )
 from webtoon_downloader.core.webtoon.exporter import DataExporterFormat
+from webtoon_downloader.core.webtoon.parsing import ParserExecutorType
 from webtoon_downloader.transformers.image import ImageFormat
 from webtoon_downloader.i18n import t
 
@@ -71,7 +79,13 @@ def _unwrap_error_chain(exc: Exception) -> list[str]:
 @click.version_option(package_name="webtoon_downloader")
 @click.pass_context
 @click.rich_config(help_config=help_config)
-@click.argument("url", required=True, type=str)
+@click.argument("url", required=False, type=str)
+@click.option(
+    "--batch",
+    "-b",
+    type=click.File("r", encoding="utf-8"),
+    help="Download every series listed in a file, one URL per line. Use - to read from stdin.",
+)
 @click.option(
     "--start",
     "-s",
@@ -121,11 +135,29 @@ def _unwrap_error_chain(exc: Exception) -> list[str]:
     show_default=True,
     help="Choose the format to save each downloaded chapter",
 )
+@click.option(
+    "--volume-size",
+    type=int,
+    default=None,
+    callback=validate_concurrent_count,
+    help="Store every N consecutive chapters in a single archive or PDF instead of one file per chapter",
+)
 @click.option(
     "--separate",
     is_flag=True,
     help="Download each chapter in separate folders",
 )
+@click.option(
+    "--sync",
+    is_flag=True,
+    help="Only download the chapters published since the last sync of the output directory",
+)
+@click.option(
+    "--resume/--no-resume",
+    default=True,
+    show_default=True,
+    help="Skip the chapters and pages already downloaded to the output directory, as recorded in its manifest",
+)
 @click.option(
     "--dest",
     callback=webtoon_downloader.cmd.exceptions.handle_deprecated_options,
@@ -156,11 +188,84 @@ def _unwrap_error_chain(exc: Exception) -> list[str]:
     callback=validate_concurrent_count,
     help="Number of workers for concurrent image downloads. This value is shared between all concurrent chapter downloads.",
 )
+@click.option(
+    "--prefetch-chapters",
+    type=int,
+    default=DEFAULT_PREFETCH_CHAPTERS,
+    callback=validate_concurrent_count,
+    help="Number of chapters whose viewer pages are fetched ahead of the image downloads",
+)
+@click.option(
+    "--adaptive-concurrency",
+    is_flag=True,
+    help="Adapt the number of concurrent image downloads to rate limiting and latency, using --concurrent-pages as the ceiling.",
+)
+@click.option(
+    "--transcode-workers",
+    type=int,
+    default=None,
+    callback=validate_concurrent_count,
+    help="Convert images in a pool of worker processes of the given size instead of a thread. Useful with --image-format on multi-core machines.",
+)
+@click.option(
+    "--parser-executor",
+    type=click.Choice(["thread", "process"]),
+    default="thread",
+    show_default=True,
+    help="Parse the series and viewer pages in a pool of threads or of worker processes, off the download loop.",
+)
+@click.option(
+    "--cpu-workers",
+    type=int,
+    default=None,
+    callback=validate_concurrent_count,
+    help="Number of threads converting images and parsing pages. Defaults to one per CPU.",
+)
+@click.option(
+    "--io-workers",
+    type=int,
+    default=DEFAULT_IO_WORKERS,
+    show_default=True,
+    callback=validate_concurrent_count,
+    help="Number of threads writing images, archives and PDFs to disk, apart from the threads converting images.",
+)
 @click.option(
     "--proxy",
     type=str,
     help="proxy address to use for making requests. e.g. http://127.0.0.1:7890",
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    help="Keep series pages, viewer pages and episode lists in an on-disk cache, so that re-runs skip fetching them again",
+)
+@click.option(
+    "--cache-size",
+    type=int,
+    default=DEFAULT_CACHE_MAX_SIZE // (1024 * 1024),
+    show_default=True,
+    callback=validate_concurrent_count,
+    help="Size of the on-disk cache in MiB, past which the least recently used responses are evicted",
+)
+@click.option(
+    "--dedup-dir",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    help="Keep every distinct page image once in this directory, hard-linking it into image output, and skip downloading images already in it",
+)
+@click.option(
+    "--max-requests-per-second",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Maximum number of requests per second sent to each host, shared by all downloads",
+)
+@click.option(
+    "--max-bandwidth",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Maximum download speed from each host in MiB/s, shared by all downloads",
+)
 @click.option(
     "--retry-strategy",
     type=click.Choice(["exponential", "linear", "fixed", "none"]),
@@ -176,24 +281,52 @@ def _unwrap_error_chain(exc: Exception) -> list[str]:
     callback=validate_quality,
     help="Image quality (must be between 40 and 100, divisible by 10)",
 )
+@click.option(
+    "--run-report",
+    is_flag=True,
+    help="Write the time and bytes of every download stage to webtoon-run-report.json next to the downloaded series",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(min=1, max=65535),
+    default=None,
+    help="Serve Prometheus metrics of the download at http://127.0.0.1:PORT/metrics while it runs",
+)
 @click.option("--debug", type=bool, is_flag=True, help="Enable debug mode")
 def cli(  # noqa: C901
     ctx: click.Context,
-    url: str,
+    url: str | None,
+    batch: TextIO | None,
     start: int,
     end: int,
     latest: bool,
     out: str,
     image_format: ImageFormat,
     separate: bool,
+    resume: bool,
+    sync: bool,
     export_metadata: bool,
     export_format: DataExporterFormat,
     save_as: StorageType,
+    volume_size: int | None,
     concurrent_chapters: int,
     concurrent_pages: int,
+    prefetch_chapters: int,
+    adaptive_concurrency: bool,
+    transcode_workers: int | None,
+    parser_executor: ParserExecutorType,
+    cpu_workers: int | None,
+    io_workers: int,
     proxy: str,
+    cache_dir: str | None,
+    cache_size: int,
+    dedup_dir: str | None,
+    max_requests_per_second: float | None,
+    max_bandwidth: float | None,
     retry_strategy: RetryStrategy | Literal["none"] | None,
     quality: int,
+    run_report: bool,
+    metrics_port: int | None,
     debug: bool,
 ) -> None:
     log, console = webtoon_downloader.logger.setup(
@@ -202,21 +335,29 @@ def cli(  # noqa: C901
         enable_console_logging=debug,
     )
 
-    if not url:
+    if url and batch:
+        raise CLIURLWithBatchError(ctx)
+    urls = _read_batch(batch) if batch else [url] if url else []
+    if not urls:
         console.print(
             '[red]A Webtoon URL of the form [green]"https://www.webtoons.com/.../list?title_no=??"[/] of is required.'
         )
         ctx.exit(1)
     if latest and (start or end):
         raise CLILatestWithStartOrEndError(ctx)
+    if sync and (latest or start or end):
+        raise CLISyncWithRangeError(ctx)
     if separate and (save_as != "images"):
         raise CLISeparateOptionWithNonImageSaveAsError(ctx)
+    if volume_size and save_as == "images":
+        raise CLIVolumeSizeWithImageSaveAsError(ctx)
     if start is not None and end is not None and start > end:
         raise CLIInvalidStartAndEndRangeError(ctx)
 
     progress = init_progress(console)
     series_download_task = progress.add_task(
         t("CLI_DOWNLOADING_CHAPTERS"),
+        total=None,
         type="Chapters",
         type_color="grey93",
         number_format=">02d",
@@ -224,9 +365,9 @@ def cli(  # noqa: C901
         rendered_total="??",
     )
 
-    progress_manager = ChapterProgressManager(progress, series_download_task)
+    progress_manager = ChapterProgressManager(progress, series_download_task, show_series_title=len(urls) > 1)
     opts = WebtoonDownloadOptions(
-        url=url,
+        url=urls[0],
         start=start,
         end=end,
         latest=latest,
@@ -234,15 +375,33 @@ def cli(  # noqa: C901
         export_metadata=export_metadata,
         exporter_format=export_format,
         separate=separate,
+        resume=resume,
+        sync=sync,
         image_format=image_format,
         save_as=save_as,
+        chapters_per_volume=volume_size,
         chapter_progress_callback=progress_manager.advance_progress,
         on_webtoon_fetched=progress_manager.on_webtoon_fetched,
         concurrent_chapters=concurrent_chapters,
         concurrent_pages=concurrent_pages,
+        prefetch_chapters=prefetch_chapters,
+        adaptive_concurrency=adaptive_concurrency,
+        on_concurrency_changed=progress_manager.on_concurrency_changed,
+        transcode_workers=transcode_workers,
+        parser_executor=parser_executor,
+        cpu_workers=cpu_workers,
+        io_workers=io_workers,
         retry_strategy=retry_strategy if retry_strategy != "none" else None,
         quality=quality,
         proxy=proxy,
+        cache_dir=cache_dir,
+        blob_store_dir=dedup_dir,
+        cache_size=cache_size * 1024 * 1024,
+        requests_per_second=max_requests_per_second,
+        bytes_per_second=max_bandwidth * 1024 * 1024 if max_bandwidth else None,
+        on_rate_limit_changed=progress_manager.on_rate_limit_changed,
+        run_report=run_report,
+        metrics=DownloadMetrics() if metrics_port else None,
     )
 
     # Python 3.14 no longer creates an implicit event loop for the main thread.
@@ -279,7 +438,7 @@ def cli(  # noqa: C901
         progress.print(t("CLI_CTRL_C"))
         with contextlib.suppress(GracefulExit, asyncio.CancelledError):
             try:
-                main_task = loop.create_task(comic.download_webtoon(opts))
+                main_task = loop.create_task(_download(urls, opts, metrics_port))
                 loop.run_until_complete(main_task)
                 progress.print(t("CLI_DOWNLOAD_COMPLETE"))
             except WebtoonDownloadError as exc:
@@ -297,8 +456,32 @@ def cli(  # noqa: C901
                 loop.close()
 
 
+def _read_batch(batch: TextIO) -> list[str]:
+    """Reads the series URLs of a batch file, one per line, skipping blank lines and `#` comments."""
+    urls = (line.strip() for line in batch)
+    return [url for url in urls if url and not url.startswith("#")]
+
+
+async def _download(urls: list[str], opts: WebtoonDownloadOptions, metrics_port: int | None = None) -> None:
+    """
+    Downloads the Webtoons without keeping the results of completed chapters around, serving their metrics on
+    `metrics_port` if set.
+    """
+    # Imported once a download starts, so that --help and argument errors do not load the download pipeline
+    from webtoon_downloader.core.webtoon.downloaders import comic
+
+    stream = comic.stream_webtoon(opts) if len(urls) == 1 else comic.stream_webtoons(urls, opts)
+    async with contextlib.AsyncExitStack() as stack:
+        if opts.metrics and metrics_port:
+            await stack.enter_async_context(MetricsServer(opts.metrics, port=metrics_port))
+        async for _ in stream:
+            pass
+
+
 def run() -> None:
     """CLI entrypoint"""
+    # In a frozen executable, worker processes of the transcoding and parsing pools start here and must not run the CLI
+    multiprocessing.freeze_support()
     if len(sys.argv) <= 1:
         sys.argv.append("--help")
 
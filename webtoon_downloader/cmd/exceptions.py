@@ -35,6 +35,35 @@ class CLILatestWithStartOrEndError(click.UsageError):
         super().__init__(message, ctx)
 
 
+class CLISyncWithRangeError(click.UsageError):
+    """
+    This error is raised when the user attempts to use --sync in conjunction
+    with --start, --end or --latest. A sync always downloads every chapter
+    published since the previous one.
+
+    Args:
+        ctx: The Click context associated with the error, if any.
+    """
+
+    def __init__(self, ctx: click.Context | None = None) -> None:
+        message = "Option --sync cannot be used together with --start, --end or --latest."
+        super().__init__(message, ctx)
+
+
+class CLIURLWithBatchError(click.UsageError):
+    """
+    This error is raised when the user provides both a series URL and a
+    --batch file. The URLs of a batch are all read from the file.
+
+    Args:
+        ctx: The Click context associated with the error, if any.
+    """
+
+    def __init__(self, ctx: click.Context | None = None) -> None:
+        message = "A series URL and --batch cannot be used together."
+        super().__init__(message, ctx)
+
+
 class CLISeparateOptionWithNonImageSaveAsError(click.UsageError):
     """
     This error is raised when the user attempts to use --separate with a save-as
@@ -50,6 +79,20 @@ class CLISeparateOptionWithNonImageSaveAsError(click.UsageError):
         super().__init__(message, ctx)
 
 
+class CLIVolumeSizeWithImageSaveAsError(click.UsageError):
+    """
+    This error is raised when the user attempts to use --volume-size with
+    --save-as 'images'. Volumes are archives or PDFs holding several chapters.
+
+    Args:
+        ctx: The Click context associated with the error, if any.
+    """
+
+    def __init__(self, ctx: click.Context | None = None) -> None:
+        message = "Option --volume-size is only compatible with --save-as 'zip', 'cbz' or 'pdf'."
+        super().__init__(message, ctx)
+
+
 class CLIDeprecatedOptionError(click.UsageError):
     """
     Custom error for handling deprecated options in the CLI.
@@ -19,8 +19,8 @@ from rich.progress import (
 from rich.text import Text
 
 from webtoon_downloader.core.webtoon.downloaders.callbacks import ChapterProgressType
-from webtoon_downloader.core.webtoon.extractor import WebtoonViewerPageExtractor
-from webtoon_downloader.core.webtoon.models import ChapterInfo
+from webtoon_downloader.core.webtoon.models import ChapterInfo, ViewerPageData
+from webtoon_downloader.core.webtoon.ratelimit import HostRateLimitState
 
 
 class ChapterTask(NamedTuple):
@@ -101,30 +101,38 @@ class ChapterProgressManager:
     Responsible for adding, updating, and completing tasks associated with each chapter's download process.
 
     Attributes:
-        progress: The rich progress object used to display the download progress.
+        progress            : The rich progress object used to display the download progress.
+        series_download_task: The task tracking the number of completed chapters.
+        show_series_title   : Whether to prefix chapter tasks with their series title, when downloading several series.
     """
 
     progress: Progress
     series_download_task: TaskID
+    show_series_title: bool = False
 
-    _task_ids: dict[int, ChapterTask] = field(init=False)
+    _task_ids: dict[ChapterInfo, ChapterTask] = field(init=False)
+    _series_description: str = field(init=False)
+    _concurrency_limit: int | None = field(init=False, default=None)
+    _paused_hosts: set[str] = field(init=False, default_factory=set)
 
     def __post_init__(self) -> None:
         self._task_ids = {}
+        self._series_description = self._get_task(self.series_download_task).description
 
     async def on_webtoon_fetched(self, chapters: Sequence[ChapterInfo]) -> None:
         """
         Callback function to update the progress bar when a webtoon's chapters are fetched.
 
-        Updates the task in the progress bar with the total number of chapters fetched,
+        Adds the number of chapters fetched to the total of the task in the progress bar, so that the chapters of
+        several series add up.
 
         Args:
             chapters    : List of chapters that have been fetched.
-            progress    : The progress bar instance to update.
-            task        : The ID of the task in the progress bar being updated.
         """
-        total_chapters = len(chapters)
-        rendered_total, rendered_completed = self._rendered_page_counter(total_chapters, 0)
+        series_task = self._get_task(self.series_download_task)
+        total_chapters = int(series_task.total or 0) + len(chapters)
+        completed = int(series_task.completed)
+        rendered_total, rendered_completed = self._rendered_page_counter(total_chapters, completed)
         self.progress.update(
             self.series_download_task,
             total=total_chapters,
@@ -132,11 +140,42 @@ class ChapterProgressManager:
             rendered_completed=rendered_completed,
         )
 
+    async def on_concurrency_changed(self, limit: int) -> None:
+        """
+        Callback function to display the current image concurrency window next to the series progress.
+
+        Args:
+            limit: The new number of concurrent image downloads.
+        """
+        self._concurrency_limit = limit
+        self._update_series_description()
+
+    async def on_rate_limit_changed(self, state: HostRateLimitState) -> None:
+        """
+        Callback function to display the hosts whose traffic is paused next to the series progress.
+
+        Args:
+            state: The state of the host that was paused or resumed.
+        """
+        if state.paused_for > 0:
+            self._paused_hosts.add(state.host)
+        else:
+            self._paused_hosts.discard(state.host)
+        self._update_series_description()
+
+    def _update_series_description(self) -> None:
+        description = self._series_description
+        if self._concurrency_limit is not None:
+            description += f" [grey70](pages x{self._concurrency_limit})[/]"
+        if self._paused_hosts:
+            description += f" [yellow](rate limited by {', '.join(sorted(self._paused_hosts))})[/]"
+        self.progress.update(self.series_download_task, description=description)
+
     async def advance_progress(
         self,
         chapter_info: ChapterInfo,
         progress_type: ChapterProgressType,
-        extractor: WebtoonViewerPageExtractor | None,
+        viewer_page: ViewerPageData | None,
     ) -> None:
         """
         Advance the progress of a chapter download based on its current state.
@@ -144,12 +183,12 @@ class ChapterProgressManager:
         Args:
             chapter_info    : Information about the chapter being downloaded.
             progress_type   : The type of progress update to process.
-            extractor       : The extractor used for the chapter, if applicable.
+            viewer_page     : The data of the chapter viewer page, if applicable.
         """
         if progress_type == "Start":
             self._add_task(chapter_info)
-        elif progress_type == "ChapterInfoFetched" and extractor:
-            total = len(extractor.img_urls)
+        elif progress_type == "ChapterInfoFetched" and viewer_page:
+            total = len(viewer_page.img_urls)
             self._update_task(chapter_info, total)
         elif progress_type == "PageCompleted":
             self._start_task(chapter_info)
@@ -159,8 +198,11 @@ class ChapterProgressManager:
 
     def _add_task(self, chapter_info: ChapterInfo) -> None:
         """Add a new progress task for a chapter."""
+        description = f"Chapter {chapter_info.number}."
+        if self.show_series_title:
+            description = f"{chapter_info.series_title} - {description}"
         task_id = self.progress.add_task(
-            f"[plum2]Chapter {chapter_info.number}.",
+            f"[plum2]{description}",
             type="Pages",
             type_color="grey85",
             number_format=">02d",
@@ -168,17 +210,17 @@ class ChapterProgressManager:
             rendered_completed="00",
             rendered_total="??",
         )
-        self._task_ids[chapter_info.number] = ChapterTask(task_id, False)
+        self._task_ids[chapter_info] = ChapterTask(task_id, False)
 
     def _start_task(self, chapter_info: ChapterInfo) -> None:
         """Start the progress task for a chapter."""
-        task = self._task_ids[chapter_info.number]
+        task = self._task_ids[chapter_info]
         if not task.started:
             self.progress.start_task(task.task)
 
     def _progress_task(self, chapter_info: ChapterInfo) -> None:
         """Advance the progress of a chapter's task by one step."""
-        task = self._task_ids[chapter_info.number]
+        task = self._task_ids[chapter_info]
         self.progress.update(task.task, advance=1)
         progress_task = self._get_task(task.task)
         total = int(progress_task.total or 0)
@@ -188,7 +230,7 @@ class ChapterProgressManager:
 
     def _update_task(self, chapter_info: ChapterInfo, total: int) -> None:
         """Update the progress task of a chapter with the total number of pages."""
-        task = self._task_ids[chapter_info.number]
+        task = self._task_ids[chapter_info]
         rendered_total, rendered_completed = self._rendered_page_counter(total, 0)
         self.progress.update(
             task.task, total=total, rendered_total=rendered_total, rendered_completed=rendered_completed
@@ -201,7 +243,7 @@ class ChapterProgressManager:
 
     async def _complete_task(self, chapter_info: ChapterInfo) -> None:
         """Complete the progress task for a chapter and remove it from tracking."""
-        task = self._task_ids[chapter_info.number]
+        task = self._task_ids[chapter_info]
         self.progress.update(self.series_download_task, advance=1)
         series_task = self._get_task(self.series_download_task)
         series_total = int(series_task.total or 0)
@@ -214,7 +256,7 @@ class ChapterProgressManager:
         )
         await asyncio.sleep(0.5)
         self.progress.remove_task(task.task)
-        del self._task_ids[chapter_info.number]
+        del self._task_ids[chapter_info]
 
     def _get_task(self, task_id: TaskID) -> Task:
         """Find a Rich task by its id, independent of internal list ordering."""
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-import asyncio
+import hashlib
 import logging
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
-from typing import Protocol
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import PurePath
+from types import TracebackType
+from typing import Protocol, cast
 
 import httpx
 
+from webtoon_downloader.core.downloaders.limiter import ConcurrencyLimiter, FixedConcurrencyLimiter
 from webtoon_downloader.core.exceptions import ImageDownloadError, RateLimitedError
+from webtoon_downloader.core.timing import StageTimings
 from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
-from webtoon_downloader.storage import AioWriter
-from webtoon_downloader.transformers.base import AioImageTransformer
+from webtoon_downloader.storage import AioLinker, AioWriter, Blob, BlobStore
+from webtoon_downloader.transformers.base import AioBufferTransformer, AioImageTransformer
 
 log = logging.getLogger(__name__)
 
@@ -27,12 +31,14 @@ class ImageDownloadResult:
     Represents the ImageDownloadResult
 
     Args:
-        name: Name of downloaded image.
-        size: Size of the image downloaded/written.
+        name    : Name of downloaded image.
+        size    : Size of the image downloaded/written.
+        sha256  : Hex digest of the bytes written, if known.
     """
 
     name: str
     size: int
+    sha256: str | None = None
 
 
 class ImageDownloader(Protocol):
@@ -41,18 +47,33 @@ class ImageDownloader(Protocol):
 
 
 class HttpImageDownloader:
+    """
+    Downloads images over HTTP, bounding the number of concurrent downloads with a concurrency limiter.
+
+    Args:
+        client                      : HTTP client for making web requests.
+        concurrent_downloads_limit  : The number of images to download concurrently. Ignored if `limiter` is set.
+        transformers                : Transformers applied to each image stream before it is written.
+        progress_callback           : Optional callback for reporting image download progress.
+        limiter                     : Optional limiter bounding concurrent downloads, e.g. an adaptive one.
+        timings                     : Optional collector of the time images take to be transformed and written.
+    """
+
     def __init__(
         self,
         client: WebtoonHttpClient,
         concurrent_downloads_limit: int,
         transformers: list[AioImageTransformer] | None = None,
         progress_callback: ImageProgressCallback | None = None,
+        limiter: ConcurrencyLimiter | None = None,
+        timings: StageTimings | None = None,
     ):
         self.client = client
         self.concurrent_downloads_limit = concurrent_downloads_limit
         self.transformers = transformers if transformers is not None else []
         self.progress_callback = progress_callback
-        self._semaphore = asyncio.Semaphore(self.concurrent_downloads_limit)
+        self.limiter = limiter if limiter is not None else FixedConcurrencyLimiter(self.concurrent_downloads_limit)
+        self.timings = timings or StageTimings()
 
     async def run(self, url: str, target: str, storage: AioWriter, quality: int | None = 100) -> ImageDownloadResult:
         """
@@ -71,8 +92,7 @@ class HttpImageDownloader:
             ImageDownloadError: If an error occurs during the download process.
         """
         try:
-            async with self._semaphore:
-                return await self._download_image(url, target, storage, quality)
+            return await self._download_image(url, target, storage, quality)
         except Exception as exc:
             raise ImageDownloadError(url=url, cause=exc) from exc
 
@@ -84,8 +104,14 @@ class HttpImageDownloader:
 
         This also applies transformations to the stream, and saves it to the storage.
 
+        The image holds a slot of the concurrency limiter while it is fetched. When the transformers work on whole
+        buffers, the slot is released once the body is read, so that transforming and writing the image do not count
+        towards the request latency the limiter adapts to. Otherwise the image is transformed and written as it
+        streams in, within the slot.
         """
-        async with self.client.stream_image(url, quality) as response:
+        buffered = self._supports_buffer_path()
+        digest = hashlib.sha256()
+        async with self.limiter.slot(), self.client.stream_image(url, quality) as response:
             try:
                 response.raise_for_status()
             except httpx.HTTPError as exc:
@@ -94,14 +120,72 @@ class HttpImageDownloader:
                         url=url, cause=RateLimitedError(f"Rate limited while downloading image from {url}")
                     ) from exc
 
-            size = 0
-            response_stream = response.aiter_bytes()
-            for transformer in self.transformers:
-                response_stream, target = await transformer.transform(response_stream, target)
+            if buffered:
+                image_buffer = await response.aread()
+            else:
+                size, target = await self._write_stream(response.aiter_bytes(), target, storage, digest)
 
-            size = await storage.write(response_stream, target)
+        if buffered:
+            # The connection and the limiter slot are released before the image is transformed and written
+            size, target = await self._write_buffer(image_buffer, target, storage, digest)
         await self._update_progress()
-        return ImageDownloadResult(target, size)
+        return ImageDownloadResult(target, size, digest.hexdigest())
+
+    def _supports_buffer_path(self) -> bool:
+        """Returns True if every transformer can work on a whole image buffer instead of a chunked stream."""
+        return all(isinstance(transformer, AioBufferTransformer) for transformer in self.transformers)
+
+    async def _write_stream(
+        self, stream: AsyncIterator[bytes], target: str, storage: AioWriter, digest: hashlib._Hash
+    ) -> tuple[int, str]:
+        """
+        Applies the transformers to a chunked image stream and writes it to the storage.
+
+        The digest is updated with the bytes handed to the storage. The transformers run as the stream is written,
+        so their time is part of the `image.write` stage.
+
+        Returns:
+            The number of bytes written and the final target name.
+        """
+        for transformer in self.transformers:
+            stream, target = await transformer.transform(stream, target)
+
+        async def _hashed(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+            async for chunk in stream:
+                digest.update(chunk)
+                yield chunk
+
+        with self.timings.measure("image.write") as write:
+            write.bytes = await storage.write(_hashed(stream), target)
+        return write.bytes, target
+
+    async def _write_buffer(
+        self, image_buffer: bytes, target: str, storage: AioWriter, digest: hashlib._Hash
+    ) -> tuple[int, str]:
+        """
+        Applies the transformers to a fully downloaded image and writes it to the storage as a single chunk.
+
+        The same buffer object is handed from the network layer to the storage, without being split into chunks.
+        The digest is updated with the bytes handed to the storage.
+
+        Returns:
+            The number of bytes written and the final target name.
+        """
+        if self.transformers:
+            with self.timings.measure("image.transform") as transform:
+                for transformer in self.transformers:
+                    image_buffer, target = await cast(AioBufferTransformer, transformer).transform_buffer(
+                        image_buffer, target
+                    )
+                transform.bytes = len(image_buffer)
+        digest.update(image_buffer)
+
+        async def _single_chunk() -> AsyncIterator[bytes]:
+            yield image_buffer
+
+        with self.timings.measure("image.write") as write:
+            write.bytes = await storage.write(_single_chunk(), target)
+        return write.bytes, target
 
     async def _update_progress(self) -> None:
         """
@@ -109,3 +193,87 @@ class HttpImageDownloader:
         """
         if self.progress_callback:
             await self.progress_callback(1)
+
+
+@dataclass
+class DeduplicatingImageDownloader:
+    """
+    Downloads images through a `BlobStore`, so that identical images are stored once and known URLs are not fetched.
+
+    An image whose URL the store already knows, for the same quality and variant, is read from the store without
+    reaching the network. Otherwise it is downloaded by the wrapped downloader and added to the store. Either way,
+    the image is then written from its blob: writers supporting it, such as `AioFolderWriter`, hard-link the blob
+    rather than copying it, and other writers get its bytes.
+
+    Attributes:
+        downloader  : The downloader fetching the images missing from the store.
+        store       : The store holding the images.
+        variant     : Identifies what the wrapped downloader turns images into, such as their format, so that
+                      blobs of another format are not reused.
+    """
+
+    downloader: ImageDownloader
+    store: BlobStore
+    variant: str = ""
+
+    async def run(self, url: str, target: str, storage: AioWriter, quality: int | None = 100) -> ImageDownloadResult:
+        """
+        Writes an image to the storage, downloading it only if it is not in the store.
+
+        Args:
+            url       : The URL of the image to be downloaded.
+            target    : The target name of the image. Its extension is that of the stored image.
+            storage   : The storage writer for saving the image.
+            quality   : The quality of the image to download.
+
+        Returns:
+            ImageDownloadResult: The result of the download operation.
+        """
+        variant = f"{self.variant}/q{quality or 100}"
+        blob = await self.store.lookup(url, variant)
+        if blob is None:
+            buffer = _BufferWriter()
+            result = await self.downloader.run(url, target, buffer, quality)
+            blob = await self.store.put(buffer.data, url, variant, PurePath(result.name).suffix)
+        else:
+            log.debug('Image "%s" is already in the blob store as %s', url, blob.sha256)
+
+        target = str(PurePath(target).with_suffix(blob.suffix))
+        return ImageDownloadResult(target, await self._write(blob, target, storage), blob.sha256)
+
+    async def _write(self, blob: Blob, target: str, storage: AioWriter) -> int:
+        if isinstance(storage, AioLinker):
+            return await storage.link(self.store.path(blob), target)
+
+        data = await self.store.read(blob)
+
+        async def _single_chunk() -> AsyncIterator[bytes]:
+            yield data
+
+        return await storage.write(_single_chunk(), target)
+
+
+@dataclass
+class _BufferWriter:
+    """Writer keeping the bytes of the single item written to it in memory."""
+
+    chunks: list[bytes] = field(default_factory=list)
+
+    @property
+    def data(self) -> bytes:
+        return b"".join(self.chunks)
+
+    async def write(self, stream: AsyncIterator[bytes], item_name: str) -> int:
+        self.chunks = [chunk async for chunk in stream]
+        return sum(len(chunk) for chunk in self.chunks)
+
+    async def __aenter__(self) -> _BufferWriter:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        pass
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Literal, Protocol, TypeAlias
+
+import httpx
+
+from webtoon_downloader.core.exceptions import DownloadError, RateLimitedError
+
+log = logging.getLogger(__name__)
+
+ConcurrencyChangeCallback: TypeAlias = Callable[[int], Awaitable[None]]
+"""
+Callback invoked with the new concurrency window whenever an adaptive limiter resizes it.
+"""
+
+SampleOutcome: TypeAlias = Literal["ok", "error", "congested"]
+"""
+Outcome of a single request as seen by the limiter.
+- `ok`: The request succeeded.
+- `error`: The request failed for a reason unrelated to server pressure.
+- `congested`: The request was rate limited or timed out.
+"""
+
+
+class ConcurrencyLimiter(Protocol):
+    """Protocol for limiters bounding the number of concurrent image downloads."""
+
+    @property
+    def limit(self) -> int:
+        """The current maximum number of concurrent requests."""
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests currently holding a slot."""
+
+    def slot(self) -> AbstractAsyncContextManager[None]:
+        """Asynchronous context manager holding a slot for the duration of a request."""
+
+
+class FixedConcurrencyLimiter:
+    """
+    Limiter with a constant concurrency window, backed by a semaphore.
+
+    Args:
+        limit: The maximum number of concurrent requests.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._in_flight = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None]:
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                yield
+            finally:
+                self._in_flight -= 1
+
+
+def is_congestion_signal(exc: BaseException) -> bool:
+    """
+    Returns True if the exception, or any exception in its cause chain, indicates server pressure.
+
+    Rate limiting (HTTP 429) and timeouts are treated as congestion signals.
+    """
+    current: BaseException | None = exc
+    seen: set[int] = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, RateLimitedError | httpx.TimeoutException):
+            return True
+        if isinstance(current, DownloadError) and current.cause is not None:
+            current = current.cause
+        else:
+            current = current.__cause__
+    return False
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """Returns the nearest-rank percentile of the given values."""
+    ordered = sorted(values)
+    rank = max(0, math.ceil(percentile / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+@dataclass
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase/multiplicative-decrease (AIMD) concurrency limiter.
+
+    The window grows by `increase_step` after every full window of completed requests, as long as the error rate
+    and the p95 latency of the recent samples stay healthy. It shrinks by `decrease_factor` whenever a request is
+    rate limited or times out. Only requests that started after the last decrease can trigger another one, so a
+    burst of 429s from the same window only halves it once.
+
+    Attributes:
+        max_limit               : Upper bound for the concurrency window.
+        min_limit               : Lower bound for the concurrency window.
+        initial_limit           : Starting window. Defaults to `max_limit`.
+        increase_step           : Number of slots added on each additive increase.
+        decrease_factor         : Factor applied to the window on each multiplicative decrease.
+        error_rate_threshold    : Maximum error rate of the recent samples for the window to grow.
+        latency_tolerance       : The window only grows while p95 latency stays below the best observed p95 times this factor.
+        sample_size             : Number of recent samples used to compute the error rate and the p95 latency.
+        on_limit_change         : Optional callback invoked with the new window after each change.
+    """
+
+    max_limit: int
+    min_limit: int = 1
+    initial_limit: int | None = None
+    increase_step: int = 1
+    decrease_factor: float = 0.5
+    error_rate_threshold: float = 0.05
+    latency_tolerance: float = 2.0
+    sample_size: int = 50
+    on_limit_change: ConcurrencyChangeCallback | None = None
+
+    _limit: int = field(init=False)
+    _in_flight: int = field(init=False, default=0)
+    _epoch: int = field(init=False, default=0)
+    _completed_since_change: int = field(init=False, default=0)
+    _samples: deque[tuple[float, SampleOutcome]] = field(init=False)
+    _baseline_p95: float | None = field(init=False, default=None)
+    _condition: asyncio.Condition = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.min_limit <= 0 or self.max_limit < self.min_limit:
+            raise ValueError(f"Invalid concurrency bounds: min={self.min_limit}, max={self.max_limit}")  # noqa: TRY003
+        if not 0 < self.decrease_factor < 1:
+            raise ValueError(f"Decrease factor must be between 0 and 1, got {self.decrease_factor}")  # noqa: TRY003
+
+        initial = self.initial_limit if self.initial_limit is not None else self.max_limit
+        self._limit = min(max(initial, self.min_limit), self.max_limit)
+        self._samples = deque(maxlen=self.sample_size)
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def p95_latency(self) -> float | None:
+        """The p95 latency in seconds over the recent samples, or None if there are no samples yet."""
+        latencies = [latency for latency, _ in self._samples]
+        if not latencies:
+            return None
+        return _percentile(latencies, 95)
+
+    @property
+    def error_rate(self) -> float:
+        """The ratio of failed requests over the recent samples."""
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, outcome in self._samples if outcome != "ok") / len(self._samples)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None]:
+        """
+        Holds a slot of the concurrency window for the duration of the block.
+
+        The block's duration and outcome are fed back into the limiter. Exceptions raised inside the block
+        are classified with `is_congestion_signal` and always re-raised.
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self._limit)
+            self._in_flight += 1
+            epoch = self._epoch
+
+        started = time.monotonic()
+        outcome: SampleOutcome | None = "ok"
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Cancelled requests say nothing about the server's health
+            outcome = None
+            raise
+        except BaseException as exc:
+            outcome = "congested" if is_congestion_signal(exc) else "error"
+            raise
+        finally:
+            await self._release(epoch, time.monotonic() - started, outcome)
+
+    async def _release(self, epoch: int, latency: float, outcome: SampleOutcome | None) -> None:
+        """Releases a slot and adjusts the window based on the outcome of the request."""
+        async with self._condition:
+            self._in_flight -= 1
+            previous = self._limit
+            if outcome is None:
+                self._condition.notify_all()
+                return
+
+            self._samples.append((latency, outcome))
+            if outcome == "congested":
+                if epoch == self._epoch:
+                    self._decrease()
+            else:
+                self._completed_since_change += 1
+                if self._completed_since_change >= self._limit and self._is_healthy():
+                    self._increase()
+
+            self._condition.notify_all()
+            changed = previous != self._limit
+
+        if changed:
+            log.info(
+                "Image concurrency window %d -> %d (p95=%.3fs, error rate=%.1f%%)",
+                previous,
+                self._limit,
+                self.p95_latency or 0.0,
+                self.error_rate * 100,
+            )
+            if self.on_limit_change:
+                await self.on_limit_change(self._limit)
+
+    def _is_healthy(self) -> bool:
+        """Returns True if the recent error rate and p95 latency allow the window to grow."""
+        if self.error_rate > self.error_rate_threshold:
+            return False
+
+        p95 = self.p95_latency
+        if p95 is None:
+            return True
+
+        if self._baseline_p95 is None or p95 < self._baseline_p95:
+            self._baseline_p95 = p95
+        return p95 <= self._baseline_p95 * self.latency_tolerance
+
+    def _increase(self) -> None:
+        self._limit = min(self.max_limit, self._limit + self.increase_step)
+        self._completed_since_change = 0
+
+    def _decrease(self) -> None:
+        self._limit = max(self.min_limit, int(self._limit * self.decrease_factor))
+        self._completed_since_change = 0
+        self._epoch += 1
@@ -35,6 +35,15 @@ class WebtoonDownloadError(DownloadError):
     base_message: str = "Failed to download Webtoon"
 
 
+@dataclass
+class BatchDownloadError(WebtoonDownloadError):
+    """Exception raised once a batch download completes, if some of its series failed"""
+
+    base_message: str = "Failed to download Webtoons"
+
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+
 @dataclass
 class ImageDownloadError(DownloadError):
     """Exception raised for image download errors"""
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import ParamSpec, TypeVar
+
+from webtoon_downloader.core.timing import StageStats
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+DEFAULT_IO_WORKERS = 8
+"""Default number of threads running blocking storage writes."""
+
+
+def default_cpu_workers() -> int:
+    """Returns the default number of threads running CPU-bound work: one per CPU."""
+    return os.cpu_count() or 1
+
+
+class WorkerPool(Executor):
+    """
+    Thread pool reporting how many tasks wait for a thread and how long they wait.
+
+    Tasks waiting long, or many tasks queued, mean the pool is too small for the work it is given. Pools are kept
+    apart by the kind of work they run, so that image conversions cannot hold up storage writes, nor the other way
+    round.
+
+    Args:
+        name    : The name of the pool, used as the prefix of its thread names and as the label of its metrics.
+        workers : The number of threads of the pool.
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        if workers <= 0:
+            raise ValueError(f"Number of {name} workers must be positive, got {workers}")  # noqa: TRY003
+        self.name = name
+        self.workers = workers
+        self.wait = StageStats()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+
+    @property
+    def queued(self) -> int:
+        """The number of tasks submitted and waiting for a thread."""
+        return self._queued
+
+    @property
+    def active(self) -> int:
+        """The number of tasks running."""
+        return self._active
+
+    def submit(self, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+        submitted = time.perf_counter()
+
+        def _run() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self.wait.observe(time.perf_counter() - submitted)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        def _on_done(future: Future[T]) -> None:
+            # Tasks cancelled before starting never run, so they leave the queue here
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        with self._lock:
+            self._queued += 1
+        try:
+            future = self._executor.submit(_run)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(_on_done)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+@dataclass
+class WorkerPools:
+    """
+    Thread pools of a download, by the kind of work they run.
+
+    Attributes:
+        cpu : Pool converting images and parsing HTML pages.
+        io  : Pool running the blocking file, ZIP and PDF writes of the storage writers.
+    """
+
+    cpu: WorkerPool
+    io: WorkerPool
+
+    @classmethod
+    def create(cls, cpu_workers: int | None = None, io_workers: int = DEFAULT_IO_WORKERS) -> WorkerPools:
+        """
+        Starts the pools.
+
+        Args:
+            cpu_workers : The number of threads of the CPU pool. Defaults to one per CPU.
+            io_workers  : The number of threads of the I/O pool.
+        """
+        return cls(WorkerPool("cpu", cpu_workers or default_cpu_workers()), WorkerPool("io", io_workers))
+
+    def __iter__(self) -> Iterator[WorkerPool]:
+        return iter((self.cpu, self.io))
+
+    def shutdown(self) -> None:
+        """Stops the threads of the pools once their tasks are done."""
+        for pool in self:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import Literal, TypeAlias
+
+SniffedImageFormat: TypeAlias = Literal["JPEG", "PNG", "GIF", "WEBP", "BMP"]
+"""
+Image formats recognized from their magic bytes. Values match Pillow's format names.
+"""
+
+IMAGE_HEADER_SIZE = 16
+"""Number of leading bytes needed to recognize an image format."""
+
+
+def sniff_image_format(header: bytes | memoryview) -> SniffedImageFormat | None:
+    """
+    Recognizes the format of an image from its magic bytes, without decoding it.
+
+    Args:
+        header: The leading bytes of the image. At least `IMAGE_HEADER_SIZE` bytes are needed to recognize every format.
+
+    Returns:
+        The image format, or None if it is not recognized.
+    """
+    header = bytes(header[:IMAGE_HEADER_SIZE])
+    if header.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if header.startswith((b"GIF87a", b"GIF89a")):
+        return "GIF"
+    if header.startswith(b"RIFF") and header[8:12] == b"WEBP":
+        return "WEBP"
+    if header.startswith(b"BM"):
+        return "BMP"
+    return None
+
+
+_SIZE_HEADER_SIZES: dict[SniffedImageFormat, int] = {"JPEG": 4, "PNG": 24, "GIF": 10, "WEBP": 30, "BMP": 26}
+"""Number of leading bytes holding the dimensions of each format. JPEG dimensions are found by walking its segments."""
+
+_JPEG_SOF_MARKERS = frozenset({0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF})
+"""JPEG start-of-frame markers, whose segment holds the image dimensions."""
+
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, 0xD8, *range(0xD0, 0xD8)})
+"""JPEG markers without a length-prefixed segment."""
+
+
+def read_image_size(image_buffer: bytes | memoryview) -> tuple[int, int] | None:
+    """
+    Reads the dimensions of an image from its headers, without decoding it.
+
+    Args:
+        image_buffer: The bytes of the image. JPEG dimensions may follow large metadata segments,
+                      so the whole image should be given.
+
+    Returns:
+        The width and height of the image, or None if its format is not recognized or its headers are truncated.
+    """
+    data = memoryview(image_buffer)
+    image_format = sniff_image_format(data)
+    if image_format is None or len(data) < _SIZE_HEADER_SIZES[image_format]:
+        return None
+    if image_format == "JPEG":
+        return _read_jpeg_size(data)
+    if image_format == "PNG":
+        return int.from_bytes(data[16:20], "big"), int.from_bytes(data[20:24], "big")
+    if image_format == "GIF":
+        return int.from_bytes(data[6:8], "little"), int.from_bytes(data[8:10], "little")
+    if image_format == "WEBP":
+        return _read_webp_size(data)
+    height = int.from_bytes(data[22:26], "little", signed=True)
+    return int.from_bytes(data[18:22], "little", signed=True), abs(height)
+
+
+def _read_jpeg_size(data: memoryview) -> tuple[int, int] | None:
+    """Walks the JPEG segments up to the first start-of-frame segment."""
+    offset = 2
+    while offset + 9 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            offset += 1
+        elif marker in _JPEG_SOF_MARKERS:
+            height = int.from_bytes(data[offset + 5 : offset + 7], "big")
+            width = int.from_bytes(data[offset + 7 : offset + 9], "big")
+            return width, height
+        elif marker in _JPEG_STANDALONE_MARKERS:
+            offset += 2
+        else:
+            offset += 2 + int.from_bytes(data[offset + 2 : offset + 4], "big")
+    return None
+
+
+def _read_webp_size(data: memoryview) -> tuple[int, int] | None:
+    """Reads the dimensions from the first chunk of a lossy, lossless or extended WebP image."""
+    chunk = bytes(data[12:16])
+    if chunk == b"VP8 ":
+        width = int.from_bytes(data[26:28], "little") & 0x3FFF
+        height = int.from_bytes(data[28:30], "little") & 0x3FFF
+        return width, height
+    if chunk == b"VP8L":
+        bits = int.from_bytes(data[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+    return None
@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import TypeVar
+
+from webtoon_downloader.core.downloaders.limiter import ConcurrencyLimiter
+from webtoon_downloader.core.executors import WorkerPool
+from webtoon_downloader.core.timing import LATENCY_BUCKETS, StageTimings
+from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
+from webtoon_downloader.core.webtoon.downloaders.callbacks import ChapterProgressType
+from webtoon_downloader.core.webtoon.models import ChapterInfo, ViewerPageData
+from webtoon_downloader.transformers.image import AioImageFormatTransformer
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+METRICS_PATH = "/metrics"
+"""Path the metrics are served at."""
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Content type of the Prometheus text exposition format, which OpenMetrics scrapers also accept."""
+
+_REQUEST_TIMEOUT = 10.0
+"""Number of seconds a scraper has to send its request before the connection is closed."""
+
+Labels = dict[str, str]
+Sample = tuple[Labels, float]
+HistogramSample = tuple[str, Labels, float]
+
+
+@dataclass
+class DownloadMetrics:
+    """
+    Counters and gauges of a running download, rendered in the Prometheus text exposition format.
+
+    The chapter and page counts are fed by the same callbacks as the CLI progress bars, `on_webtoon_fetched` and
+    `on_chapter_progress`. The other metrics are read from the components of the download when the metrics are
+    rendered: the HTTP clients, the image concurrency limiters, the image transformers, the worker thread pools and
+    the stage timings, which are registered with `watch`.
+    """
+
+    _chapters: int = field(init=False, default=0)
+    _chapters_started: int = field(init=False, default=0)
+    _chapters_completed: int = field(init=False, default=0)
+    _pages_downloaded: int = field(init=False, default=0)
+    _clients: list[WebtoonHttpClient] = field(init=False, default_factory=list)
+    _limiters: list[ConcurrencyLimiter] = field(init=False, default_factory=list)
+    _transformers: list[AioImageFormatTransformer] = field(init=False, default_factory=list)
+    _timings: list[StageTimings] = field(init=False, default_factory=list)
+    _pools: list[WorkerPool] = field(init=False, default_factory=list)
+
+    def watch(
+        self,
+        *,
+        client: WebtoonHttpClient | None = None,
+        limiter: ConcurrencyLimiter | None = None,
+        transformers: Iterable[object] = (),
+        timings: StageTimings | None = None,
+        pools: Iterable[WorkerPool] = (),
+    ) -> None:
+        """
+        Registers components of the download to read metrics from. Components shared by several series, and
+        registered once per series, are only counted once.
+
+        Args:
+            client          : HTTP client whose in-flight requests, retries and rate limiting are reported.
+            limiter         : Limiter of the image downloads whose occupancy is reported.
+            transformers    : Image transformers whose pending conversions are reported. Transformers other than
+                              `AioImageFormatTransformer` are ignored.
+            timings         : Stage timings whose bytes and latency histograms are reported.
+            pools           : Worker thread pools whose queue depth and queue wait are reported.
+        """
+        _add(self._clients, client)
+        _add(self._limiters, limiter)
+        for transformer in transformers:
+            if isinstance(transformer, AioImageFormatTransformer):
+                _add(self._transformers, transformer)
+        _add(self._timings, timings)
+        for pool in pools:
+            _add(self._pools, pool)
+
+    async def on_webtoon_fetched(self, chapters: Sequence[ChapterInfo]) -> None:
+        """Counts the chapters of a series to download."""
+        self._chapters += len(chapters)
+
+    async def on_chapter_progress(
+        self, chapter_info: ChapterInfo, progress_type: ChapterProgressType, viewer_page: ViewerPageData | None = None
+    ) -> None:
+        """Counts the chapters started and completed, and the pages downloaded."""
+        if progress_type == "Start":
+            self._chapters_started += 1
+        elif progress_type == "PageCompleted":
+            self._pages_downloaded += 1
+        elif progress_type == "Completed":
+            self._chapters_completed += 1
+
+    def render(self) -> str:
+        """Returns the current value of every metric, in the Prometheus text exposition format."""
+        text = _MetricsText()
+        text.add("webtoon_chapters", "gauge", "Chapters to download.", [({}, self._chapters)])
+        text.add("webtoon_chapters_started_total", "counter", "Chapters started.", [({}, self._chapters_started)])
+        text.add(
+            "webtoon_chapters_completed_total", "counter", "Chapters downloaded.", [({}, self._chapters_completed)]
+        )
+        text.add(
+            "webtoon_pages_downloaded_total", "counter", "Pages written to storage.", [({}, self._pages_downloaded)]
+        )
+        text.add(
+            "webtoon_requests_in_flight",
+            "gauge",
+            "Page, API and image fetches in flight.",
+            [({}, sum(client.in_flight for client in self._clients))],
+        )
+        text.add(
+            "webtoon_image_slots_in_use",
+            "gauge",
+            "Image downloads holding a slot of the concurrency limiter.",
+            [({}, sum(limiter.in_flight for limiter in self._limiters))],
+        )
+        text.add(
+            "webtoon_image_slots",
+            "gauge",
+            "Slots of the image concurrency limiter.",
+            [({}, sum(limiter.limit for limiter in self._limiters))],
+        )
+        text.add(
+            "webtoon_transform_queue_depth",
+            "gauge",
+            "Images waiting to be converted or being converted.",
+            [({}, sum(transformer.pending for transformer in self._transformers))],
+        )
+        self._render_hosts(text)
+        self._render_pools(text)
+        self._render_stages(text)
+        return text.render()
+
+    def _render_hosts(self, text: _MetricsText) -> None:
+        requests: dict[str, float] = defaultdict(float)
+        retries: dict[str, float] = defaultdict(float)
+        rate_limited: dict[str, float] = defaultdict(float)
+        paused: dict[str, float] = defaultdict(float)
+        for client in self._clients:
+            for state in client.rate_limiter.states():
+                requests[state.host] += state.requests
+                retries[state.host] += state.retries
+                rate_limited[state.host] += state.rate_limited
+                paused[state.host] = max(paused[state.host], state.paused_for)
+
+        def _by_host(values: dict[str, float]) -> list[Sample]:
+            return [({"host": host}, value) for host, value in sorted(values.items())]
+
+        text.add("webtoon_http_requests_total", "counter", "HTTP requests sent, retries included.", _by_host(requests))
+        text.add(
+            "webtoon_http_retries_total", "counter", "HTTP requests sent again after a failure.", _by_host(retries)
+        )
+        text.add(
+            "webtoon_http_rate_limited_total",
+            "counter",
+            "Responses asking to retry later, such as 429 Too Many Requests.",
+            _by_host(rate_limited),
+        )
+        text.add(
+            "webtoon_http_paused_seconds",
+            "gauge",
+            "Seconds left before requests to a host resume after a Retry-After.",
+            _by_host(paused),
+        )
+
+    def _render_pools(self, text: _MetricsText) -> None:
+        text.add(
+            "webtoon_pool_workers",
+            "gauge",
+            "Threads of each worker pool.",
+            [({"pool": pool.name}, pool.workers) for pool in self._pools],
+        )
+        text.add(
+            "webtoon_pool_queue_depth",
+            "gauge",
+            "Tasks waiting for a thread of each worker pool.",
+            [({"pool": pool.name}, pool.queued) for pool in self._pools],
+        )
+        text.add(
+            "webtoon_pool_active",
+            "gauge",
+            "Tasks running in each worker pool.",
+            [({"pool": pool.name}, pool.active) for pool in self._pools],
+        )
+        samples: list[HistogramSample] = []
+        for pool in self._pools:
+            wait = pool.wait
+            samples.extend(_histogram_samples({"pool": pool.name}, wait.buckets, wait.seconds, wait.count))
+        text.add_histogram(
+            "webtoon_pool_wait_seconds",
+            "Time tasks wait for a thread of each worker pool. Long waits mean the pool is too small.",
+            samples,
+        )
+
+    def _render_stages(self, text: _MetricsText) -> None:
+        count: dict[str, int] = defaultdict(int)
+        seconds: dict[str, float] = defaultdict(float)
+        size: dict[str, int] = defaultdict(int)
+        buckets: dict[str, list[int]] = {}
+        for timings in self._timings:
+            for stage, stats in timings.stages.items():
+                count[stage] += stats.count
+                seconds[stage] += stats.seconds
+                size[stage] += stats.bytes
+                merged = buckets.setdefault(stage, [0] * len(stats.buckets))
+                for index, bucket_count in enumerate(stats.buckets):
+                    merged[index] += bucket_count
+
+        stages = sorted(count)
+        text.add(
+            "webtoon_stage_bytes_total",
+            "counter",
+            "Bytes processed by each download stage: image.body is downloaded, image.write is written to storage.",
+            [({"stage": stage}, size[stage]) for stage in stages if size[stage]],
+        )
+
+        samples: list[HistogramSample] = []
+        for stage in stages:
+            samples.extend(_histogram_samples({"stage": stage}, buckets[stage], seconds[stage], count[stage]))
+        text.add_histogram(
+            "webtoon_stage_duration_seconds",
+            "Duration of each download stage. image.write is the storage write latency.",
+            samples,
+        )
+
+
+class _MetricsText:
+    """Builder of a Prometheus text exposition."""
+
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+
+    def add(self, name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> None:
+        self._header(name, kind, help_text)
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def add_histogram(self, name: str, help_text: str, samples: Iterable[HistogramSample]) -> None:
+        self._header(name, "histogram", help_text)
+        for suffix, labels, value in samples:
+            self._lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+    def _header(self, name: str, kind: str, help_text: str) -> None:
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+
+def _add(items: list[T], item: T | None) -> None:
+    """Appends an item to a list unless it is None or already in it, comparing identities."""
+    if item is not None and all(existing is not item for existing in items):
+        items.append(item)
+
+
+def _histogram_samples(labels: Labels, buckets: Sequence[int], seconds: float, count: int) -> list[HistogramSample]:
+    """Returns the cumulative bucket, sum and count samples of a latency histogram over `LATENCY_BUCKETS`."""
+    samples: list[HistogramSample] = []
+    cumulative = 0
+    for bound, bucket_count in zip((*LATENCY_BUCKETS, float("inf")), buckets, strict=True):
+        cumulative += bucket_count
+        samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+    samples.append(("_sum", labels, seconds))
+    samples.append(("_count", labels, count))
+    return samples
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+@dataclass
+class MetricsServer:
+    """
+    Local HTTP endpoint serving `DownloadMetrics` at `METRICS_PATH`, for Prometheus or any compatible scraper.
+
+    The server runs on the event loop of the download while it is entered as an asynchronous context manager.
+
+    Attributes:
+        metrics : The metrics to serve.
+        port    : The port to listen on. If 0, a free port is picked, see `bound_port`.
+        host    : The address to listen on. Defaults to the loopback interface, so that the metrics are not exposed
+                  to the network.
+    """
+
+    metrics: DownloadMetrics
+    port: int = 0
+    host: str = "127.0.0.1"
+
+    _server: asyncio.Server | None = field(init=False, default=None)
+
+    @property
+    def bound_port(self) -> int:
+        """The port the server listens on."""
+        if self._server is None:
+            raise RuntimeError("Metrics server is not started")  # noqa: TRY003
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def __aenter__(self) -> MetricsServer:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        log.info("Serving metrics at http://%s:%d%s", self.host, self.bound_port, METRICS_PATH)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers a single HTTP/1.x request, then closes the connection."""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), _REQUEST_TIMEOUT)
+            while await asyncio.wait_for(reader.readline(), _REQUEST_TIMEOUT) not in (b"\r\n", b"\n", b""):
+                pass  # The request headers are not needed
+
+            method, target, *_ = request_line.decode("latin-1").split() or ["", ""]
+            if method not in ("GET", "HEAD"):
+                status, body = "405 Method Not Allowed", b""
+            elif target.split("?", 1)[0] != METRICS_PATH:
+                status, body = "404 Not Found", b""
+            else:
+                status, body = "200 OK", self.metrics.render().encode()
+
+            headers = (
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {METRICS_CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(headers.encode("latin-1") + (body if method == "GET" else b""))
+            await writer.drain()
+        except (ConnectionError, asyncio.TimeoutError, ValueError) as exc:
+            log.debug("Metrics request failed: %r", exc)
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal, TypeAlias
+
+log = logging.getLogger(__name__)
+
+RUN_REPORT_FILENAME = "webtoon-run-report.json"
+"""Name of the run report written next to the downloaded series."""
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Upper bounds in seconds of the latency histogram buckets. Longer durations fall in a last, unbounded bucket."""
+
+StageKind: TypeAlias = Literal["network", "cpu", "disk"]
+"""Resource a stage mostly waits on, telling whether a slow run was slowed down by the network, the CPU or the disk."""
+
+STAGE_KINDS: dict[str, StageKind] = {
+    "chapters.list": "network",
+    "viewer.fetch": "network",
+    "viewer.parse": "cpu",
+    "chapter.export": "disk",
+    "image.first_byte": "network",
+    "image.body": "network",
+    "image.transform": "cpu",
+    "image.write": "disk",
+    "storage.finalize": "disk",
+}
+"""
+Stages timed during a run, by the resource they mostly wait on.
+
+- `chapters.list`: listing the chapters of a series from the episode API.
+- `viewer.fetch`, `viewer.parse`: fetching and parsing the viewer page of a chapter.
+- `chapter.export`: exporting the title and notes of a chapter.
+- `image.first_byte`: from sending an image request to receiving its response headers.
+- `image.body`: receiving the body of an image.
+- `image.transform`: converting a whole image buffer. Streamed images are converted while they are written.
+- `image.write`: handing an image to the storage writer.
+- `storage.finalize`: completing a chapter or volume file once all its pages are written.
+"""
+
+
+@dataclass
+class StageStats:
+    """
+    Latency histogram and byte count of a stage.
+
+    Attributes:
+        count   : The number of times the stage ran.
+        seconds : The total time spent in the stage. Stages running concurrently add up to more than the run time.
+        max     : The longest time the stage took.
+        bytes   : The number of bytes the stage processed, if it processes bytes.
+        buckets : The number of times the stage took at most each of `LATENCY_BUCKETS`, and longer, not cumulative.
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+    max: float = 0.0
+    bytes: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def observe(self, seconds: float, size: int = 0) -> None:
+        """Records a run of the stage."""
+        self.count += 1
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+        self.bytes += size
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Returns an upper bound of the `q` quantile of the stage latency, read from the histogram."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets, strict=False):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+@dataclass
+class Measurement:
+    """
+    A run of a stage being timed. See `StageTimings.measure`.
+
+    Attributes:
+        bytes: The number of bytes the run processed, set by the code being timed.
+    """
+
+    bytes: int = 0
+
+
+@dataclass
+class StageTimings:
+    """
+    Collects the latency and the bytes of the stages of a run, and reports them.
+
+    A single instance is shared by the fetcher, the HTTP client, the chapter and image downloaders of a run. See
+    `STAGE_KINDS` for the stages they time.
+    """
+
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    _started: float = field(init=False, default_factory=time.perf_counter)
+    _stages: dict[str, StageStats] = field(init=False, default_factory=dict)
+
+    @property
+    def stages(self) -> dict[str, StageStats]:
+        """The statistics of every stage that ran, by stage name."""
+        return self._stages
+
+    def record(self, stage: str, seconds: float, size: int = 0) -> None:
+        """Records a run of a stage."""
+        if stage not in self._stages:
+            self._stages[stage] = StageStats()
+        self._stages[stage].observe(seconds, size)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[Measurement]:
+        """
+        Times the code run in the context as a run of a stage, whether it succeeds or not.
+
+        Yields:
+            The measurement, whose `bytes` can be set to the number of bytes processed.
+        """
+        measurement = Measurement()
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            self.record(stage, time.perf_counter() - start, measurement.bytes)
+
+    def report(self) -> dict[str, Any]:
+        """Returns the statistics of the run as JSON-serializable data."""
+        duration = time.perf_counter() - self._started
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(duration, 3),
+            "latency_buckets": [*LATENCY_BUCKETS, "+Inf"],
+            "stages": {
+                name: {
+                    "kind": STAGE_KINDS.get(name),
+                    "count": stats.count,
+                    "total_seconds": round(stats.seconds, 3),
+                    "mean_seconds": round(stats.seconds / stats.count, 4) if stats.count else 0.0,
+                    "p50_seconds": stats.quantile(0.5),
+                    "p90_seconds": stats.quantile(0.9),
+                    "p99_seconds": stats.quantile(0.99),
+                    "max_seconds": round(stats.max, 4),
+                    "bytes": stats.bytes,
+                    "bytes_per_second": round(stats.bytes / stats.seconds) if stats.seconds else 0,
+                    "histogram": stats.buckets,
+                }
+                for name, stats in sorted(self._stages.items())
+            },
+        }
+
+    def write_report(self, path: Path) -> None:
+        """Synchronously writes the report of the run as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        log.info('Run report written to "%s"', path)
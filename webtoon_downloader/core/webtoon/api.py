@@ -1,4 +1,5 @@
 import logging
+from collections.abc import AsyncGenerator
 from dataclasses import dataclass
 from typing import Literal
 
@@ -10,6 +11,12 @@ log = logging.getLogger(__name__)
 
 WebtoonType = Literal["WEBTOON", "CANVAS"]
 
+EPISODES_PAGE_SIZE = 100
+"""Number of episodes requested per page when paging through the episode list."""
+
+ALL_EPISODES_PAGE_SIZE = 99999
+"""Page size large enough for the whole episode list of a series to be returned by a single request."""
+
 
 @dataclass
 class EpisodeInfo:
@@ -50,3 +57,26 @@ class WebtoonAPI:
         data = resp.result.episodeList
         log.debug("Received %d episodes", len(data))
         return data
+
+    async def iter_episodes(
+        self, series_api_url: str, page_size: int = EPISODES_PAGE_SIZE, cursor: int = 0
+    ) -> AsyncGenerator[EpisodeInfo]:
+        """
+        Yields the episodes of a series in publication order, fetching the episode list a page at a time.
+
+        Each page starts after the last episode of the previous one. The next page is only fetched once the episodes
+        of the current one are consumed, so a consumer that stops early skips the rest of the list.
+
+        Args:
+            series_api_url  : The URL of the series in the episode API.
+            page_size       : The number of episodes requested per page.
+            cursor          : The episode number after which to start, or 0 to start from the first episode.
+        """
+        while True:
+            page = await self.get_episodes_data(series_api_url, page_size=page_size, cursor=cursor)
+            new_in_page = [episode for episode in page if episode.episodeNo > cursor]
+            for episode in new_in_page:
+                yield episode
+            if len(page) < page_size or not new_in_page:
+                return
+            cursor = new_in_page[-1].episodeNo
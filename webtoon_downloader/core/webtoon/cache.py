@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Literal
+
+import httpx
+from furl import furl
+
+log = logging.getLogger(__name__)
+
+ResourceClass = Literal["series", "episodes", "viewer"]
+"""Kind of Webtoon resource a cached response belongs to, which decides how long it stays fresh."""
+
+DEFAULT_CACHE_TTLS: dict[ResourceClass, float] = {
+    "series": 24 * 60 * 60,
+    "episodes": 0,
+    "viewer": 7 * 24 * 60 * 60,
+}
+"""
+Default number of seconds a cached response is used without asking the server whether it changed.
+
+Episode lists are always revalidated so that new episodes are never missed. The image URLs of a published
+episode rarely change, so its viewer page is kept the longest.
+"""
+
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024
+"""Default number of bytes of response bodies kept in the cache before the least recently used are evicted."""
+
+_CACHED_HEADERS = ("content-type", "etag", "last-modified")
+"""Headers kept along with a cached response. Bodies are stored decoded, so encoding headers do not apply."""
+
+
+def classify_url(url: str) -> ResourceClass:
+    """Returns the kind of Webtoon resource a URL points to."""
+    path = str(furl(url).path).rstrip("/")
+    if "/api/" in path and path.endswith("/episodes"):
+        return "episodes"
+    if path.endswith("/viewer"):
+        return "viewer"
+    return "series"
+
+
+@dataclass
+class CacheEntry:
+    """
+    Index record of a cached response.
+
+    Attributes:
+        url         : The requested URL.
+        status_code : The status code of the response.
+        headers     : The cached headers of the response.
+        body        : The SHA-256 hex digest of the body, naming the blob holding it.
+        size        : The number of bytes of the body.
+        stored_at   : When the response was stored or last revalidated, in seconds since the epoch.
+    """
+
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    body: str
+    size: int
+    stored_at: float
+
+    def validators(self) -> dict[str, str]:
+        """Returns the headers of a conditional request asking the server whether the response changed."""
+        validators = {}
+        if etag := self.headers.get("etag"):
+            validators["if-none-match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            validators["if-modified-since"] = last_modified
+        return validators
+
+
+@dataclass
+class CachedResponse:
+    """
+    A response read back from the cache.
+
+    Attributes:
+        entry   : The index record of the response.
+        content : The body of the response.
+    """
+
+    entry: CacheEntry
+    content: bytes
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """Rebuilds the response, as if it was just received for a request."""
+        return httpx.Response(self.entry.status_code, headers=self.entry.headers, content=self.content, request=request)
+
+
+@dataclass
+class HttpCache:
+    """
+    Persistent on-disk cache of Webtoon pages and API responses, keyed by URL.
+
+    Bodies are stored once per content in `blobs/`, named after their SHA-256 digest, and each URL has an index
+    record in `index/` pointing to its body. A response is used as is for the TTL of its resource class (see
+    `classify_url`), then revalidated with its `ETag` and `Last-Modified` validators. Once the bodies take more than
+    `max_size` bytes, the least recently used URLs are evicted. The modification time of an index record tells when
+    it was last used, so that recency survives across runs.
+
+    Args:
+        directory   : The directory holding the cache. It is created on first use.
+        max_size    : The number of bytes of bodies kept before the least recently used are evicted.
+        ttls        : The number of seconds responses of each resource class are used without revalidation.
+    """
+
+    directory: Path
+    max_size: int = DEFAULT_CACHE_MAX_SIZE
+    ttls: dict[ResourceClass, float] = field(default_factory=lambda: dict(DEFAULT_CACHE_TTLS))
+
+    _entries: dict[str, CacheEntry] = field(init=False, default_factory=dict)
+    _accessed: dict[str, float] = field(init=False, default_factory=dict)
+    _blob_sizes: dict[str, int] = field(init=False, default_factory=dict)
+    _blob_refs: dict[str, int] = field(init=False, default_factory=dict)
+    _size: int = field(init=False, default=0)
+    _loaded: bool = field(init=False, default=False)
+    _lock: asyncio.Lock = field(init=False, default_factory=asyncio.Lock)
+
+    @property
+    def size(self) -> int:
+        """The number of bytes of the bodies in the cache."""
+        return self._size
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Returns True if a response can be used without revalidating it."""
+        return time.time() - entry.stored_at < self.ttls[classify_url(entry.url)]
+
+    async def load(self, url: str) -> CachedResponse | None:
+        """
+        Reads the cached response of a URL.
+
+        Returns:
+            The cached response, or None if the URL is not cached or its body is missing.
+        """
+        async with self._lock:
+            await self._ensure_loaded()
+            key = _key(url)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            try:
+                content = await asyncio.to_thread(self._read_blob, entry.body)
+            except OSError:
+                log.debug("Cache: body of %s is missing", url)
+                await asyncio.to_thread(self._remove, [key])
+                return None
+            self._accessed[key] = time.time()
+            await asyncio.to_thread(self._touch, key)
+            return CachedResponse(entry, content)
+
+    async def store(self, response: httpx.Response, url: str | None = None) -> None:
+        """
+        Stores a response, evicting the least recently used ones if the cache is over its size.
+
+        Args:
+            response    : The response to store. Its body must be read.
+            url         : The URL the response is stored for. Defaults to the URL of its request.
+        """
+        url = url or str(response.request.url)
+        content = response.content
+        entry = CacheEntry(
+            url=url,
+            status_code=response.status_code,
+            headers={name: response.headers[name] for name in _CACHED_HEADERS if name in response.headers},
+            body=hashlib.sha256(content).hexdigest(),
+            size=len(content),
+            stored_at=time.time(),
+        )
+        async with self._lock:
+            await self._ensure_loaded()
+            await asyncio.to_thread(self._write, entry, content)
+            await asyncio.to_thread(self._evict)
+
+    async def revalidate(self, url: str) -> None:
+        """Marks the cached response of a URL as fresh, after the server told it did not change."""
+        async with self._lock:
+            await self._ensure_loaded()
+            key = _key(url)
+            if entry := self._entries.get(key):
+                entry.stored_at = time.time()
+                await asyncio.to_thread(self._write_entry, key, entry)
+
+    async def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            await asyncio.to_thread(self._load_index)
+            self._loaded = True
+
+    @property
+    def _index_directory(self) -> Path:
+        return self.directory / "index"
+
+    @property
+    def _blob_directory(self) -> Path:
+        return self.directory / "blobs"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._blob_directory / digest[:2] / digest
+
+    def _load_index(self) -> None:
+        """Synchronously reads the index records, dropping those that cannot be parsed."""
+        self._index_directory.mkdir(parents=True, exist_ok=True)
+        for path in self._index_directory.glob("*.json"):
+            try:
+                entry = CacheEntry(**json.loads(path.read_text()))
+                accessed = path.stat().st_mtime
+            except (OSError, ValueError, TypeError):
+                log.debug("Cache: dropping unreadable index record %s", path.name)
+                path.unlink(missing_ok=True)
+                continue
+            self._entries[path.stem] = entry
+            self._accessed[path.stem] = accessed
+            self._retain_blob(entry)
+        log.debug("Cache: loaded %d entries, %d bytes", len(self._entries), self.size)
+
+    def _read_blob(self, digest: str) -> bytes:
+        return self._blob_path(digest).read_bytes()
+
+    def _touch(self, key: str) -> None:
+        with contextlib.suppress(OSError):
+            os.utime(self._index_directory / f"{key}.json")
+
+    def _write(self, entry: CacheEntry, content: bytes) -> None:
+        """Synchronously writes the body of a response, unless the same content is already stored, and its record."""
+        blob = self._blob_path(entry.body)
+        if entry.body not in self._blob_sizes or not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(blob, content)
+        key = _key(entry.url)
+        previous = self._entries.get(key)
+        self._write_entry(key, entry)
+        self._entries[key] = entry
+        self._accessed[key] = time.time()
+        self._retain_blob(entry)
+        if previous:
+            self._release_blob(previous.body)
+
+    def _write_entry(self, key: str, entry: CacheEntry) -> None:
+        self._index_directory.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self._index_directory / f"{key}.json", json.dumps(asdict(entry)).encode())
+
+    def _evict(self) -> None:
+        """Synchronously removes the least recently used entries until the bodies fit in `max_size`."""
+        if self._size <= self.max_size:
+            return
+        evicted = 0
+        # Removing an entry only frees its body once no other entry points to it
+        for key in sorted(self._entries, key=self._accessed.__getitem__):
+            if self._size <= self.max_size:
+                break
+            self._remove([key])
+            evicted += 1
+        log.debug("Cache: evicted %d entries", evicted)
+
+    def _remove(self, keys: list[str]) -> None:
+        """Synchronously removes entries, and the bodies no other entry points to."""
+        for key in keys:
+            entry = self._entries.pop(key)
+            del self._accessed[key]
+            (self._index_directory / f"{key}.json").unlink(missing_ok=True)
+            self._release_blob(entry.body)
+
+    def _retain_blob(self, entry: CacheEntry) -> None:
+        """Counts one more entry pointing to the body of an entry."""
+        refs = self._blob_refs.get(entry.body, 0)
+        if not refs:
+            self._blob_sizes[entry.body] = entry.size
+            self._size += entry.size
+        self._blob_refs[entry.body] = refs + 1
+
+    def _release_blob(self, digest: str) -> None:
+        """Counts one less entry pointing to a body, and removes the body once no entry points to it."""
+        refs = self._blob_refs.pop(digest, 0) - 1
+        if refs > 0:
+            self._blob_refs[digest] = refs
+            return
+        self._size -= self._blob_sizes.pop(digest, 0)
+        self._blob_path(digest).unlink(missing_ok=True)
+
+
+def _key(url: str) -> str:
+    """Returns the name of the index record of a URL."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Writes a file through a temporary file, so that readers never see it partially written."""
+    partial = path.with_name(f"{path.name}.{os.getpid()}.part")
+    partial.write_bytes(data)
+    partial.replace(path)
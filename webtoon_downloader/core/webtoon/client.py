@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import random
 import re
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from types import TracebackType
 from typing import Literal
 
@@ -13,6 +16,9 @@ from furl import furl
 from httpx_retries import Retry, RetryTransport
 
 from webtoon_downloader.core.exceptions import DownloadError, ImageDownloadError, RateLimitedError
+from webtoon_downloader.core.timing import StageTimings
+from webtoon_downloader.core.webtoon.cache import HttpCache
+from webtoon_downloader.core.webtoon.ratelimit import HostRateLimiter, RateLimitedTransport
 
 log = logging.getLogger(__name__)
 
@@ -46,12 +52,20 @@ WebtoonMobileURL = "https://m.webtoons.com"
 
 RetryStrategy = Literal["exponential", "linear", "fixed"]
 
+_UNCOPIED_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding"))
+"""Headers describing the encoding of a body on the wire, which do not apply to copies of its decoded content."""
+
 DEFAULT_REQUEST_TIMEOUT = httpx.Timeout(connect=15.0, read=30.0, write=30.0, pool=30.0)
 """Default timeout used for regular Webtoon page and API requests."""
 
 IMAGE_STREAM_TIMEOUT = httpx.Timeout(connect=15.0, read=90.0, write=30.0, pool=30.0)
 """Longer read timeout for image streams because the CDN may pause before sending body bytes."""
 
+IMAGE_RESUME_ATTEMPTS = 3
+"""Number of times an image whose body was cut off is requested again, from where it stopped when possible."""
+
+_CONTENT_RANGE = re.compile(r"bytes (?P<start>\d+)-\d+/(?P<total>\d+|\*)")
+
 
 class WebtoonHttpClient:
     """
@@ -59,11 +73,38 @@ class WebtoonHttpClient:
 
     The client uses HTTP/2, custom headers with a randomly selected user agent,
     and is configured with high limits for maximum connections and keep-alive connections.
+
+    Concurrent `get` and `stream_image` requests for the same URL share a single fetch: the first one reaches the
+    server, and the others wait for its response and get a copy of it.
+
+    Args:
+        proxy           : Optional proxy address to send the requests through.
+        retry_strategy  : Optional strategy for retrying failed requests.
+        transport       : Optional transport sending the requests instead of the default HTTP/2 connection pool,
+                          e.g. to route them to a local server. Retries are still applied on top of it.
+        cache           : Optional on-disk cache of the pages and API responses fetched with `get`. Images are
+                          never cached.
+        rate_limiter    : Optional limiter of the request and byte rates of each host. By default, requests are not
+                          rate limited but the traffic to a host is still paused when it answers with Retry-After.
+        timings         : Optional collector of the time images take to start and finish arriving.
     """
 
-    def __init__(self, proxy: str | None = None, retry_strategy: RetryStrategy | None = None):
+    def __init__(
+        self,
+        proxy: str | None = None,
+        retry_strategy: RetryStrategy | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: HttpCache | None = None,
+        rate_limiter: HostRateLimiter | None = None,
+        timings: StageTimings | None = None,
+    ):
         self.proxy = proxy
         self.retry_strategy = retry_strategy
+        self.transport = transport
+        self.cache = cache
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.timings = timings or StageTimings()
+        self._in_flight: dict[str, asyncio.Task[httpx.Response]] = {}
         self._client = httpx.AsyncClient(
             limits=httpx.Limits(max_connections=200, max_keepalive_connections=200),
             http2=True,
@@ -75,7 +116,7 @@ class WebtoonHttpClient:
         )
 
     def _build_transport(self) -> httpx.AsyncBaseTransport:
-        base_transport = httpx.AsyncHTTPTransport(http2=True)
+        base_transport = RateLimitedTransport(self.transport or httpx.AsyncHTTPTransport(http2=True), self.rate_limiter)
         if self.retry_strategy is None:
             log.warning("No retry strategy provided; using default transport without retry")
             return base_transport
@@ -100,12 +141,77 @@ class WebtoonHttpClient:
         exc: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
+        for task in self._in_flight.values():
+            task.cancel()
+        await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
         await self._client.__aexit__(exc_type, exc, traceback)
 
+    @property
+    def in_flight(self) -> int:
+        """The number of page, API and image fetches in flight, concurrent requests for the same URL counting once."""
+        return len(self._in_flight)
+
+    async def _single_flight(self, key: str, fetch: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Runs a fetch unless the same one is already in flight, in which case its response is shared.
+
+        The fetch runs in a task of its own, so that a caller being cancelled does not fail the others waiting for it.
+
+        Args:
+            key     : Identifies the fetch, such as the URL it requests.
+            fetch   : Function starting the fetch. The response it returns must be read.
+
+        Returns:
+            The response of the fetch, or a copy of it if the fetch was started by another caller.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            log.debug("Coalescing in-flight request: %s", key)
+            return _copy_response(await asyncio.shield(task))
+
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task[httpx.Response]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Retrieved so that a failure nobody waits for anymore is not reported as unhandled
+            task.exception()
+
     async def get(self, url: str) -> httpx.Response:
+        return await self._single_flight(f"GET {url}", lambda: self._get(url))
+
+    async def _get(self, url: str) -> httpx.Response:
+        headers = dict(self._client.headers)
         if WebtoonMobileURL in url.lower():
-            return await self._client.get(url, headers={**self._client.headers, "user-agent": self._get_mobile_ua()})
-        return await self._client.get(url)
+            headers["user-agent"] = self._get_mobile_ua()
+        if self.cache is None:
+            return await self._client.get(url, headers=headers)
+        return await self._get_cached(url, headers, self.cache)
+
+    async def _get_cached(self, url: str, headers: dict[str, str], cache: HttpCache) -> httpx.Response:
+        """
+        Fetches a URL through the cache, only reaching the server once the cached response is stale.
+
+        Stale responses are revalidated with a conditional request, and reused if the server answers that they did
+        not change. Successful responses are stored in the cache.
+        """
+        cached = await cache.load(url)
+        if cached and cache.is_fresh(cached.entry):
+            log.debug("Cache hit: %s", url)
+            return cached.to_response(self._client.build_request("GET", url))
+
+        response = await self._client.get(url, headers={**headers, **(cached.entry.validators() if cached else {})})
+        if cached and response.status_code == 304:
+            log.debug("Cache revalidated: %s", url)
+            await cache.revalidate(url)
+            return cached.to_response(response.request)
+        if response.status_code == 200:
+            await cache.store(response, url)
+        return response
 
     @asynccontextmanager
     async def stream(self, method: str, url: str) -> AsyncGenerator[httpx.Response]:
@@ -139,24 +245,63 @@ class WebtoonHttpClient:
             f_url.set(args={"type": f"q{quality}"})
 
         url = f_url.url
-        async with self._client.stream(
-            "GET",
-            url,
-            timeout=IMAGE_STREAM_TIMEOUT,
-            headers={
-                "referer": WebtoonURL,
-                **self._generate_headers(),
-            },
-        ) as response:
-            try:
-                response.raise_for_status()
-            except httpx.HTTPError as exc:
-                if response.status_code == 429:
-                    raise ImageDownloadError(
-                        url=url, cause=RateLimitedError(f"Rate limited while downloading image from {url}")
-                    ) from exc
+        response = await self._single_flight(f"IMAGE {url}", lambda: self._fetch_image(url))
+        try:
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            if response.status_code == 429:
+                raise ImageDownloadError(
+                    url=url, cause=RateLimitedError(f"Rate limited while downloading image from {url}")
+                ) from exc
 
-            yield response
+        yield response
+
+    async def _fetch_image(self, url: str) -> httpx.Response:
+        """
+        Downloads an image, reading its whole body so that it can be shared with concurrent requests.
+
+        The bytes received are kept in an `_ImageSpool`. If the body is cut off, or ends short of its announced
+        length, the image is requested again up to `IMAGE_RESUME_ATTEMPTS` times: with a `Range` request for the
+        missing bytes when the CDN supports it, from the start otherwise.
+
+        Every attempt is timed as `image.first_byte` until its headers arrive, then as `image.body` while its body
+        is read.
+        """
+        headers = {"referer": WebtoonURL, **self._generate_headers()}
+        spool = _ImageSpool()
+        for attempt in range(IMAGE_RESUME_ATTEMPTS + 1):
+            resuming = attempt < IMAGE_RESUME_ATTEMPTS
+            requested = time.perf_counter()
+            async with self._client.stream(
+                "GET", url, timeout=IMAGE_STREAM_TIMEOUT, headers={**headers, **spool.resume_headers()}
+            ) as response:
+                self.timings.record("image.first_byte", time.perf_counter() - requested)
+                if response.status_code not in (200, 206):
+                    await response.aread()
+                    return response
+                if not spool.begin(response):
+                    log.debug("Image %s: range not honored, downloading it again from the start", url)
+                    continue
+                try:
+                    with self.timings.measure("image.body") as body:
+                        async for chunk in response.aiter_bytes():
+                            spool.body += chunk
+                            body.bytes += len(chunk)
+                except httpx.TransportError as exc:
+                    if not resuming:
+                        raise
+                    log.debug("Image %s cut off after %d bytes (%r), resuming", url, len(spool.body), exc)
+                    continue
+
+            if spool.is_complete():
+                return spool.to_response()
+            log.debug("Image %s ended after %d of %s bytes", url, len(spool.body), spool.total)
+
+        raise ImageDownloadError(
+            url=url,
+            message=f'Image "{url}" is incomplete after {IMAGE_RESUME_ATTEMPTS} attempts to resume it: '
+            f"{len(spool.body)} of {spool.total} bytes",
+        )
 
     def _get_mobile_ua(self) -> str:
         """Returns a randomly chosen user agent for mobile devices"""
@@ -171,3 +316,87 @@ class WebtoonHttpClient:
             "dnt": "1",
             "user-agent": random.choice(USER_AGENTS),
         }
+
+
+def _copy_response(response: httpx.Response) -> httpx.Response:
+    """Returns a response with the same status, headers and decoded body, sharing the body bytes."""
+    headers = [(name, value) for name, value in response.headers.multi_items() if name not in _UNCOPIED_HEADERS]
+    return httpx.Response(response.status_code, headers=headers, content=response.content, request=response.request)
+
+
+@dataclass
+class _ImageSpool:
+    """
+    Bytes of an image body received so far, across the requests downloading it.
+
+    An image is resumable when its first response advertises byte ranges, has no content encoding, and has a
+    validator, so that the resumed bytes are known to belong to the same image: the `Range` request carries it in
+    an `If-Range` header, and the server answers with the whole image if it changed.
+    """
+
+    body: bytearray = field(default_factory=bytearray)
+    total: int | None = None
+    validator: str | None = None
+    headers: list[tuple[str, str]] = field(default_factory=list)
+    request: httpx.Request | None = None
+
+    def resume_headers(self) -> dict[str, str]:
+        """Returns the headers requesting the missing bytes, or none to request the whole image."""
+        if not self.body or self.validator is None:
+            return {}
+        return {"range": f"bytes={len(self.body)}-", "if-range": self.validator}
+
+    def begin(self, response: httpx.Response) -> bool:
+        """
+        Prepares to receive the body of a response.
+
+        Returns:
+            False if the response is a range the spool cannot continue with. The spool is then reset, so that the
+            next request asks for the whole image.
+        """
+        if response.status_code == 206:
+            match = _CONTENT_RANGE.fullmatch(response.headers.get("content-range", ""))
+            if match is None or int(match["start"]) != len(self.body) or self.request is None:
+                self._reset()
+                return False
+            if match["total"] != "*":
+                self.total = int(match["total"])
+            return True
+
+        self._reset()
+        self.headers = [
+            (name, value) for name, value in response.headers.multi_items() if name not in _UNCOPIED_HEADERS
+        ]
+        self.request = response.request
+        if "content-encoding" not in response.headers:
+            # Lengths and ranges count the bytes on the wire, which are only the image bytes without an encoding
+            self.total = int(response.headers["content-length"]) if "content-length" in response.headers else None
+            if "bytes" in response.headers.get("accept-ranges", ""):
+                self.validator = _strong_validator(response.headers)
+        return True
+
+    def is_complete(self) -> bool:
+        """Returns True if the body has the announced length. A body longer than announced is reset."""
+        if self.total is None or len(self.body) == self.total:
+            return True
+        if len(self.body) > self.total:
+            self._reset()
+        return False
+
+    def to_response(self) -> httpx.Response:
+        """Returns the image as the response of its first request, with the whole body."""
+        return httpx.Response(200, headers=self.headers, content=bytes(self.body), request=self.request)
+
+    def _reset(self) -> None:
+        self.body.clear()
+        self.total = self.validator = self.request = None
+        self.headers = []
+
+
+def _strong_validator(headers: httpx.Headers) -> str | None:
+    """Returns the value identifying the version of a resource in an `If-Range` header, if it has one."""
+    etag: str | None = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    last_modified: str | None = headers.get("last-modified")
+    return last_modified
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 from typing import cast
 
@@ -43,6 +42,9 @@ def _has_value(value: object) -> bool:
 
 
 def build_comicinfo_xml(metadata: ComicInfoMetadata) -> bytes:
+    # Only archives carry ComicInfo.xml, so the XML library is imported once one is written
+    import xml.etree.ElementTree as ET
+
     root = ET.Element("ComicInfo")
 
     fields: list[tuple[str, object]] = [
@@ -3,8 +3,8 @@ from __future__ import annotations
 from collections.abc import Awaitable, Callable, Sequence
 from typing import Literal, TypeAlias
 
-from webtoon_downloader.core.webtoon.extractor import WebtoonViewerPageExtractor
-from webtoon_downloader.core.webtoon.models import ChapterInfo, PageInfo
+from webtoon_downloader.core.downloaders.image import ImageDownloadResult
+from webtoon_downloader.core.webtoon.models import ChapterInfo, PageInfo, ViewerPageData
 
 OnWebtoonFetchCallback: TypeAlias = Callable[[Sequence[ChapterInfo]], Awaitable[None]]
 """
@@ -17,13 +17,19 @@ Type of progress being reported.
 """
 
 ChapterProgressCallback: TypeAlias = Callable[
-    [ChapterInfo, ChapterProgressType, WebtoonViewerPageExtractor | None], Awaitable[None]
+    [ChapterInfo, ChapterProgressType, ViewerPageData | None], Awaitable[None]
 ]
 """
-Progress callback called for each chapter download. Takes the chapter info and progress type
+Progress callback called for each chapter download. Takes the chapter info, the progress type and, once fetched,
+the data of the chapter viewer page.
 """
 
 PageProgressCallback: TypeAlias = Callable[[PageInfo], Awaitable[None]]
 """
 Progress callback called for each page download. Takes the page info.
 """
+
+PageDownloadedCallback: TypeAlias = Callable[[PageInfo, ImageDownloadResult], Awaitable[None]]
+"""
+Callback called once a page image is written to the storage. Takes the page info and the download result.
+"""
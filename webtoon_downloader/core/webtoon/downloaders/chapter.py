@@ -2,29 +2,56 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass, field
 from os import PathLike
 from pathlib import Path
+from typing import Any
 
 import httpx
 
 from webtoon_downloader.core.downloaders.image import ImageDownloader, ImageDownloadResult
 from webtoon_downloader.core.exceptions import ChapterDownloadError, RateLimitedError
+from webtoon_downloader.core.timing import StageTimings
 from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
 from webtoon_downloader.core.webtoon.comicinfo import ComicInfoMetadata, SeriesMetadata, build_comicinfo_xml
-from webtoon_downloader.core.webtoon.downloaders.callbacks import ChapterProgressCallback, ChapterProgressType
+from webtoon_downloader.core.webtoon.downloaders.callbacks import (
+    ChapterProgressCallback,
+    ChapterProgressType,
+    PageDownloadedCallback,
+)
 from webtoon_downloader.core.webtoon.downloaders.result import DownloadResult
 from webtoon_downloader.core.webtoon.exporter import DataExporter
-from webtoon_downloader.core.webtoon.extractor import WebtoonViewerPageExtractor
-from webtoon_downloader.core.webtoon.models import ChapterInfo, PageInfo
+from webtoon_downloader.core.webtoon.extractor import parse_viewer_page
+from webtoon_downloader.core.webtoon.models import ChapterInfo, PageInfo, ViewerPageData
 from webtoon_downloader.core.webtoon.namer import FileNameGenerator
+from webtoon_downloader.core.webtoon.parsing import HtmlParser
 from webtoon_downloader.storage import AioWriter
 from webtoon_downloader.storage.exceptions import StreamWriteError
 
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class PreparedChapter:
+    """
+    A chapter whose viewer page has been fetched and parsed, and whose images are ready to be downloaded.
+
+    Attributes:
+        chapter_info    : Information about the chapter.
+        viewer_page     : The data read from the chapter viewer page.
+    """
+
+    chapter_info: ChapterInfo
+    viewer_page: ViewerPageData
+
+    @property
+    def img_urls(self) -> list[str]:
+        """The URLs of the chapter images, in page order."""
+        return self.viewer_page.img_urls
+
+
 @dataclass
 class ChapterDownloader:
     """
@@ -37,6 +64,8 @@ class ChapterDownloader:
         concurrent_downloads_limit  : The number of chapters to download concurrently.
         exporter                    : Optional data exporter for exporting chapter details.
         progress_callback           : Optional callback for reporting chapter download progress.
+        parser                      : Parser of the viewer pages, running off the event loop.
+        timings                     : Collector of the time the viewer pages, exports and storages take.
     """
 
     client: WebtoonHttpClient
@@ -46,6 +75,8 @@ class ChapterDownloader:
 
     exporter: DataExporter | None = None
     progress_callback: ChapterProgressCallback | None = None
+    parser: HtmlParser = field(default_factory=HtmlParser)
+    timings: StageTimings = field(default_factory=StageTimings)
 
     _semaphore: asyncio.Semaphore = field(init=False)
 
@@ -75,27 +106,83 @@ class ChapterDownloader:
         Raises:
             ChapterDownloadError in case of error downloading the chapter.
         """
+        async with self._semaphore:
+            prepared = await self.prepare(chapter_info)
+            return await self.download(prepared, directory, storage, quality, series_metadata=series_metadata)
+
+    async def prepare(self, chapter_info: ChapterInfo) -> PreparedChapter:
+        """
+        Fetches and parses the viewer page of a chapter, without downloading any of its images.
+
+        This is the first stage of a chapter download, and can run ahead of the image downloads of other chapters.
+
+        Args:
+            chapter_info    : Information about the chapter to prepare.
+
+        Returns:
+            The prepared chapter, holding the image URLs to download.
+
+        Raises:
+            ChapterDownloadError in case of error fetching or parsing the viewer page.
+        """
         try:
-            async with self._semaphore:
-                return await self._run(chapter_info, directory, storage, quality, series_metadata=series_metadata)
+            return await self._prepare(chapter_info)
         except ChapterDownloadError:
             raise
         except Exception as exc:
             raise ChapterDownloadError(chapter_info.viewer_url, exc, chapter_info=chapter_info) from exc
 
-    async def _run(
+    async def download(
         self,
-        chapter_info: ChapterInfo,
+        prepared: PreparedChapter,
         directory: str | PathLike[str],
         storage: AioWriter,
         quality: int = 100,
         series_metadata: SeriesMetadata | None = None,
+        completed_pages: Mapping[int, ImageDownloadResult] | None = None,
+        on_page_downloaded: PageDownloadedCallback | None = None,
     ) -> list[DownloadResult]:
-        """Internal method to handle the download logic for a Webtoon chapter."""
-        tasks: list[asyncio.Task] = []
+        """
+        Downloads all the pages of a prepared chapter.
+
+        Args:
+            prepared            : The chapter returned by `prepare`.
+            directory           : The directory to save downloaded images and texts.
+            storage             : The storage writer to use for saving images.
+            quality             : The quality of the image to download.
+            series_metadata     : Optional series metadata used to write `ComicInfo.xml`.
+            completed_pages     : Results of the pages already in the storage, by page number. These are not downloaded again.
+            on_page_downloaded  : Optional callback invoked after each page is written to the storage.
+
+        Returns:
+            A list of download results.
+
+        Raises:
+            ChapterDownloadError in case of error downloading the chapter.
+        """
+        chapter_info = prepared.chapter_info
+        try:
+            return await self._download(
+                prepared,
+                directory,
+                storage,
+                quality,
+                series_metadata=series_metadata,
+                completed_pages=completed_pages or {},
+                on_page_downloaded=on_page_downloaded,
+            )
+        except ChapterDownloadError:
+            raise
+        except Exception as exc:
+            raise ChapterDownloadError(chapter_info.viewer_url, exc, chapter_info=chapter_info) from exc
+
+    async def _prepare(self, chapter_info: ChapterInfo) -> PreparedChapter:
+        """Internal method to fetch and parse the viewer page of a Webtoon chapter."""
         await self._report_progress(chapter_info, "Start")
 
-        resp = await self.client.get(chapter_info.viewer_url)
+        with self.timings.measure("viewer.fetch") as fetch:
+            resp = await self.client.get(chapter_info.viewer_url)
+            fetch.bytes = len(resp.content)
         try:
             resp.raise_for_status()
         except httpx.HTTPError as exc:
@@ -112,9 +199,9 @@ class ChapterDownloader:
         log.debug(
             'Fetched: "%s" from chapter "%s" => %s', chapter_info.viewer_url, chapter_info.title, resp.status_code
         )
-        extractor = WebtoonViewerPageExtractor(resp.text)
-        img_urls = extractor.img_urls
-        if not img_urls:
+        with self.timings.measure("viewer.parse"):
+            viewer_page = await self.parser.parse(parse_viewer_page, resp.text)
+        if not viewer_page.img_urls:
             raise ChapterDownloadError(
                 chapter_info.viewer_url,
                 None,
@@ -122,40 +209,81 @@ class ChapterDownloader:
                 chapter_info=chapter_info,
             )
 
-        await self._report_progress(chapter_info, "ChapterInfoFetched", extractor)
+        await self._report_progress(chapter_info, "ChapterInfoFetched", viewer_page)
+        return PreparedChapter(chapter_info, viewer_page)
+
+    async def _download(
+        self,
+        prepared: PreparedChapter,
+        directory: str | PathLike[str],
+        storage: AioWriter,
+        quality: int = 100,
+        series_metadata: SeriesMetadata | None = None,
+        completed_pages: Mapping[int, ImageDownloadResult] | None = None,
+        on_page_downloaded: PageDownloadedCallback | None = None,
+    ) -> list[DownloadResult]:
+        """Internal method to handle the image download logic for a prepared Webtoon chapter."""
+        completed_pages = completed_pages or {}
+        tasks: dict[int, asyncio.Task] = {}
+        chapter_info, viewer_page, img_urls = prepared.chapter_info, prepared.viewer_page, prepared.img_urls
 
         chapter_directory = self.file_name_generator.get_chapter_directory(chapter_info)  # pylint: disable=assignment-from-no-return
         export_dir = directory / chapter_directory
-        await self._export_data(extractor, chapter_info, export_dir)
+        with self.timings.measure("chapter.export"):
+            await self._export_data(viewer_page, chapter_info, export_dir)
 
         async with storage:
             for n, url in enumerate(img_urls, start=1):
+                if n in completed_pages:
+                    continue
                 page = PageInfo(n, url, len(img_urls), chapter_info)
                 name = str(chapter_directory / self.file_name_generator.get_page_filename(page))
-                tasks.append(self._create_task(chapter_info, url, name, storage, quality))
-            res = await asyncio.gather(*tasks, return_exceptions=False)
+                tasks[n] = self._create_task(page, name, storage, quality, on_page_downloaded)
+            for n in completed_pages:
+                log.debug('Page %d of chapter "%s" is already downloaded', n, chapter_info.title)
+                await self._report_progress(chapter_info, "PageCompleted")
+            try:
+                downloaded = dict(
+                    zip(tasks, await asyncio.gather(*tasks.values(), return_exceptions=False), strict=True)
+                )
+            finally:
+                # Pages still running must not outlive the storage they write to
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+            res: list[Any] = [
+                completed_pages[n] if n in completed_pages else downloaded[n] for n in range(1, len(img_urls) + 1)
+            ]
             if series_metadata:
-                await self._write_comicinfo(storage, chapter_info, series_metadata, extractor, len(img_urls))
+                await self._write_comicinfo(storage, chapter_info, series_metadata, viewer_page, len(img_urls))
+            finalizing = time.perf_counter()
+        self.timings.record("storage.finalize", time.perf_counter() - finalizing)
 
         await self._report_progress(chapter_info, "Completed")
         return res
 
     def _create_task(
-        self, chapter_info: ChapterInfo, url: str, name: str, storage: AioWriter, quality: int = 100
+        self,
+        page: PageInfo,
+        name: str,
+        storage: AioWriter,
+        quality: int = 100,
+        on_page_downloaded: PageDownloadedCallback | None = None,
     ) -> asyncio.Task:
         """
         Creates an asynchronous task for downloading a single page of a Webtoon chapter.
 
         Args:
-            chapter_info    : Information about the chapter.
-            url             : URL of the image to download.
-            name            : The name to save the image as.
-            storage         : The storage writer for saving the image.
-            quality         : The quality of the image to download.
+            page                : Information about the page to download.
+            name                : The name to save the image as.
+            storage             : The storage writer for saving the image.
+            quality             : The quality of the image to download.
+            on_page_downloaded  : Optional callback invoked once the image is written.
 
         Returns:
             An asyncio Task for downloading the image.
         """
+        chapter_info, url = page.chapter_info, page.url
 
         async def _task() -> ImageDownloadResult:
             log.debug(
@@ -173,6 +301,8 @@ class ChapterDownloader:
                 quality,
                 chapter_info.viewer_url,
             )
+            if on_page_downloaded:
+                await on_page_downloaded(page, res)
             await self._report_progress(chapter_info, "PageCompleted")
             return res
 
@@ -182,7 +312,7 @@ class ChapterDownloader:
         self,
         chapter_info: ChapterInfo,
         progress_type: ChapterProgressType,
-        extractor: WebtoonViewerPageExtractor | None = None,
+        viewer_page: ViewerPageData | None = None,
     ) -> None:
         """
         Reports the progress of the chapter download if a progress callback is provided.
@@ -190,15 +320,15 @@ class ChapterDownloader:
         Args:
             chapter_info    : Information about the chapter.
             progress_type   : The type of progress being reported.
-            extractor       : The extractor used for the current progress step, if applicable.
+            viewer_page     : The data of the viewer page, once fetched.
         """
         if not self.progress_callback:
             return
-        await self.progress_callback(chapter_info, progress_type, extractor)
+        await self.progress_callback(chapter_info, progress_type, viewer_page)
 
     async def _export_data(
         self,
-        extractor: WebtoonViewerPageExtractor,
+        viewer_page: ViewerPageData,
         chapter_info: ChapterInfo,
         directory: Path,
     ) -> None:
@@ -206,7 +336,7 @@ class ChapterDownloader:
         Exports the chapter details if an exporter is provided.
 
         Args:
-            extractor       : The extractor used for obtaining chapter details.
+            viewer_page     : The data of the chapter viewer page.
             chapter_info    : Information about the chapter.
             directory       : Directory to save the exported data.
         """
@@ -217,7 +347,7 @@ class ChapterDownloader:
             chapter=chapter_info,
             title_path=directory / self.file_name_generator.get_title_filename(chapter_info),
             notes_path=directory / self.file_name_generator.get_notes_filename(chapter_info),
-            notes=extractor.chapter_notes,
+            notes=viewer_page.chapter_notes,
         )
 
     async def _write_comicinfo(
@@ -225,7 +355,7 @@ class ChapterDownloader:
         storage: AioWriter,
         chapter_info: ChapterInfo,
         series_metadata: SeriesMetadata,
-        extractor: WebtoonViewerPageExtractor,
+        viewer_page: ViewerPageData,
         page_count: int,
     ) -> None:
         try:
@@ -235,7 +365,7 @@ class ChapterDownloader:
                 number=str(chapter_info.number),
                 count=chapter_info.total_chapters,
                 summary=series_metadata.summary,
-                notes=extractor.chapter_notes,
+                notes=viewer_page.chapter_notes,
                 writer=series_metadata.author,
                 genre=series_metadata.genre,
                 language_iso=series_metadata.language,
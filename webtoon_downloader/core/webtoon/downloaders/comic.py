@@ -1,34 +1,236 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import itertools
 import logging
 import re
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from os import PathLike
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal, ParamSpec, TypeVar, cast
 
 from furl import furl
 
 from webtoon_downloader.core import file as fileutil
-from webtoon_downloader.core.downloaders.image import HttpImageDownloader
-from webtoon_downloader.core.exceptions import NoChaptersFoundError, WebtoonDownloadError
+from webtoon_downloader.core.downloaders.image import (
+    DeduplicatingImageDownloader,
+    HttpImageDownloader,
+    ImageDownloader,
+    ImageDownloadResult,
+)
+from webtoon_downloader.core.downloaders.limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimiter
+from webtoon_downloader.core.exceptions import BatchDownloadError, NoChaptersFoundError, WebtoonDownloadError
+from webtoon_downloader.core.executors import WorkerPools
+from webtoon_downloader.core.timing import RUN_REPORT_FILENAME, StageTimings
+from webtoon_downloader.core.webtoon.cache import HttpCache
 from webtoon_downloader.core.webtoon.client import WebtoonHttpClient
-from webtoon_downloader.core.webtoon.comicinfo import SeriesMetadata
+from webtoon_downloader.core.webtoon.comicinfo import ComicInfoMetadata, SeriesMetadata, build_comicinfo_xml
 from webtoon_downloader.core.webtoon.downloaders.callbacks import OnWebtoonFetchCallback
-from webtoon_downloader.core.webtoon.downloaders.chapter import ChapterDownloader
-from webtoon_downloader.core.webtoon.downloaders.options import StorageType, WebtoonDownloadOptions
-from webtoon_downloader.core.webtoon.downloaders.result import DownloadResult
+from webtoon_downloader.core.webtoon.downloaders.chapter import ChapterDownloader, PreparedChapter
+from webtoon_downloader.core.webtoon.downloaders.options import (
+    DEFAULT_CONCURRENT_CHAPTER_DOWNLOADS,
+    DEFAULT_PREFETCH_CHAPTERS,
+    StorageType,
+    WebtoonDownloadOptions,
+)
+from webtoon_downloader.core.webtoon.downloaders.result import ChapterDownloadResult, DownloadResult
 from webtoon_downloader.core.webtoon.exporter import DataExporter
-from webtoon_downloader.core.webtoon.extractor import ElementNotFoundError, WebtoonMainPageExtractor
+from webtoon_downloader.core.webtoon.extractor import ElementNotFoundError, parse_series_page
 from webtoon_downloader.core.webtoon.fetchers import WebtoonFetcher
-from webtoon_downloader.core.webtoon.models import ChapterInfo
+from webtoon_downloader.core.webtoon.manifest import SeriesManifest
+from webtoon_downloader.core.webtoon.models import ChapterInfo, PageInfo, SeriesPageData
 from webtoon_downloader.core.webtoon.namer import NonSeparateFileNameGenerator, SeparateFileNameGenerator
-from webtoon_downloader.storage import AioFolderWriter, AioPdfWriter, AioWriter, AioZipWriter
-from webtoon_downloader.transformers.image import AioImageFormatTransformer
+from webtoon_downloader.core.webtoon.parsing import HtmlParser
+from webtoon_downloader.core.webtoon.ratelimit import HostRateLimiter
+from webtoon_downloader.storage import (
+    AioFolderWriter,
+    AioStreamingZipWriter,
+    AioVolumeWriter,
+    AioWriter,
+    BlobStore,
+    StreamWriteError,
+)
+from webtoon_downloader.transformers.image import AioImageFormatTransformer, ImageFormat
+from webtoon_downloader.transformers.pool import ProcessPoolTranscoder
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+P = ParamSpec("P")
+
+
+async def _iter_queue_until_done(queue: asyncio.Queue[T], producers: asyncio.Future[Any]) -> AsyncIterator[T]:
+    """
+    Yields the items put in the queue until the producers are done.
+
+    Args:
+        queue       : The queue the producers put their items in.
+        producers   : Future completing once all the producers are done.
+
+    Raises:
+        The first exception raised by the producers, once all the items put before it are yielded.
+    """
+    while True:
+        getter: asyncio.Future[Any] = asyncio.ensure_future(queue.get())
+        await asyncio.wait([getter, producers], return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            yield getter.result()
+            continue
+
+        getter.cancel()
+        producers.result()
+        return
+
+
+@dataclass
+class Volume:
+    """
+    Consecutive chapters of a series stored together in one file.
+
+    Attributes:
+        output      : The file of the volume, relative to the series directory.
+        chapters    : The chapters of the volume, in chapter order.
+        writer      : The writer shared by the chapters of the volume, created when its first chapter is downloaded.
+        page_counts : The number of pages of each chapter downloaded so far.
+        finalizer   : The task completing the volume file and recording its chapters, once they are all downloaded.
+    """
+
+    output: Path
+    chapters: list[ChapterInfo]
+    writer: AioVolumeWriter | None = None
+    page_counts: dict[ChapterInfo, int] = field(default_factory=dict)
+    finalizer: asyncio.Task[None] | None = None
+
+
+@dataclass
+class SeriesPlan:
+    """
+    The chapters of a series left to download, and what is needed to store and record them.
+
+    Attributes:
+        chapters        : The chapters to download, in chapter order.
+        series_metadata : Optional series metadata used to write `ComicInfo.xml`.
+        manifest        : Optional manifest recording the downloaded pages and chapters.
+        last_listed     : The last chapter listed by the series, recorded once a sync completes.
+        volumes         : The volumes the chapters are grouped in, if chapters are stored in volumes.
+    """
+
+    chapters: list[ChapterInfo]
+    series_metadata: SeriesMetadata | None = None
+    manifest: SeriesManifest | None = None
+    last_listed: ChapterInfo | None = None
+    volumes: list[Volume] = field(default_factory=list)
+
+    async def close(self) -> None:
+        """Releases the resources held by the plan, discarding the volumes whose chapters were not all downloaded."""
+        for volume in self.volumes:
+            if volume.writer:
+                await volume.writer.abort()
+            if volume.finalizer:
+                await asyncio.gather(volume.finalizer, return_exceptions=True)
+        if self.manifest:
+            await self.manifest.close()
+
+
+@dataclass
+class ChapterJob:
+    """
+    A chapter to download, along with the downloader and the plan of its series.
+
+    Attributes:
+        downloader      : The downloader of the series.
+        plan            : The plan of the series.
+        chapter_info    : The chapter to download.
+    """
+
+    downloader: WebtoonDownloader
+    plan: SeriesPlan
+    chapter_info: ChapterInfo
+
+
+async def download_chapter_jobs(
+    jobs: Iterable[ChapterJob],
+    workers_count: int,
+    prefetch_chapters: int = DEFAULT_PREFETCH_CHAPTERS,
+    return_exceptions: bool = False,
+) -> AsyncIterator[tuple[ChapterJob, ChapterDownloadResult | Exception]]:
+    """
+    Downloads chapters through a two-stage pipeline backed by a fixed pool of workers.
+
+    The first stage fetches and parses the viewer pages of up to `prefetch_chapters` chapters ahead, and hands
+    them over through a bounded queue to the chapter workers, which only download images. This keeps the image
+    downloads busy at chapter boundaries instead of waiting for each viewer page round trip.
+
+    Jobs are started in the order they are given, and only the chapters sitting in the queues are in memory at any
+    time, regardless of the number of jobs.
+
+    Args:
+        jobs                : The chapters to download.
+        workers_count       : The number of chapters downloaded concurrently.
+        prefetch_chapters   : The number of chapters prepared ahead of the workers.
+        return_exceptions   : If True, the error of a failed job is yielded in place of its result and the other
+                              jobs carry on. Otherwise, the first error stops the pipeline and is raised.
+
+    Yields:
+        Each job with its download result, in completion order.
+    """
+    prepared: asyncio.Queue[tuple[ChapterJob, asyncio.Task[PreparedChapter]] | None] = asyncio.Queue(
+        maxsize=max(1, prefetch_chapters)
+    )
+    completed: asyncio.Queue[tuple[ChapterJob, ChapterDownloadResult | Exception]] = asyncio.Queue(
+        maxsize=workers_count
+    )
+
+    orphans: list[asyncio.Task[PreparedChapter]] = []
+
+    async def _prefetch() -> None:
+        for job in jobs:
+            task = asyncio.create_task(job.downloader.chapter_downloader.prepare(job.chapter_info))
+            try:
+                await prepared.put((job, task))
+            except asyncio.CancelledError:
+                orphans.append(task)
+                raise
+        for _ in range(workers_count):
+            await prepared.put(None)
+
+    async def _worker() -> None:
+        while (item := await prepared.get()) is not None:
+            job, task = item
+            outcome: ChapterDownloadResult | Exception
+            try:
+                outcome = await job.downloader.download_chapter(await task, job.plan)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                outcome = exc
+            await completed.put((job, outcome))
+
+    stages = [asyncio.create_task(_prefetch()), *(asyncio.create_task(_worker()) for _ in range(workers_count))]
+    try:
+        async for result in _iter_queue_until_done(completed, asyncio.gather(*stages)):
+            yield result
+    finally:
+        # The stages are stopped first: the prefetcher only records the chapter it could not queue once cancelled
+        await _cancel_all(stages)
+        leftovers = [item[1] for item in (prepared.get_nowait() for _ in range(prepared.qsize())) if item is not None]
+        await _cancel_all([*leftovers, *orphans])
+
+
+async def _cancel_all(tasks: list[asyncio.Task[Any]]) -> None:
+    """
+    Cancels the given tasks and waits for them, retrieving their errors.
+
+    Used to tear down the pipeline stages, along with the prefetched chapters that no worker got to.
+    """
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 
 @dataclass
 class WebtoonDownloader:
@@ -42,12 +244,28 @@ class WebtoonDownloader:
         chapter_downloader      : The downloader responsible for individual chapters.
         storage_type            : The type of storage to use for the downloaded chapters.
         quality                 : The quality of the image to download.
+        image_format            : The format the images are written in, recorded in the manifest so that a run
+                                  with another format does not resume from images in the old one.
         start_chapter           : The first chapter to download.
         end_chapter             : The last chapter to download.
         directory               : The directory where the downloaded chapters will be stored.
         exporter                : Optional data exporter for exporting series details.
         on_webtoon_fetched      : Optional callback executed after fetching Webtoon information.
         proxy                   : Optional proxy address for making requests.
+        prefetch_chapters       : Number of chapters whose viewer pages are fetched and parsed ahead of the image downloads.
+        resume                  : Whether to skip the chapters and pages recorded as downloaded in the series manifest.
+        sync                    : Whether to only download the chapters published since the last synchronization.
+                                  Ignores `start_chapter`, `end_chapter` and `resume`.
+        parent_directory        : Optional directory to create the series directory in, when `directory` is not set.
+        chapters_per_volume     : Optional number of consecutive chapters stored together in one file. Only applies
+                                  to archive and PDF storage.
+        parser                  : Parser of the series page, running off the event loop.
+        timings                 : Collector of the time the stages of the download take, shared with the
+                                  components of the download.
+        run_report              : Whether to write the report of `timings` in the series directory, as
+                                  `RUN_REPORT_FILENAME`, once the download ends.
+        io_executor             : Optional thread pool the storage writers run their blocking writes in. Defaults to
+                                  the pool of each writer.
     """
 
     url: str
@@ -62,8 +280,19 @@ class WebtoonDownloader:
     exporter: DataExporter | None = None
     on_webtoon_fetched: OnWebtoonFetchCallback | None = None
     proxy: str | None = None
+    prefetch_chapters: int = DEFAULT_PREFETCH_CHAPTERS
+    resume: bool = True
+    sync: bool = False
+    parent_directory: str | PathLike[str] | None = None
+    chapters_per_volume: int | None = None
+    image_format: ImageFormat = "JPG"
+    parser: HtmlParser = field(default_factory=HtmlParser)
+    timings: StageTimings = field(default_factory=StageTimings)
+    run_report: bool = False
+    io_executor: Executor | None = None
 
     _directory: Path = field(init=False)
+    _volumes: dict[ChapterInfo, Volume] = field(init=False, default_factory=dict)
 
     def __post_init__(self) -> None:
         # sanitize and check the url is valid
@@ -78,7 +307,7 @@ class WebtoonDownloader:
         if not url.scheme or not url.host:
             raise WebtoonDownloadError(self.url, cause=ValueError("Invalid URL"))
 
-    async def run(self) -> list[DownloadResult]:
+    async def run(self) -> list[list[DownloadResult]]:
         """
         Asynchronously downloads chapters from a Webtoon series.
 
@@ -87,86 +316,310 @@ class WebtoonDownloader:
         Returns:
             A list containing download results for each chapter.
         """
-        chapter_list = await self._get_chapters()
+        results = [result async for result in self.stream()]
+        results.sort(key=lambda result: result.chapter_info.number)
+        return [result.pages for result in results]
+
+    async def stream(self) -> AsyncIterator[ChapterDownloadResult]:
+        """
+        Asynchronously downloads chapters from a Webtoon series, yielding each chapter result as soon as it completes.
+
+        Unlike `run`, results are not accumulated, so memory usage does not grow with the length of the series.
+        Chapters are yielded in completion order, which may differ from the chapter order.
+
+        Yields:
+            The download result of each chapter.
+        """
+        plan = await self.plan()
+        jobs = [ChapterJob(self, plan, chapter_info) for chapter_info in plan.chapters]
+        workers_count = max(1, min(self.chapter_downloader.concurrent_downloads_limit, len(jobs)))
+        try:
+            async for _, outcome in download_chapter_jobs(jobs, workers_count, self.prefetch_chapters):
+                # Without `return_exceptions`, the first error is raised rather than yielded
+                yield cast(ChapterDownloadResult, outcome)
+            await self.finish(plan)
+        finally:
+            await plan.close()
+            if self.run_report:
+                await asyncio.to_thread(self.timings.write_report, self._directory / RUN_REPORT_FILENAME)
+
+    async def plan(self) -> SeriesPlan:
+        """
+        Resolves the chapters of the series left to download, its output directory and its metadata.
+
+        This is the first stage of `stream`. It is exposed, along with `download_chapter` and `finish`, so that the
+        chapters of several series can be scheduled together.
+
+        Returns:
+            The plan of the series. It must be closed once its chapters are downloaded.
+        """
         resp = await self.client.get(self.url)
-        extractor = WebtoonMainPageExtractor(resp.text)
-        series_title = self._resolve_series_title(extractor, chapter_list)
+        series_page = await self.parser.parse(parse_series_page, resp.text)
 
-        if self.directory:
-            self._directory = Path(self.directory)
+        manifest: SeriesManifest | None = None
+        if self.sync:
+            # The manifest tells which episodes are new, so the directory must be known before listing them
+            self._directory = self._resolve_directory(series_page, [])
+            manifest = await SeriesManifest.load(self._directory)
+            chapter_list = await self._get_new_chapters(manifest)
         else:
-            self._directory = Path(fileutil.slugify_name(series_title))
+            if self.resume and (self.directory or (series_page.title and series_page.title.strip())):
+                # The last listing recorded in the manifest spares fetching the whole episode list for a range
+                self._directory = self._resolve_directory(series_page, [])
+                manifest = await SeriesManifest.load(self._directory)
+            chapter_list = await self._get_chapters(manifest)
+            if manifest is None:
+                self._directory = self._resolve_directory(series_page, chapter_list)
+                if self.resume:
+                    manifest = await SeriesManifest.load(self._directory)
 
-        await self._export_data(extractor)
+        last_listed = chapter_list[-1] if chapter_list else None
+        if manifest and last_listed and last_listed.number == last_listed.total_chapters:
+            await manifest.record_listing(last_listed)
+        self._volumes = self._group_volumes(chapter_list)
+        if manifest:
+            chapter_list = await self._skip_completed_chapters(manifest, chapter_list)
+
+        if self.on_webtoon_fetched:
+            await self.on_webtoon_fetched(chapter_list)
+
+        await self._export_data(series_page)
         series_metadata: SeriesMetadata | None = None
         if self.storage_type == "cbz":
-            series_metadata = self._build_series_metadata(extractor, chapter_list)
+            series_metadata = self._build_series_metadata(series_page, chapter_list)
+
+        volumes = [self._volumes[chapter] for chapter in chapter_list if chapter in self._volumes]
+        volumes = list({id(volume): volume for volume in volumes}.values())
+        return SeriesPlan(chapter_list, series_metadata, manifest, last_listed, volumes)
 
-        tasks = []
-        for chapter_info in chapter_list:
-            task = self._create_task(chapter_info, self.quality, series_metadata=series_metadata)
-            tasks.append(task)
+    async def finish(self, plan: SeriesPlan) -> None:
+        """
+        Completes the download of the series once all the chapters of its plan are downloaded.
+
+        Args:
+            plan: The plan returned by `plan`.
+        """
+        for volume in plan.volumes:
+            if volume.finalizer:
+                await volume.finalizer
 
-        results = await asyncio.gather(*tasks, return_exceptions=False)
+        if self.sync and plan.manifest and plan.last_listed:
+            await plan.manifest.record_sync(plan.last_listed)
 
         if self.exporter:
             await self.exporter.write_data(self._directory)
 
-        return results
-
-    async def _get_chapters(self) -> list[ChapterInfo]:
+    async def _get_chapters(self, manifest: SeriesManifest | None = None) -> list[ChapterInfo]:
         """
         Fetches chapter information for the specified Webtoon series.
 
+        Args:
+            manifest: The manifest of the series directory, if already loaded. Its last listing of the series lets
+                      `--latest` and `--end` fetch only part of the episode list.
+
         Returns:
             A list of `ChapterInfo` objects containing information about each chapter.
         """
-        fetcher = WebtoonFetcher(self.client, self.url)
-        chapters = await fetcher.get_chapters_details(self.url, self.start_chapter, self.end_chapter)
+        fetcher = WebtoonFetcher(self.client, self.url, self.parser, self.timings)
+        listing = manifest.last_listing if manifest else None
+        chapters = await fetcher.get_chapters_details(
+            self.url,
+            self.start_chapter,
+            self.end_chapter,
+            last_episode_no=listing.episode_no if listing else None,
+            last_chapter_number=listing.number if listing else None,
+        )
         if not chapters:
             raise NoChaptersFoundError
 
-        if self.on_webtoon_fetched:
-            await self.on_webtoon_fetched(chapters)
+        return chapters
+
+    async def _get_new_chapters(self, manifest: SeriesManifest) -> list[ChapterInfo]:
+        """
+        Fetches the chapters published since the last synchronization recorded in the manifest.
+
+        The whole episode list is only fetched when the series was never synchronized before.
+
+        Args:
+            manifest: The manifest of the series directory.
+
+        Returns:
+            The chapters published since the last synchronization.
+        """
+        fetcher = WebtoonFetcher(self.client, self.url, self.parser, self.timings)
+        last_sync = manifest.last_sync
+        if last_sync is None:
+            return await fetcher.get_chapters_details(self.url)
 
+        chapters = await fetcher.get_chapters_details_after(self.url, last_sync.episode_no, last_sync.number)
+        log.info("Found %d chapters published since the last synchronization", len(chapters))
         return chapters
 
-    def _create_task(
-        self,
-        chapter_info: ChapterInfo,
-        quality: int = 100,
-        series_metadata: SeriesMetadata | None = None,
-    ) -> asyncio.Task:
+    async def _skip_completed_chapters(
+        self, manifest: SeriesManifest, chapter_list: list[ChapterInfo]
+    ) -> list[ChapterInfo]:
+        """
+        Filters out the chapters recorded as downloaded in the manifest, with the same image quality and format, whose
+        files still have their recorded size.
+
+        Chapters stored in volumes are only skipped along with their whole volume, since a volume file is written
+        at once.
+
+        Args:
+            manifest        : The manifest of the series directory.
+            chapter_list    : The chapters in the requested range.
+
+        Returns:
+            The chapters that still need to be downloaded.
+        """
+        complete = {
+            chapter
+            for chapter in chapter_list
+            if await manifest.is_chapter_complete(
+                chapter, self.quality, self.image_format, self._chapter_output(chapter)
+            )
+        }
+        remaining = [
+            chapter
+            for chapter in chapter_list
+            if chapter not in complete
+            or (chapter in self._volumes and not complete.issuperset(self._volumes[chapter].chapters))
+        ]
+        skipped = len(chapter_list) - len(remaining)
+        if skipped:
+            log.info('Skipping %d chapters already downloaded in "%s"', skipped, self._directory)
+        return remaining
+
+    async def download_chapter(self, chapter: PreparedChapter, plan: SeriesPlan) -> ChapterDownloadResult:
         """
-        Creates an asynchronous task for downloading a Webtoon chapter.
+        Downloads the images of a prepared chapter to its storage, and records it in the manifest.
 
         Args:
-            chapter_info    : Information about the specific chapter to download.
-            quality         : The quality of the image to download.
+            chapter : The chapter returned by `ChapterDownloader.prepare`.
+            plan    : The plan of the series the chapter belongs to.
 
         Returns:
-            An asyncio Task object for downloading the chapter.
+            The download result of the chapter.
         """
+        manifest = plan.manifest
+
+        async def _record_page(page: PageInfo, result: ImageDownloadResult) -> None:
+            # Pages are only recorded for image output, where they are files of the series directory. The member
+            # names of archives and PDFs can match the files of an earlier image download, which must not be replaced.
+            if manifest and self._chapter_output(page.chapter_info) is None:
+                await manifest.record_page(page, self.quality, self.image_format, result)
 
-        async def task() -> list[DownloadResult]:
-            storage = await self._get_storage(chapter_info)
-            return await self.chapter_downloader.run(
-                chapter_info,
-                self._directory,
-                storage,
-                quality,
-                series_metadata=series_metadata,
+        volume = self._volumes.get(chapter.chapter_info)
+        storage: AioWriter
+        if volume:
+            storage = self._get_volume_storage(volume, plan).chapter()
+        else:
+            storage = await self._get_storage(chapter.chapter_info)
+        pages = await self.chapter_downloader.download(
+            chapter,
+            self._directory,
+            storage,
+            self.quality,
+            # Volumes hold a single ComicInfo.xml, written along with their first chapter
+            series_metadata=None if volume else plan.series_metadata,
+            completed_pages=await self._completed_pages(manifest, chapter),
+            on_page_downloaded=_record_page,
+        )
+        if volume:
+            self._complete_volume_chapter(volume, chapter.chapter_info, len(pages), manifest)
+        elif manifest:
+            await manifest.record_chapter(
+                chapter.chapter_info,
+                len(pages),
+                self.quality,
+                self.image_format,
+                self._chapter_output(chapter.chapter_info),
             )
+        return ChapterDownloadResult(chapter.chapter_info, pages)
 
-        return asyncio.create_task(task())
+    def _get_volume_storage(self, volume: Volume, plan: SeriesPlan) -> AioVolumeWriter:
+        """Returns the writer shared by the chapters of a volume, creating it for the first chapter."""
+        if volume.writer is None:
+            series_metadata = plan.series_metadata
 
-    def _resolve_series_title(self, extractor: WebtoonMainPageExtractor, chapter_list: list[ChapterInfo]) -> str:
-        try:
-            title = extractor.series_title.strip()
-            if title:
-                return title
-        except ElementNotFoundError:
-            log.debug("Series title not found in main page extractor")
+            async def _write_comicinfo(writer: AioWriter) -> None:
+                if series_metadata:
+                    await _write_volume_comicinfo(writer, volume, series_metadata)
+
+            volume.writer = AioVolumeWriter(
+                self._create_writer(self._directory / volume.output), len(volume.chapters), _write_comicinfo
+            )
+        return volume.writer
+
+    def _complete_volume_chapter(
+        self, volume: Volume, chapter_info: ChapterInfo, page_count: int, manifest: SeriesManifest | None
+    ) -> None:
+        """Notes a downloaded chapter of a volume, and finalizes the volume in the background once it is complete."""
+        volume.page_counts[chapter_info] = page_count
+        if len(volume.page_counts) == len(volume.chapters) and volume.finalizer is None:
+            volume.finalizer = asyncio.create_task(self._finalize_volume(volume, manifest))
+
+    async def _finalize_volume(self, volume: Volume, manifest: SeriesManifest | None) -> None:
+        """Waits for the volume file to be complete, then records its chapters in the manifest."""
+        if volume.writer:
+            with self.timings.measure("storage.finalize"):
+                await volume.writer.wait_closed()
+        log.info('Volume "%s" is complete', self._directory / volume.output)
+        if manifest:
+            for chapter_info in volume.chapters:
+                await manifest.record_chapter(
+                    chapter_info, volume.page_counts[chapter_info], self.quality, self.image_format, volume.output
+                )
+
+    def _group_volumes(self, chapter_list: list[ChapterInfo]) -> dict[ChapterInfo, Volume]:
+        """
+        Groups the chapters in volumes of `chapters_per_volume` consecutive chapter numbers.
+
+        Volumes are named after the first and last chapter they hold, so that volumes holding a partial range of
+        chapters, such as the chapters published since the last sync, do not overwrite complete ones.
+
+        Returns:
+            The volume of each chapter, or an empty mapping if chapters are not stored in volumes.
+        """
+        if not self.chapters_per_volume or self.storage_type == "images":
+            return {}
+
+        groups: dict[int, list[ChapterInfo]] = {}
+        for chapter in chapter_list:
+            groups.setdefault((chapter.number - 1) // self.chapters_per_volume, []).append(chapter)
+
+        volumes: dict[ChapterInfo, Volume] = {}
+        for chapters in groups.values():
+            width = len(str(chapters[0].total_chapters))
+            first, last = chapters[0].number, chapters[-1].number
+            volume = Volume(Path(f"{first:0{width}d}-{last:0{width}d}.{self.storage_type}"), chapters)
+            volumes.update(dict.fromkeys(chapters, volume))
+        return volumes
+
+    async def _completed_pages(
+        self, manifest: SeriesManifest | None, chapter: PreparedChapter
+    ) -> dict[int, ImageDownloadResult]:
+        """
+        Returns the pages of a chapter that do not need to be downloaded again.
+
+        Pages can only be resumed individually with image output. Archives and PDFs are rewritten as a whole.
+        """
+        if manifest is None or self._chapter_output(chapter.chapter_info) is not None:
+            return {}
+        return await manifest.completed_pages(chapter.chapter_info, chapter.img_urls, self.quality, self.image_format)
+
+    def _resolve_directory(self, series_page: SeriesPageData, chapter_list: list[ChapterInfo]) -> Path:
+        """Returns the directory given to the downloader, or one named after the series title in the parent directory."""
+        if self.directory:
+            return Path(self.directory)
+        series_directory = Path(fileutil.slugify_name(self._resolve_series_title(series_page, chapter_list)))
+        if self.parent_directory:
+            return Path(self.parent_directory) / series_directory
+        return series_directory
+
+    def _resolve_series_title(self, series_page: SeriesPageData, chapter_list: list[ChapterInfo]) -> str:
+        if series_page.title and series_page.title.strip():
+            return series_page.title.strip()
 
         if chapter_list and chapter_list[0].series_title.strip():
             return chapter_list[0].series_title.strip()
@@ -183,22 +636,16 @@ class WebtoonDownloader:
             return first_segment.lower()
         return None
 
-    def _build_series_metadata(
-        self, extractor: WebtoonMainPageExtractor, chapter_list: list[ChapterInfo]
-    ) -> SeriesMetadata:
-        title = self._resolve_series_title(extractor, chapter_list)
-
-        try:
-            summary = extractor.series_summary
-        except ElementNotFoundError:
-            summary = None
+    def _build_series_metadata(self, series_page: SeriesPageData, chapter_list: list[ChapterInfo]) -> SeriesMetadata:
+        title = self._resolve_series_title(series_page, chapter_list)
+        if series_page.summary is None:
             log.debug("ComicInfo: summary not found")
 
         return SeriesMetadata(
             title=title,
-            summary=summary,
-            author=extractor.author,
-            genre=extractor.genre,
+            summary=series_page.summary,
+            author=series_page.author,
+            genre=series_page.genre,
             language=self._extract_language_from_url(),
             url=self.url,
         )
@@ -213,56 +660,369 @@ class WebtoonDownloader:
         Returns:
             An instance of a storage writer (`AioWriter` subclass) appropriate for the storage type.
         """
+        output = self._chapter_output(chapter_info)
+        if output is None:
+            return AioFolderWriter(self._directory, executor=self.io_executor)
+        return self._create_writer(self._directory / output)
+
+    def _create_writer(self, path: Path) -> AioWriter:
+        """Returns the writer of an archive or PDF file, depending on the storage type."""
+        if self.storage_type == "pdf":
+            from webtoon_downloader.storage.pdf import AioPdfWriter
+
+            return AioPdfWriter(path, executor=self.io_executor)
+        return AioStreamingZipWriter(path, executor=self.io_executor)
+
+    def _chapter_output(self, chapter_info: ChapterInfo) -> Path | None:
+        """
+        Returns the file a chapter is written to, relative to the series directory.
+
+        Args:
+            chapter_info: Information about the chapter.
+
+        Returns:
+            The archive or PDF file of the chapter, or of its volume if chapters are stored in volumes.
+            None for image output where each page is a file of its own.
+        """
+        if self.storage_type == "images":
+            return None
+        if chapter_info in self._volumes:
+            return self._volumes[chapter_info].output
         dest = f"{chapter_info.number:0{len(str(chapter_info.total_chapters))}d}"
-        if self.storage_type in ["zip", "cbz"]:
-            return AioZipWriter(self._directory / f"{dest}.{self.storage_type}")
-        elif self.storage_type == "pdf":
-            return AioPdfWriter(self._directory / f"{dest}.pdf")
-        else:
-            return AioFolderWriter(self._directory)
+        return Path(f"{dest}.{self.storage_type}")
 
-    async def _export_data(self, extractor: WebtoonMainPageExtractor) -> None:
+    async def _export_data(self, series_page: SeriesPageData) -> None:
         """
         Exports series summary data if an exporter is set.
 
         Args:
-            extractor: The extractor used to obtain the series summary.
+            series_page: The data of the series main page.
+
+        Raises:
+            ElementNotFoundError: If the series page has no summary.
         """
         if not self.exporter:
             return
-        await self.exporter.add_series_summary(extractor.series_summary, self._directory / "summary.txt")
+        if series_page.summary is None:
+            raise ElementNotFoundError("summary")
+        await self.exporter.add_series_summary(series_page.summary, self._directory / "summary.txt")
 
 
-async def download_webtoon(opts: WebtoonDownloadOptions) -> list[DownloadResult]:
+@dataclass
+class BatchDownloader:
     """
-    Asynchronously downloads chapters of a given Webtoon based on the provided options.
+    Downloads several Webtoon series through a single chapter scheduler.
+
+    The series downloaders are expected to share one HTTP client and one image downloader, so that all the series use
+    a single connection pool and a single image concurrency budget. Chapters are scheduled round-robin between the
+    series, so that a long series does not hold back the others.
+
+    A series that fails does not stop the others. Its error is kept in `errors` once the batch completes.
+
+    Attributes:
+        downloaders         : The downloaders of the series.
+        concurrent_chapters : The number of chapters downloaded concurrently, across all the series.
+        prefetch_chapters   : The number of chapters whose viewer pages are fetched ahead of the image downloads.
+        concurrent_plans    : The number of series whose chapter list is fetched concurrently.
+        errors              : The errors of the failed series, by series URL.
+    """
+
+    downloaders: list[WebtoonDownloader]
+    concurrent_chapters: int = DEFAULT_CONCURRENT_CHAPTER_DOWNLOADS
+    prefetch_chapters: int = DEFAULT_PREFETCH_CHAPTERS
+    concurrent_plans: int = DEFAULT_CONCURRENT_CHAPTER_DOWNLOADS
+
+    errors: dict[str, Exception] = field(init=False, default_factory=dict)
+
+    async def stream(self) -> AsyncIterator[ChapterDownloadResult]:
+        """
+        Downloads the chapters of every series, yielding each chapter result as soon as it completes.
+
+        Yields:
+            The download result of each chapter, in completion order.
+        """
+        plans = await self._plan_all()
+        remaining = {id(plan): len(plan.chapters) for _, plan in plans}
+        # Plans are closed by `_finish` as their series complete, and the others once the batch stops
+        unfinished = {id(plan): plan for _, plan in plans}
+        try:
+            for downloader, plan in plans:
+                if not plan.chapters:
+                    await self._finish(downloader, unfinished.pop(id(plan)))
+
+            jobs = _round_robin(plans)
+            workers_count = max(1, self.concurrent_chapters)
+            async for job, outcome in download_chapter_jobs(
+                jobs, workers_count, self.prefetch_chapters, return_exceptions=True
+            ):
+                if isinstance(outcome, Exception):
+                    self._fail(job.downloader, outcome)
+                else:
+                    yield outcome
+
+                remaining[id(job.plan)] -= 1
+                if not remaining[id(job.plan)]:
+                    await self._finish(job.downloader, unfinished.pop(id(job.plan)))
+        finally:
+            await asyncio.gather(*(plan.close() for plan in unfinished.values()))
+
+    async def _plan_all(self) -> list[tuple[WebtoonDownloader, SeriesPlan]]:
+        """Plans the series concurrently. Series that cannot be planned are left out."""
+        semaphore = asyncio.Semaphore(max(1, self.concurrent_plans))
+
+        async def _plan(downloader: WebtoonDownloader) -> SeriesPlan | None:
+            async with semaphore:
+                try:
+                    return await downloader.plan()
+                except Exception as exc:
+                    self._fail(downloader, exc)
+                    return None
+
+        plans = await asyncio.gather(*(_plan(downloader) for downloader in self.downloaders))
+        return [(downloader, plan) for downloader, plan in zip(self.downloaders, plans, strict=True) if plan]
+
+    async def _finish(self, downloader: WebtoonDownloader, plan: SeriesPlan) -> None:
+        """Completes a series once all its chapters are processed, unless one of them failed."""
+        try:
+            if downloader.url not in self.errors:
+                await downloader.finish(plan)
+        except Exception as exc:
+            self._fail(downloader, exc)
+        finally:
+            await plan.close()
+
+    def _fail(self, downloader: WebtoonDownloader, exc: Exception) -> None:
+        """Records the first error of a series."""
+        log.error('Failed to download "%s": %s', downloader.url, exc, exc_info=exc)
+        self.errors.setdefault(downloader.url, exc)
+
+
+async def _write_volume_comicinfo(writer: AioWriter, volume: Volume, series_metadata: SeriesMetadata) -> None:
+    """Writes the `ComicInfo.xml` of a volume, numbered after the chapters it holds."""
+    first, last = volume.chapters[0], volume.chapters[-1]
+    payload = ComicInfoMetadata(
+        series=series_metadata.title,
+        title=first.title if first is last else f"{first.title} - {last.title}",
+        number=str(first.number) if first is last else f"{first.number}-{last.number}",
+        count=first.total_chapters,
+        summary=series_metadata.summary,
+        writer=series_metadata.author,
+        genre=series_metadata.genre,
+        language_iso=series_metadata.language,
+        manga="No",
+        web=series_metadata.url,
+    )
+    xml_bytes = build_comicinfo_xml(payload)
+
+    async def _stream() -> AsyncIterator[bytes]:
+        yield xml_bytes
+
+    try:
+        await writer.write(_stream(), "ComicInfo.xml")
+    except StreamWriteError:
+        log.warning("ComicInfo: failed to write ComicInfo.xml to volume archive", exc_info=True)
+
+
+def _round_robin(plans: list[tuple[WebtoonDownloader, SeriesPlan]]) -> Iterator[ChapterJob]:
+    """Yields the chapters of the series in turns: the first chapter of every series, then the second, and so on."""
+    series_jobs = [[ChapterJob(downloader, plan, chapter) for chapter in plan.chapters] for downloader, plan in plans]
+    for jobs in itertools.zip_longest(*series_jobs):
+        yield from (job for job in jobs if job is not None)
+
+
+def _notify_all(*callbacks: Callable[P, Awaitable[None]] | None) -> Callable[P, Awaitable[None]] | None:
+    """Returns a callback invoking each of the given callbacks in turn, or None if none of them is set."""
+    active = [callback for callback in callbacks if callback is not None]
+    if len(active) <= 1:
+        return active[0] if active else None
+
+    async def _callback(*args: P.args, **kwargs: P.kwargs) -> None:
+        for callback in active:
+            await callback(*args, **kwargs)
+
+    return _callback
+
+
+@asynccontextmanager
+async def _worker_pools(opts: WebtoonDownloadOptions) -> AsyncIterator[WorkerPools]:
+    """
+    Provides the thread pools of the CPU-bound work and of the blocking storage writes, and stops them on exit.
+
+    The pools are stopped in a thread, so that the event loop keeps running while the tasks in flight drain.
+
+    Args:
+        opts: Options for downloading the Webtoon.
+
+    Yields:
+        The thread pools.
+    """
+    pools = WorkerPools.create(cpu_workers=opts.cpu_workers, io_workers=opts.io_workers)
+    try:
+        yield pools
+    finally:
+        await asyncio.to_thread(pools.shutdown)
+
+
+@asynccontextmanager
+async def _transcoding_pool(opts: WebtoonDownloadOptions) -> AsyncIterator[ProcessPoolTranscoder | None]:
+    """
+    Provides the process pool used for image conversion, if enabled by the options, and stops it on exit, in a
+    thread so that the event loop is not blocked while the conversions in flight drain.
 
     Args:
         opts: Options for downloading the Webtoon.
 
+    Yields:
+        The process pool transcoder, or None when images are converted in a thread pool.
+    """
+    if not opts.transcode_workers:
+        yield None
+        return
+
+    transcoder = ProcessPoolTranscoder(workers=opts.transcode_workers)
+    try:
+        yield transcoder
+    finally:
+        await asyncio.to_thread(transcoder.shutdown)
+
+
+@asynccontextmanager
+async def _parsing_pool(opts: WebtoonDownloadOptions, executor: Executor | None = None) -> AsyncIterator[HtmlParser]:
+    """
+    Provides the pool the HTML pages are parsed in, as described by the options, and stops it on exit, in a thread
+    so that the event loop is not blocked while the pages in flight drain.
+
+    Args:
+        opts    : Options for downloading the Webtoon.
+        executor: Optional thread pool of the CPU-bound work, to parse in when `opts.parser_workers` is not set.
+
+    Yields:
+        The HTML parser.
+    """
+    parser = HtmlParser(executor_type=opts.parser_executor, workers=opts.parser_workers, executor=executor)
+    try:
+        yield parser
+    finally:
+        await asyncio.to_thread(parser.shutdown)
+
+
+def _create_client(opts: WebtoonDownloadOptions, timings: StageTimings | None = None) -> WebtoonHttpClient:
+    """Creates the HTTP client of a download, with its rate limits and its on-disk cache if one is configured."""
+    cache = HttpCache(Path(opts.cache_dir), max_size=opts.cache_size) if opts.cache_dir else None
+    rate_limiter = HostRateLimiter(
+        requests_per_second=opts.requests_per_second,
+        bytes_per_second=opts.bytes_per_second,
+        on_state_change=opts.on_rate_limit_changed,
+    )
+    return WebtoonHttpClient(
+        proxy=opts.proxy,
+        retry_strategy=opts.retry_strategy,
+        transport=opts.transport,
+        cache=cache,
+        rate_limiter=rate_limiter,
+        timings=timings,
+    )
+
+
+def _create_image_downloader(
+    opts: WebtoonDownloadOptions,
+    client: WebtoonHttpClient,
+    transcoder: ProcessPoolTranscoder | None = None,
+    timings: StageTimings | None = None,
+    pools: WorkerPools | None = None,
+) -> ImageDownloader:
+    """
+    Creates the image downloader described by the given options. Its concurrency budget covers every chapter it downloads.
+
+    With `opts.blob_store_dir` set, images go through a `BlobStore` in that directory.
+
+    Args:
+        opts        : Options for downloading the Webtoon.
+        client      : The HTTP client to download the images with.
+        transcoder  : Optional process pool used to convert images.
+        timings     : Optional collector of the time images take to be transformed and written.
+        pools       : Optional thread pools to convert images in when `transcoder` is not set.
+
     Returns:
-        A list of download results for each chapter.
+        The image downloader.
+    """
+    limiter: ConcurrencyLimiter | None = None
+    if opts.adaptive_concurrency:
+        limiter = AdaptiveConcurrencyLimiter(
+            max_limit=opts.concurrent_pages,
+            initial_limit=max(1, opts.concurrent_pages // 2),
+            on_limit_change=opts.on_concurrency_changed,
+        )
+
+    downloader = HttpImageDownloader(
+        client=client,
+        transformers=[
+            AioImageFormatTransformer(
+                opts.image_format, transcoder=transcoder, executor=pools.cpu if pools is not None else None
+            )
+        ],
+        concurrent_downloads_limit=opts.concurrent_pages,
+        limiter=limiter,
+        timings=timings,
+    )
+    if opts.metrics:
+        opts.metrics.watch(limiter=downloader.limiter, transformers=downloader.transformers)
+    if opts.blob_store_dir is None:
+        return downloader
+    return DeduplicatingImageDownloader(downloader, BlobStore(Path(opts.blob_store_dir)), variant=opts.image_format)
+
+
+def _create_downloader(
+    opts: WebtoonDownloadOptions,
+    transcoder: ProcessPoolTranscoder | None = None,
+    parser: HtmlParser | None = None,
+    client: WebtoonHttpClient | None = None,
+    image_downloader: ImageDownloader | None = None,
+    parent_directory: str | PathLike[str] | None = None,
+    timings: StageTimings | None = None,
+    pools: WorkerPools | None = None,
+) -> WebtoonDownloader:
+    """
+    Wires together the client, downloaders and exporter described by the given options.
+
+    Args:
+        opts                : Options for downloading the Webtoon.
+        transcoder          : Optional process pool used to convert images.
+        parser              : Optional pool to parse the HTML pages in. Defaults to the loop's default thread pool.
+        client              : Optional HTTP client to share with other series. Created from the options if not set.
+        image_downloader    : Optional image downloader to share with other series. Created from the options if not set.
+        parent_directory    : Optional directory to create the series directory in, when `opts.destination` is not set.
+        timings             : Optional collector of stage timings to share with other series. Created if not set.
+        pools               : Optional thread pools of the CPU-bound work and of the storage writes.
+
+    Returns:
+        The downloader for the Webtoon series.
     """
     file_name_generator = (
         SeparateFileNameGenerator(use_chapter_title_directories=True)
         if opts.separate
         else NonSeparateFileNameGenerator()
     )
-    webtoon_client = WebtoonHttpClient(proxy=opts.proxy, retry_strategy=opts.retry_strategy)
-    image_downloader = HttpImageDownloader(
-        client=webtoon_client,
-        transformers=[AioImageFormatTransformer(opts.image_format)],
-        concurrent_downloads_limit=opts.concurrent_pages,
-    )
+    timings = timings or StageTimings()
+    webtoon_client = client or _create_client(opts, timings)
+    parser = parser or HtmlParser()
+    if image_downloader is None:
+        image_downloader = _create_image_downloader(opts, webtoon_client, transcoder, timings, pools)
+    if opts.metrics:
+        opts.metrics.watch(client=webtoon_client, timings=timings, pools=pools or ())
 
     exporter = DataExporter(opts.exporter_format) if opts.export_metadata else None
     chapter_downloader = ChapterDownloader(
         client=webtoon_client,
         exporter=exporter,
-        progress_callback=opts.chapter_progress_callback,
+        progress_callback=_notify_all(
+            opts.chapter_progress_callback, opts.metrics.on_chapter_progress if opts.metrics else None
+        ),
         image_downloader=image_downloader,
         file_name_generator=file_name_generator,
         concurrent_downloads_limit=opts.concurrent_chapters,
+        parser=parser,
+        timings=timings,
     )
 
     end: int | None | Literal["latest"]
@@ -271,7 +1031,7 @@ async def download_webtoon(opts: WebtoonDownloadOptions) -> list[DownloadResult]
     else:
         start, end = opts.start, opts.end
 
-    downloader = WebtoonDownloader(
+    return WebtoonDownloader(
         url=opts.url,
         client=webtoon_client,
         directory=opts.destination,
@@ -280,10 +1040,121 @@ async def download_webtoon(opts: WebtoonDownloadOptions) -> list[DownloadResult]
         chapter_downloader=chapter_downloader,
         storage_type=opts.save_as,
         exporter=exporter,
-        on_webtoon_fetched=opts.on_webtoon_fetched,
+        on_webtoon_fetched=_notify_all(
+            opts.on_webtoon_fetched, opts.metrics.on_webtoon_fetched if opts.metrics else None
+        ),
         quality=opts.quality,
+        image_format=opts.image_format,
+        prefetch_chapters=opts.prefetch_chapters,
+        resume=opts.resume,
+        sync=opts.sync,
+        parent_directory=parent_directory,
+        chapters_per_volume=opts.chapters_per_volume,
+        parser=parser,
+        timings=timings,
+        run_report=opts.run_report,
+        io_executor=pools.io if pools is not None else None,
     )
-    try:
-        return await downloader.run()
-    except Exception as exc:
-        raise WebtoonDownloadError(downloader.url, exc) from exc
+
+
+async def download_webtoon(opts: WebtoonDownloadOptions) -> list[list[DownloadResult]]:
+    """
+    Asynchronously downloads chapters of a given Webtoon based on the provided options.
+
+    Args:
+        opts: Options for downloading the Webtoon.
+
+    Returns:
+        A list of download results for each chapter.
+    """
+    async with (
+        _worker_pools(opts) as pools,
+        _transcoding_pool(opts) as transcoder,
+        _parsing_pool(opts, pools.cpu) as parser,
+    ):
+        downloader = _create_downloader(opts, transcoder, parser, pools=pools)
+        try:
+            return await downloader.run()
+        except Exception as exc:
+            raise WebtoonDownloadError(downloader.url, exc) from exc
+
+
+async def stream_webtoon(opts: WebtoonDownloadOptions) -> AsyncIterator[ChapterDownloadResult]:
+    """
+    Asynchronously downloads chapters of a given Webtoon, yielding each chapter result as soon as it completes.
+
+    Args:
+        opts: Options for downloading the Webtoon.
+
+    Yields:
+        The download result of each chapter, in completion order.
+    """
+    async with (
+        _worker_pools(opts) as pools,
+        _transcoding_pool(opts) as transcoder,
+        _parsing_pool(opts, pools.cpu) as parser,
+    ):
+        downloader = _create_downloader(opts, transcoder, parser, pools=pools)
+        try:
+            async for result in downloader.stream():
+                yield result
+        except Exception as exc:
+            raise WebtoonDownloadError(downloader.url, exc) from exc
+
+
+async def stream_webtoons(urls: Sequence[str], opts: WebtoonDownloadOptions) -> AsyncIterator[ChapterDownloadResult]:
+    """
+    Asynchronously downloads several Webtoon series, yielding each chapter result as soon as it completes.
+
+    All the series share one HTTP client, one image concurrency budget of `opts.concurrent_pages` and one pool of
+    `opts.concurrent_chapters` chapter workers, scheduled round-robin between the series. Each series is downloaded
+    to a directory named after its title, inside `opts.destination` if set.
+
+    Args:
+        urls: The URLs of the Webtoon series to download.
+        opts: Options for downloading the Webtoons. `opts.url` is ignored.
+
+    Yields:
+        The download result of each chapter, in completion order.
+
+    Raises:
+        BatchDownloadError: Once every other series is downloaded, if some of the series failed.
+    """
+    async with (
+        _worker_pools(opts) as pools,
+        _transcoding_pool(opts) as transcoder,
+        _parsing_pool(opts, pools.cpu) as parser,
+    ):
+        timings = StageTimings()
+        client = _create_client(opts, timings)
+        image_downloader = _create_image_downloader(opts, client, transcoder, timings, pools)
+        # The series share their timings, reported once for the whole batch
+        series_opts = dataclasses.replace(opts, destination=None, run_report=False)
+        batch = BatchDownloader(
+            downloaders=[
+                _create_downloader(
+                    dataclasses.replace(series_opts, url=url),
+                    parser=parser,
+                    client=client,
+                    image_downloader=image_downloader,
+                    parent_directory=opts.destination,
+                    timings=timings,
+                    pools=pools,
+                )
+                for url in urls
+            ],
+            concurrent_chapters=opts.concurrent_chapters,
+            prefetch_chapters=opts.prefetch_chapters,
+        )
+        try:
+            async with client:
+                async for result in batch.stream():
+                    yield result
+        finally:
+            if opts.run_report:
+                report_path = Path(opts.destination or ".") / RUN_REPORT_FILENAME
+                await asyncio.to_thread(timings.write_report, report_path)
+
+        if batch.errors:
+            first_error = next(iter(batch.errors.values()))
+            raise BatchDownloadError(", ".join(batch.errors), first_error, errors=batch.errors)
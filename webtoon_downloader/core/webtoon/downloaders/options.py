@@ -3,9 +3,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Literal, TypeAlias
 
+import httpx
+
+from webtoon_downloader.core.downloaders.limiter import ConcurrencyChangeCallback
+from webtoon_downloader.core.executors import DEFAULT_IO_WORKERS
+from webtoon_downloader.core.metrics import DownloadMetrics
+from webtoon_downloader.core.webtoon.cache import DEFAULT_CACHE_MAX_SIZE
 from webtoon_downloader.core.webtoon.client import RetryStrategy
 from webtoon_downloader.core.webtoon.downloaders.callbacks import ChapterProgressCallback, OnWebtoonFetchCallback
 from webtoon_downloader.core.webtoon.exporter import DataExporterFormat
+from webtoon_downloader.core.webtoon.parsing import ParserExecutorType
+from webtoon_downloader.core.webtoon.ratelimit import RateLimitCallback
 from webtoon_downloader.transformers.image import ImageFormat
 
 StorageType: TypeAlias = Literal["images", "zip", "cbz", "pdf"]
@@ -18,6 +26,9 @@ DEFAULT_CONCURRENT_IMAGE_DOWNLOADS = 120
 DEFAULT_CONCURRENT_CHAPTER_DOWNLOADS = 6
 """Default number of asynchronous chapter download workers. This does not affect rate limiting or download speed since that is all controlled by the number of concurrent image downloads."""
 
+DEFAULT_PREFETCH_CHAPTERS = 2
+"""Default number of chapters whose viewer pages are fetched and parsed ahead of the image downloads."""
+
 
 @dataclass
 class WebtoonDownloadOptions:
@@ -34,14 +45,34 @@ class WebtoonDownloadOptions:
         exporter_forma            : Format for exporting metadata.
         separate                  : Flag to store each chapter in separate directories.
         save_as                   : Format to save chapters.
+        chapters_per_volume       : The number of consecutive chapters stored in each file. If None, each chapter is stored in its own file. Ignored for image output.
         image_format              : Format to save chapter images.
         chapter_progress_callback : Callback function for chapter download progress.
         on_webtoon_fetched        : function invoked after fetching Webtoon information.
+        resume                    : Flag to skip the chapters and pages recorded as downloaded in the series manifest.
+        sync                      : Flag to only download the chapters published since the last sync. Ignores start, end, latest and resume.
         concurrent_chapters       : The number of chapters to download concurrently.
-        concurrent_pages          : The number of images to download concurrently.
+        prefetch_chapters         : The number of chapters whose viewer pages are fetched ahead of the image downloads.
+        concurrent_pages          : The number of images to download concurrently. Upper bound when `adaptive_concurrency` is set.
+        adaptive_concurrency      : Flag to adapt the number of concurrent image downloads to rate limiting and latency.
+        on_concurrency_changed    : function invoked with the new image concurrency window when it is adapted.
+        transcode_workers         : The number of worker processes converting images. If None, images are converted in a thread.
+        parser_executor           : Whether to parse the series and viewer pages in a pool of threads or of processes.
+        parser_workers            : The number of workers parsing pages. If None, the CPU thread pool or one process per CPU.
+        cpu_workers               : The number of threads of the pool converting images and parsing pages. If None, one per CPU.
+        io_workers                : The number of threads of the pool running the blocking file, ZIP and PDF writes.
         retry_strategy            : The strategy to use for retrying failed downloads.
+        requests_per_second       : Optional maximum number of requests per second sent to each host.
+        bytes_per_second          : Optional maximum number of bytes per second downloaded from each host.
+        on_rate_limit_changed     : function invoked with the state of a host when its traffic is paused or resumed after a Retry-After.
         proxy                     : proxy address to use for making requests.
+        transport                 : Optional transport sending the requests instead of the default HTTP/2 connection pool.
+        cache_dir                 : Optional directory of an on-disk cache of the series pages, viewer pages and episode lists.
+        cache_size                : The number of bytes of responses kept in the cache before the least recently used are evicted.
+        blob_store_dir            : Optional directory of a content-addressed store of the page images, so that identical images are stored once and known image URLs are not downloaded again.
         quality                   : The quality of the image to download
+        metrics                   : Optional metrics fed with the chapter progress and the state of the download, e.g. to serve them with a `MetricsServer`.
+        run_report                : Whether to write a JSON report of the time and bytes of each download stage, `webtoon-run-report.json`, in the series directory, or in `destination` for several series.
     """
 
     url: str
@@ -58,13 +89,34 @@ class WebtoonDownloadOptions:
 
     separate: bool = True
     save_as: StorageType = "images"
+    chapters_per_volume: int | None = None
     image_format: ImageFormat = "JPG"
 
     chapter_progress_callback: ChapterProgressCallback | None = None
     on_webtoon_fetched: OnWebtoonFetchCallback | None = None
 
+    resume: bool = True
+    sync: bool = False
+
     concurrent_chapters: int = DEFAULT_CONCURRENT_CHAPTER_DOWNLOADS
+    prefetch_chapters: int = DEFAULT_PREFETCH_CHAPTERS
     concurrent_pages: int = DEFAULT_CONCURRENT_IMAGE_DOWNLOADS
+    adaptive_concurrency: bool = False
+    on_concurrency_changed: ConcurrencyChangeCallback | None = None
+    transcode_workers: int | None = None
+    parser_executor: ParserExecutorType = "thread"
+    parser_workers: int | None = None
+    cpu_workers: int | None = None
+    io_workers: int = DEFAULT_IO_WORKERS
 
     retry_strategy: RetryStrategy | None = None
+    requests_per_second: float | None = None
+    bytes_per_second: float | None = None
+    on_rate_limit_changed: RateLimitCallback | None = None
     proxy: str | None = None
+    transport: httpx.AsyncBaseTransport | None = None
+    cache_dir: str | None = None
+    cache_size: int = DEFAULT_CACHE_MAX_SIZE
+    blob_store_dir: str | None = None
+    metrics: DownloadMetrics | None = None
+    run_report: bool = False
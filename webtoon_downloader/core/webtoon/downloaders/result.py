@@ -1,7 +1,24 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TypeAlias
 
+from webtoon_downloader.core.webtoon.models import ChapterInfo
+
 DownloadResult: TypeAlias = str | Path
 """Type representation of the download result as either a string or Path object."""
+
+
+@dataclass
+class ChapterDownloadResult:
+    """
+    Represents the download results of a single chapter.
+
+    Attributes:
+        chapter_info    : Information about the downloaded chapter.
+        pages           : The download results of the chapter pages.
+    """
+
+    chapter_info: ChapterInfo
+    pages: list[DownloadResult]
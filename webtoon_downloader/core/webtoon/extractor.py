@@ -2,13 +2,22 @@ from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from functools import cached_property
 
 from bs4 import BeautifulSoup, NavigableString, Tag
+from lxml import etree
+
+from webtoon_downloader.core.webtoon.models import SeriesPageData, ViewerPageData
 
 log = logging.getLogger(__name__)
 
+SCAN_CHUNK_SIZE = 16 * 1024
+"""Number of characters of a page fed at a time to the incremental parser, between checks for the needed nodes."""
+
+_VIEWER_AREA_CLASS = re.compile(r"\bviewer_img\b.*\b_img_viewer_area\b")
+
 
 class InvalidHTMLObject(TypeError):
     """Exception raised when variable is neither a string nor a BeautifulSoup object."""
@@ -24,6 +33,67 @@ class ElementNotFoundError(Exception):
         self.element_name = element_name
         super().__init__(f"Element '{element_name}' not found")
 
+    def __reduce__(self) -> tuple[type[ElementNotFoundError], tuple[str]]:
+        # Raised in parsing worker processes, so it must be rebuilt from its element name when unpickled
+        return type(self), (self.element_name,)
+
+
+def iter_elements(html: str) -> Iterator[tuple[str, etree._Element]]:
+    """
+    Yields the `start` and `end` events of an incremental lxml parse of a page.
+
+    The page is fed to the parser `SCAN_CHUNK_SIZE` characters at a time, so a consumer that stops iterating once it
+    found what it needs leaves the rest of the page unparsed. Elements have their attributes on `start`, and their
+    children and text on `end`.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    for offset in range(0, len(html), SCAN_CHUNK_SIZE):
+        parser.feed(html[offset : offset + SCAN_CHUNK_SIZE])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _has_class(element: etree._Element, class_name: str) -> bool:
+    return class_name in str(element.get("class", "")).split()
+
+
+def scan_img_urls(html: str) -> list[str] | None:
+    """
+    Reads the image URLs of a viewer page, stopping at the end of its image area.
+
+    Returns:
+        The `data-url` of every image of the area, or None if the area is not found, holds no image, or holds an
+        image without `data-url`, so that the caller can fall back to a full parse and report the error.
+    """
+    area: etree._Element | None = None
+    urls: list[str] = []
+    for event, element in iter_elements(html):
+        if area is None:
+            if event == "start" and element.tag == "div" and _VIEWER_AREA_CLASS.search(str(element.get("class", ""))):
+                area = element
+        elif event == "start" and element.tag == "img":
+            url = element.get("data-url")
+            if url is None:
+                return None
+            urls.append(str(url))
+        elif event == "end" and element is area:
+            return urls or None
+    return None
+
+
+def scan_text(html: str, class_name: str) -> str | None:
+    """
+    Reads the text of the first element of a page having a class, stopping at the end of that element.
+
+    Returns:
+        The text of the element and its descendants, without comments, or None if no element has the class.
+    """
+    for event, element in iter_elements(html):
+        if event == "end" and _has_class(element, class_name):
+            return "".join(element.itertext())
+    return None
+
 
 def _ensure_beautiful_soup(html: str | BeautifulSoup) -> BeautifulSoup:
     """Ensure the provided HTML is a BeautifulSoup object."""
@@ -114,7 +184,13 @@ class WebtoonMainPageExtractor:
 
 @dataclass
 class WebtoonViewerPageExtractor:
-    """Extractor for a webtoon chapter viewer page."""
+    """
+    Extractor for a webtoon chapter viewer page.
+
+    When given the page as a string, the image URLs and the chapter notes are read with an incremental parser
+    that stops as soon as their element ends (see `iter_elements`), without building a BeautifulSoup tree. The
+    BeautifulSoup tree is only built as a fallback, when the image area does not have the expected structure.
+    """
 
     html: str | BeautifulSoup
 
@@ -124,6 +200,10 @@ class WebtoonViewerPageExtractor:
 
     @cached_property
     def chapter_notes(self) -> str:
+        if isinstance(self.html, str):
+            # Both parse with lxml, so a note the scan did not find would not be found in the tree either
+            notes = scan_text(self.html, "author_text") or ""
+            return notes.strip().replace("\r\n", "\n")
         tag = self.soup.find(class_="author_text")
         if not tag:
             return ""
@@ -131,7 +211,12 @@ class WebtoonViewerPageExtractor:
 
     @cached_property
     def img_urls(self) -> list[str]:
-        nav = self.soup.find("div", class_=re.compile(r"\bviewer_img\b.*\b_img_viewer_area\b"))
+        if isinstance(self.html, str):
+            if (urls := scan_img_urls(self.html)) is not None:
+                return [url.replace("?type=q90", "") for url in urls]
+            log.debug("Image area not read by the incremental scan, falling back to a full parse")
+
+        nav = self.soup.find("div", class_=_VIEWER_AREA_CLASS)
         if not nav:
             raise ElementNotFoundError("_img_viewer_area")
 
@@ -145,3 +230,29 @@ class WebtoonViewerPageExtractor:
             raise ElementNotFoundError("img")
 
         return [tag["data-url"].replace("?type=q90", "") for tag in tags]
+
+
+def parse_series_page(html: str) -> SeriesPageData:
+    """Reads the data of a series main page. See `WebtoonMainPageExtractor`."""
+    extractor = WebtoonMainPageExtractor(html)
+    title = summary = None
+    try:
+        title = extractor.series_title
+    except ElementNotFoundError:
+        log.debug("Series title not found in main page")
+    try:
+        summary = extractor.series_summary
+    except ElementNotFoundError:
+        log.debug("Series summary not found in main page")
+    return SeriesPageData(title, summary, extractor.author, extractor.genre)
+
+
+def parse_viewer_page(html: str) -> ViewerPageData:
+    """
+    Reads the data of a chapter viewer page. See `WebtoonViewerPageExtractor`.
+
+    Raises:
+        ElementNotFoundError: If the page has no image area, or no image in it.
+    """
+    extractor = WebtoonViewerPageExtractor(html)
+    return ViewerPageData(extractor.img_urls, extractor.chapter_notes)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Literal
 
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from furl import furl
 
 from webtoon_downloader.core.exceptions import (
@@ -16,12 +16,21 @@ from webtoon_downloader.core.exceptions import (
     SeriesTitleFetchError,
     WebtoonGetError,
 )
-from webtoon_downloader.core.webtoon.api import WebtoonAPI
+from webtoon_downloader.core.timing import StageTimings
+from webtoon_downloader.core.webtoon.api import ALL_EPISODES_PAGE_SIZE, EpisodeInfo, WebtoonAPI
 from webtoon_downloader.core.webtoon.client import WebtoonHttpClient, WebtoonURL
 from webtoon_downloader.core.webtoon.models import ChapterInfo
+from webtoon_downloader.core.webtoon.parsing import HtmlParser
 
 log = logging.getLogger(__name__)
 
+SYNC_PAGE_SIZE = 30
+"""Number of episodes requested per page when listing the episodes published after a known one."""
+
+
+_SERIES_PAGE_STRAINER = SoupStrainer(["link", "strong", "p"])
+"""Only the tags holding the canonical link and the series title are parsed from the mobile series page."""
+
 
 class WebtoonDomain(str, Enum):
     """valid webtoon subdomains"""
@@ -34,6 +43,49 @@ class TitleNoFetchError(Exception):
     """Custom exception for when the title number cannot be found."""
 
 
+def parse_mobile_series_page(html: str) -> tuple[int, str]:
+    """
+    Reads the title number and the title of a series from its mobile series page.
+
+    Only the tags holding them are parsed. This is a module-level function so that it can run in a parsing process.
+    """
+    soup = BeautifulSoup(html, "lxml", parse_only=_SERIES_PAGE_STRAINER)
+    return _read_title_no(soup), _read_series_title(soup)
+
+
+def _read_title_no(soup: BeautifulSoup) -> int:
+    """
+    Returns the title number by parsing the canonical link tag object
+    """
+    canonical_link_tag = soup.find("link", rel="canonical")
+    if not isinstance(canonical_link_tag, Tag):
+        raise TitleNoFetchError
+
+    if not canonical_link_tag.has_attr("href"):
+        raise TitleNoFetchError("Could not find the canonical link tag in the HTML.")  # noqa: TRY003
+
+    f = furl(str(canonical_link_tag["href"]))
+    title = f.args.get("title_no")
+    if not title:
+        raise TitleNoFetchError
+
+    return int(title)
+
+
+def _read_series_title(soup: BeautifulSoup) -> str:
+    """Returns the series title from the scrapped tag object"""
+    # Look for the new format used in the provided HTML.
+    series_title_tag = soup.find("strong", class_="subject")
+    # Fallback: If the new format isn't found, look for the older format.
+    if not series_title_tag:
+        series_title_tag = soup.find("p", class_="subj")
+
+    if not isinstance(series_title_tag, Tag):
+        raise SeriesTitleFetchError("Failed to find series title with any known tag.")  # noqa: TRY003
+
+    return series_title_tag.text
+
+
 @dataclass
 class WebtoonFetcher:
     """
@@ -44,10 +96,14 @@ class WebtoonFetcher:
     Attributes:
         client: The HTTP client used for making requests to Webtoon.
         series_url: The URL of the Webtoon series from which to fetch details.
+        parser: Parser of the series page, running off the event loop.
+        timings: Collector of the time listing the chapters takes.
     """
 
     client: WebtoonHttpClient
     series_url: str
+    parser: HtmlParser = field(default_factory=HtmlParser)
+    timings: StageTimings = field(default_factory=StageTimings)
 
     def _convert_url_domain(self, viewer_url: str, target_subdomain: WebtoonDomain) -> str:
         """Converts the provided Webtoon URL to the specified subdomain (default 'm')."""
@@ -63,24 +119,6 @@ class WebtoonFetcher:
         f.host = ".".join(domain_parts)
         return str(f.url)
 
-    def _get_title_no(self, soup: BeautifulSoup) -> int:
-        """
-        Returns the title number by parsing the canonical link tag object
-        """
-        canonical_link_tag = soup.find("link", rel="canonical")
-        if not isinstance(canonical_link_tag, Tag):
-            raise TitleNoFetchError
-
-        if not canonical_link_tag.has_attr("href"):
-            raise TitleNoFetchError("Could not find the canonical link tag in the HTML.")  # noqa: TRY003
-
-        f = furl(str(canonical_link_tag["href"]))
-        title = f.args.get("title_no")
-        if not title:
-            raise TitleNoFetchError
-
-        return int(title)
-
     def _get_viewer_url(self, tag: Tag) -> str:
         """Returns the viewer URL from the scrapped tag object"""
         viewer_url_tag = tag.find("a")
@@ -109,19 +147,6 @@ class WebtoonFetcher:
 
         return int(data_episode_no_tag)
 
-    def _get_series_title(self, soup: BeautifulSoup) -> str:
-        """Returns the series title from the scrapped tag object"""
-        # Look for the new format used in the provided HTML.
-        series_title_tag = soup.find("strong", class_="subject")
-        # Fallback: If the new format isn't found, look for the older format.
-        if not series_title_tag:
-            series_title_tag = soup.find("p", class_="subj")
-
-        if not isinstance(series_title_tag, Tag):
-            raise SeriesTitleFetchError("Failed to find series title with any known tag.")  # noqa: TRY003
-
-        return series_title_tag.text
-
     def _get_webtoon_type(self, series_url: str) -> Literal["webtoon", "canvas"]:
         if "canvas" in series_url:
             return "canvas"
@@ -131,17 +156,28 @@ class WebtoonFetcher:
         return f"https://m.webtoons.com/api/v1/{self._get_webtoon_type(series_url)}/{series_id}"
 
     async def get_chapters_details(
-        self, series_url: str, start_chapter: int | None = None, end_chapter: int | None | Literal["latest"] = None
+        self,
+        series_url: str,
+        start_chapter: int | None = None,
+        end_chapter: int | None | Literal["latest"] = None,
+        last_episode_no: int | None = None,
+        last_chapter_number: int | None = None,
     ) -> list[ChapterInfo]:
         """
         fetches and parses chapter details from a given Webtoon series URL.
 
         This method retrieves chapter information, including chapter numbers, URLs, titles, and total chapter count.
+        The episode API does not tell how many episodes a series has, and the total chapter count sets the
+        zero-padding of the file names, so the whole episode list is fetched in a single request, unless the last
+        episode of an earlier listing is given. In that case, with `end_chapter`, the chapters are counted from the
+        episodes published after it, and only the episodes up to `end_chapter` are fetched.
 
         Args:
-            series_url      : The URL of the Webtoon series from which to fetch chapter details.
-            start_chapter   : The starting chapter number from which to begin fetching details.
-            end_chapter     : chapter number up to which details should be fetched.
+            series_url          : The URL of the Webtoon series from which to fetch chapter details.
+            start_chapter       : The starting chapter number from which to begin fetching details.
+            end_chapter         : chapter number up to which details should be fetched.
+            last_episode_no     : The episode number of the last episode of an earlier listing, if known.
+            last_chapter_number : The chapter number of that episode, which was the number of chapters then.
 
         Returns:
             A list of ChapterInfo objects containing details for each chapter.
@@ -149,33 +185,131 @@ class WebtoonFetcher:
             If end_chapter is set to latest and start_chapter is None then returns the last chapter
             If both `start_chapter` and `end_chapter` are None, returns all chapters.
         """
-        mobile_url = self._convert_url_domain(series_url, WebtoonDomain.MOBILE)
+        with self.timings.measure("chapters.list"):
+            series_api_url, series_title = await self._get_series(series_url)
+            chapter_details = None
+            if end_chapter is not None and last_episode_no is not None and last_chapter_number is not None:
+                chapter_details = await self._get_chapters_range(
+                    series_api_url, series_title, end_chapter, last_episode_no, last_chapter_number
+                )
+            if chapter_details is None:
+                chapter_items = await WebtoonAPI(self.client).get_episodes_data(
+                    series_api_url, page_size=ALL_EPISODES_PAGE_SIZE
+                )
+                chapter_details = self._build_chapters(chapter_items, series_title)
+
+        if end_chapter == "latest":
+            return chapter_details[-1:]
+
+        return chapter_details[int(start_chapter or 1) - 1 : end_chapter]
+
+    async def _get_chapters_range(
+        self,
+        series_api_url: str,
+        series_title: str,
+        end_chapter: int | Literal["latest"],
+        last_episode_no: int,
+        last_chapter_number: int,
+    ) -> list[ChapterInfo] | None:
+        """
+        Fetches the chapters up to `end_chapter`, counting the chapters of the series from a known last episode.
+
+        The episode list is paged through from the known episode, and then only its first `end_chapter` episodes are
+        fetched. Like the synchronization, this assumes that no episode before the known one was removed since.
+
+        Returns:
+            The chapters up to `end_chapter`, or only the last chapter for `latest`. None if the known episode is
+            not listed anymore, or if the episode list does not match the count, in which case the whole list must
+            be fetched.
+        """
         webtoon_api = WebtoonAPI(self.client)
+        # Starting right before the known episode lists it first, followed by the ones published after it
+        recent = [
+            episode
+            async for episode in webtoon_api.iter_episodes(
+                series_api_url, page_size=SYNC_PAGE_SIZE, cursor=last_episode_no - 1
+            )
+        ]
+        if not recent or recent[0].episodeNo != last_episode_no:
+            log.debug("Episode %d is not listed anymore, fetching the whole episode list", last_episode_no)
+            return None
+
+        total_chapters = last_chapter_number + len(recent) - 1
+        if end_chapter == "latest":
+            return self._build_chapters(recent[-1:], series_title, total_chapters, total_chapters)
+
+        first_items = await webtoon_api.get_episodes_data(series_api_url, page_size=end_chapter)
+        if len(first_items) != min(end_chapter, total_chapters):
+            log.debug("Episode list does not match %d chapters, fetching the whole episode list", total_chapters)
+            return None
+        return self._build_chapters(first_items, series_title, total_chapters=total_chapters)
+
+    async def get_chapters_details_after(
+        self, series_url: str, last_episode_no: int, last_chapter_number: int
+    ) -> list[ChapterInfo]:
+        """
+        Fetches the details of the chapters published after a known episode.
+
+        The episode list is paged through starting at the known episode, so the cost depends on the number of new
+        episodes rather than on the length of the series. Paging stops at the first page without new episodes.
+
+        Args:
+            series_url          : The URL of the Webtoon series from which to fetch chapter details.
+            last_episode_no     : The episode number of the last known episode.
+            last_chapter_number : The chapter number of the last known episode. New chapters are numbered after it.
+
+        Returns:
+            A list of ChapterInfo objects for the chapters published after the known episode, in publication order.
+        """
+        with self.timings.measure("chapters.list"):
+            series_api_url, series_title = await self._get_series(series_url)
+            episodes = WebtoonAPI(self.client).iter_episodes(
+                series_api_url, page_size=SYNC_PAGE_SIZE, cursor=last_episode_no
+            )
+            new_items = [episode async for episode in episodes]
+
+        log.debug("Found %d episodes published after episode %d", len(new_items), last_episode_no)
+        return self._build_chapters(new_items, series_title, first_number=last_chapter_number + 1)
+
+    async def _get_series(self, series_url: str) -> tuple[str, str]:
+        """
+        Fetches the mobile series page.
+
+        Returns:
+            The URL of the series in the episode API and the series title.
+        """
+        mobile_url = self._convert_url_domain(series_url, WebtoonDomain.MOBILE)
         response = await self.client.get(mobile_url)
         if response.status_code != 200:
             raise WebtoonGetError(series_url, response.status_code)
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        title_id = self._get_title_no(soup)
+        title_id, series_title = await self.parser.parse(parse_mobile_series_page, response.text)
         log.debug("Title ID: %s", title_id)
-        series_title = self._get_series_title(soup)
-        chapter_items = await webtoon_api.get_episodes_data(
-            (self._get_series_api_url(mobile_url, title_id)), page_size=99999
-        )
-
-        chapter_details: list[ChapterInfo] = []
-        for chapter_number, chapter_detail in enumerate(chapter_items, start=1):
-            chapter_info = ChapterInfo(
+        return self._get_series_api_url(mobile_url, title_id), series_title
+
+    def _build_chapters(
+        self,
+        chapter_items: list[EpisodeInfo],
+        series_title: str,
+        first_number: int = 1,
+        total_chapters: int | None = None,
+    ) -> list[ChapterInfo]:
+        """
+        Builds the chapter details from the episode API items, numbering them from `first_number`.
+
+        The total chapter count defaults to the number of the last item, when the items end the episode list.
+        """
+        if total_chapters is None:
+            total_chapters = first_number - 1 + len(chapter_items)
+        return [
+            ChapterInfo(
                 number=chapter_number,
                 viewer_url=f"{WebtoonURL}{chapter_detail.viewerLink}",
                 title=chapter_detail.episodeTitle.strip(),
                 data_episode_no=chapter_detail.episodeNo,
-                total_chapters=len(chapter_items),
+                total_chapters=total_chapters,
                 series_title=series_title.strip(),
+                exposure_date_millis=chapter_detail.exposureDateMillis,
             )
-            chapter_details.append(chapter_info)
-
-        if end_chapter == "latest":
-            return [chapter_details[-1]]
-
-        return chapter_details[int(start_chapter or 1) - 1 : end_chapter]
+            for chapter_number, chapter_detail in enumerate(chapter_items, start=first_number)
+        ]
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from os import PathLike
+from pathlib import Path
+from typing import Any, Literal
+
+import aiofiles
+import dacite
+from aiofiles.threadpool.binary import AsyncBufferedIOBase
+
+from webtoon_downloader.core.downloaders.image import ImageDownloadResult
+from webtoon_downloader.core.webtoon.models import ChapterInfo, PageInfo
+
+log = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".webtoon-manifest.jsonl"
+"""Name of the manifest file kept in the series directory."""
+
+
+@dataclass
+class ManifestPage:
+    """
+    Record of a downloaded page.
+
+    Attributes:
+        episode_no  : The episode number of the chapter the page belongs to.
+        page        : The page number within the chapter.
+        url         : The URL the image was downloaded from.
+        quality     : The requested image quality.
+        image_format: The format the image was written in, such as `JPG`.
+        name        : The name the image was written as, relative to the storage container.
+        size        : The number of bytes written.
+        sha256      : Hex digest of the bytes written, if known. It is recorded for reference, not checked on resume.
+        type        : Discriminator of the record kind in the manifest file.
+    """
+
+    episode_no: int
+    page: int
+    url: str
+    quality: int
+    name: str
+    size: int
+    image_format: str | None = None
+    sha256: str | None = None
+    type: Literal["page"] = "page"
+
+
+@dataclass
+class ManifestChapter:
+    """
+    Record of a completely downloaded chapter.
+
+    Attributes:
+        episode_no  : The episode number of the chapter, which stays stable when other episodes are removed.
+        number      : The chapter number at the time of the download.
+        title       : The title of the chapter.
+        pages       : The number of pages of the chapter.
+        output      : The file the chapter was written to, relative to the series directory. None for image output.
+        size        : The size of `output` in bytes, or the total size of the pages for image output.
+        quality     : The requested image quality.
+        image_format: The format the images were written in, such as `JPG`.
+        exposure_date_millis: When the chapter was published, in milliseconds since the epoch, if known.
+        type        : Discriminator of the record kind in the manifest file.
+    """
+
+    episode_no: int
+    number: int
+    title: str
+    pages: int
+    output: str | None = None
+    size: int = 0
+    quality: int | None = None
+    image_format: str | None = None
+    exposure_date_millis: int | None = None
+    type: Literal["chapter"] = "chapter"
+
+
+@dataclass
+class ManifestSync:
+    """
+    Record of a completed synchronization, marking the last episode listed by the series at that time.
+
+    Attributes:
+        episode_no  : The episode number of the last listed episode.
+        number      : The chapter number of the last listed episode.
+        exposure_date_millis: When the last listed episode was published, in milliseconds since the epoch, if known.
+        type        : Discriminator of the record kind in the manifest file.
+    """
+
+    episode_no: int
+    number: int
+    exposure_date_millis: int | None = None
+    type: Literal["sync"] = "sync"
+
+
+@dataclass
+class ManifestListing:
+    """
+    Record of the last episode of the series when its whole episode list was last known.
+
+    It lets later runs count the chapters of the series from the episodes published after it, instead of fetching
+    the whole episode list again.
+
+    Attributes:
+        episode_no  : The episode number of the last episode.
+        number      : The chapter number of the last episode, which is the number of chapters of the series.
+        type        : Discriminator of the record kind in the manifest file.
+    """
+
+    episode_no: int
+    number: int
+    type: Literal["listing"] = "listing"
+
+
+@dataclass
+class SeriesManifest:
+    """
+    Append-only record of the chapters and pages downloaded into a series directory.
+
+    Records are stored as JSON lines in `MANIFEST_FILENAME`, so an interrupted run loses at most the line being
+    written. When a chapter or page is recorded more than once, the last record wins.
+
+    A chapter or page is only complete for a run requesting the same image quality and format it was recorded with,
+    and whose file still has the recorded size. The size catches truncated files, not files corrupted in place.
+
+    Attributes:
+        directory: The series directory holding the manifest and the downloaded chapters.
+    """
+
+    directory: Path
+
+    _chapters: dict[int, ManifestChapter] = field(init=False, default_factory=dict)
+    _pages: dict[int, dict[int, ManifestPage]] = field(init=False, default_factory=dict)
+    _last_sync: ManifestSync | None = field(init=False, default=None)
+    _last_listing: ManifestListing | None = field(init=False, default=None)
+    _file: AsyncBufferedIOBase | None = field(init=False, default=None)
+    _lock: asyncio.Lock = field(init=False, default_factory=asyncio.Lock)
+
+    @property
+    def path(self) -> Path:
+        return self.directory / MANIFEST_FILENAME
+
+    @property
+    def last_sync(self) -> ManifestSync | None:
+        """The last completed synchronization, or None if the series was never synchronized."""
+        return self._last_sync
+
+    @property
+    def last_listing(self) -> ManifestListing | None:
+        """The last episode of the series when it was last listed, or None if it was never listed whole."""
+        return self._last_listing
+
+    @classmethod
+    async def load(cls, directory: str | PathLike[str]) -> SeriesManifest:
+        """
+        Reads the manifest of a series directory. A missing manifest is read as an empty one.
+
+        Args:
+            directory: The series directory.
+
+        Returns:
+            The manifest, ready to record new chapters and pages.
+        """
+        manifest = cls(Path(directory))
+        if not manifest.path.exists():
+            return manifest
+
+        async with aiofiles.open(manifest.path, encoding="utf-8") as file:
+            async for line in file:
+                manifest._load_record(line)
+
+        log.debug(
+            'Loaded manifest "%s" with %d chapters and %d pages',
+            manifest.path,
+            len(manifest._chapters),
+            sum(len(pages) for pages in manifest._pages.values()),
+        )
+        return manifest
+
+    def _load_record(self, line: str) -> None:
+        """Loads a single line of the manifest, ignoring lines that are truncated or not understood."""
+        if not line.strip():
+            return
+        try:
+            data: dict[str, Any] = json.loads(line)
+            if data.get("type") == "chapter":
+                self._add_chapter(dacite.from_dict(ManifestChapter, data))
+            elif data.get("type") == "page":
+                self._add_page(dacite.from_dict(ManifestPage, data))
+            elif data.get("type") == "sync":
+                self._last_sync = dacite.from_dict(ManifestSync, data)
+            elif data.get("type") == "listing":
+                self._last_listing = dacite.from_dict(ManifestListing, data)
+        except (ValueError, dacite.DaciteError):
+            log.warning('Ignoring invalid record in manifest "%s": %r', self.path, line)
+
+    def _add_chapter(self, chapter: ManifestChapter) -> None:
+        self._chapters[chapter.episode_no] = chapter
+
+    def _add_page(self, page: ManifestPage) -> None:
+        self._pages.setdefault(page.episode_no, {})[page.page] = page
+
+    async def is_chapter_complete(
+        self,
+        chapter_info: ChapterInfo,
+        quality: int,
+        image_format: str,
+        output: str | PathLike[str] | None = None,
+    ) -> bool:
+        """
+        Returns True if the chapter was completely downloaded, with the same image quality and format, and its files
+        still have their recorded size.
+
+        A chapter republished since it was downloaded, as told by its exposure date, is not complete anymore.
+
+        Args:
+            chapter_info    : The chapter to check.
+            quality         : The requested image quality.
+            image_format    : The format the images are written in.
+            output          : The file the chapter is expected in, relative to the series directory.
+                              None for image output, in which case every page file is checked.
+        """
+        chapter = self._chapters.get(chapter_info.data_episode_no)
+        if chapter is None or chapter.quality != quality or chapter.image_format != image_format:
+            return False
+
+        published, recorded = chapter_info.exposure_date_millis, chapter.exposure_date_millis
+        if published is not None and recorded is not None and published != recorded:
+            return False
+
+        if output is not None:
+            return chapter.output == str(output) and all(await self._has_files([(chapter.output, chapter.size)]))
+
+        pages = self._pages.get(chapter_info.data_episode_no, {})
+        if chapter.output is not None or not all(
+            n in pages and self._is_page_recorded(pages[n], pages[n].url, quality, image_format)
+            for n in range(1, chapter.pages + 1)
+        ):
+            return False
+        return all(await self._has_files([(pages[n].name, pages[n].size) for n in range(1, chapter.pages + 1)]))
+
+    async def completed_pages(
+        self, chapter_info: ChapterInfo, img_urls: list[str], quality: int, image_format: str
+    ) -> dict[int, ImageDownloadResult]:
+        """
+        Returns the pages of a chapter whose images were already downloaded, with the same image quality and format,
+        and whose files still have their recorded size.
+
+        Only meaningful for image output, where every page is a file of its own.
+
+        Args:
+            chapter_info    : The chapter to check.
+            img_urls        : The URLs of the chapter images, in page order.
+            quality         : The requested image quality.
+            image_format    : The format the images are written in.
+
+        Returns:
+            The results of the completed pages, by page number.
+        """
+        pages = self._pages.get(chapter_info.data_episode_no, {})
+        recorded = [
+            (n, page)
+            for n, url in enumerate(img_urls, start=1)
+            if (page := pages.get(n)) and self._is_page_recorded(page, url, quality, image_format)
+        ]
+        present = await self._has_files([(page.name, page.size) for _, page in recorded])
+        return {
+            n: ImageDownloadResult(page.name, page.size, page.sha256)
+            for (n, page), exists in zip(recorded, present, strict=True)
+            if exists
+        }
+
+    def _is_page_recorded(self, page: ManifestPage, url: str, quality: int, image_format: str) -> bool:
+        return page.url == url and page.quality == quality and page.image_format == image_format
+
+    async def _has_files(self, files: list[tuple[str, int]]) -> list[bool]:
+        """
+        Tells which files exist in the series directory with their expected size.
+
+        The files are checked in a single thread, off the event loop.
+
+        Args:
+            files: The names of the files, relative to the series directory, with their expected size.
+        """
+
+        def _check() -> list[bool]:
+            sizes: list[bool] = []
+            for name, size in files:
+                try:
+                    sizes.append((self.directory / name).stat().st_size == size)
+                except OSError:
+                    sizes.append(False)
+            return sizes
+
+        return await asyncio.to_thread(_check) if files else []
+
+    async def record_page(self, page: PageInfo, quality: int, image_format: str, result: ImageDownloadResult) -> None:
+        """
+        Records a page downloaded as a file of the series directory, for image output.
+
+        The file recorded for the page before, if it has another name, such as an image written in another format,
+        is removed, so that the series directory does not keep both. Pages written to archives or PDFs must not be
+        recorded, since their names are not files of the series directory.
+
+        Args:
+            page        : The page that was downloaded.
+            quality     : The requested image quality.
+            image_format: The format the image was written in.
+            result      : The result of the image download.
+        """
+        record = ManifestPage(
+            episode_no=page.chapter_info.data_episode_no,
+            page=page.page_number,
+            url=page.url,
+            quality=quality,
+            name=result.name,
+            size=result.size,
+            image_format=image_format,
+            sha256=result.sha256,
+        )
+        previous = self._pages.get(record.episode_no, {}).get(record.page)
+        self._add_page(record)
+        await self._append(asdict(record))
+        if previous is not None and previous.name != record.name:
+            await asyncio.to_thread((self.directory / previous.name).unlink, missing_ok=True)
+
+    async def record_chapter(
+        self,
+        chapter_info: ChapterInfo,
+        page_count: int,
+        quality: int,
+        image_format: str,
+        output: str | PathLike[str] | None = None,
+    ) -> None:
+        """
+        Records a completely downloaded chapter.
+
+        Args:
+            chapter_info    : The chapter that was downloaded.
+            page_count      : The number of pages of the chapter.
+            quality         : The requested image quality.
+            image_format    : The format the images were written in.
+            output          : The file the chapter was written to, relative to the series directory.
+                              None for image output, whose pages must have been recorded with `record_page`.
+        """
+        if output is not None:
+            size = (await asyncio.to_thread((self.directory / output).stat)).st_size
+        else:
+            size = sum(page.size for page in self._pages.get(chapter_info.data_episode_no, {}).values())
+
+        record = ManifestChapter(
+            episode_no=chapter_info.data_episode_no,
+            number=chapter_info.number,
+            title=chapter_info.title,
+            pages=page_count,
+            output=str(output) if output is not None else None,
+            size=size,
+            quality=quality,
+            image_format=image_format,
+            exposure_date_millis=chapter_info.exposure_date_millis,
+        )
+        self._add_chapter(record)
+        await self._append(asdict(record))
+
+    async def record_sync(self, last_chapter: ChapterInfo) -> None:
+        """
+        Records a completed synchronization. The next synchronization only lists the episodes published after it.
+
+        Args:
+            last_chapter: The last chapter listed by the series.
+        """
+        record = ManifestSync(
+            episode_no=last_chapter.data_episode_no,
+            number=last_chapter.number,
+            exposure_date_millis=last_chapter.exposure_date_millis,
+        )
+        self._last_sync = record
+        await self._append(asdict(record))
+
+    async def record_listing(self, last_chapter: ChapterInfo) -> None:
+        """
+        Records the last episode of the series, as listed by this run. Nothing is written if it is already recorded.
+
+        Args:
+            last_chapter: The last chapter of the series. Its number must be the number of chapters of the series.
+        """
+        record = ManifestListing(episode_no=last_chapter.data_episode_no, number=last_chapter.number)
+        if record == self._last_listing:
+            return
+        self._last_listing = record
+        await self._append(asdict(record))
+
+    async def _append(self, record: dict[str, Any]) -> None:
+        """Appends a record to the manifest file, opening it on first use."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        async with self._lock:
+            if self._file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._file = await aiofiles.open(self.path, mode="ab")
+            await self._file.write(line.encode("utf-8"))
+            await self._file.flush()
+
+    async def close(self) -> None:
+        """Closes the manifest file."""
+        async with self._lock:
+            if self._file is not None:
+                await self._file.close()
+                self._file = None
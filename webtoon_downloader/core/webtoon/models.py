@@ -11,6 +11,7 @@ class ChapterInfo:
         viewer_url      : The URL where the chapter content can be accessed.
         data_episode_no : An internal identifier for the chapter, as used by the webtoon viewer.
         title           : The title of the chapter.
+        exposure_date_millis: When the chapter was published, in milliseconds since the epoch, if known.
     """
 
     number: int
@@ -19,6 +20,7 @@ class ChapterInfo:
     title: str
     series_title: str
     total_chapters: int
+    exposure_date_millis: int | None = field(default=None, compare=False)
 
     sort_index: int = field(init=False, repr=False)
 
@@ -46,3 +48,35 @@ class PageInfo:
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "sort_index", self.page_number)
+
+
+@dataclass(frozen=True)
+class SeriesPageData:
+    """
+    Data read from a series main page, as plain values that can be handed back by a parsing worker process.
+
+    Attributes:
+        title   : The series title, or None if not found.
+        summary : The series summary, or None if not found.
+        author  : The series author, or None if not found.
+        genre   : The series genre, or None if not found.
+    """
+
+    title: str | None
+    summary: str | None
+    author: str | None
+    genre: str | None
+
+
+@dataclass(frozen=True)
+class ViewerPageData:
+    """
+    Data read from a chapter viewer page, as plain values that can be handed back by a parsing worker process.
+
+    Attributes:
+        img_urls        : The URLs of the chapter images, in page order.
+        chapter_notes   : The notes of the author, or an empty string.
+    """
+
+    img_urls: list[str]
+    chapter_notes: str
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Literal, TypeAlias, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ParserExecutorType: TypeAlias = Literal["thread", "process"]
+"""Kind of pool the HTML pages are parsed in."""
+
+
+@dataclass
+class HtmlParser:
+    """
+    Parses HTML pages off the event loop, so that parsing a page does not stall the image streams in flight.
+
+    Pages are handed to plain parsing functions, such as `parse_viewer_page`, which return plain data rather than
+    parse trees, so that they can run in another process. A thread pool is cheap to hand pages to, but its threads
+    still contend with the event loop for the GIL while building trees in Python. A process pool avoids that, at the
+    cost of pickling every page and its result.
+
+    Attributes:
+        executor_type   : Whether to parse pages in a pool of threads or of processes.
+        workers         : Number of workers. Defaults to `executor` for threads, and to the number of CPUs for
+                          processes.
+        executor        : Optional thread pool shared with other CPU-bound work, used for threads when `workers` is not
+                          set. Defaults to the loop's default thread pool. It is not stopped by `shutdown`.
+    """
+
+    executor_type: ParserExecutorType = "thread"
+    workers: int | None = None
+    executor: Executor | None = None
+
+    _executor: Executor | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.workers is not None and self.workers <= 0:
+            raise ValueError(f"Number of parsing workers must be positive, got {self.workers}")  # noqa: TRY003
+
+    async def parse(self, parser: Callable[[str], T], html: str) -> T:
+        """
+        Parses a page in the pool.
+
+        Args:
+            parser  : The function parsing the page. It must be picklable, i.e. defined at module level, to run in a
+                      process pool.
+            html    : The page to parse.
+
+        Returns:
+            The value returned by the parser.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), parser, html)
+
+    def _get_executor(self) -> Executor | None:
+        """Returns the pool, starting it on first use, or None to use the loop's default thread pool."""
+        if self._executor is None:
+            if self.executor_type == "process":
+                workers = self.workers or os.cpu_count() or 1
+                log.debug("Starting HTML parsing pool with %d processes", workers)
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+            elif self.workers is not None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="html-parser")
+            else:
+                return self.executor
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stops the workers. The pool is restarted if the parser is used again."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TypeAlias
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+MAX_RETRY_AFTER = 300.0
+"""Longest pause in seconds honored from a Retry-After header, so that a bogus value cannot stall a download."""
+
+RETRY_AFTER_STATUS_CODES = frozenset((429, 503))
+"""Status codes whose Retry-After header pauses the traffic to their host."""
+
+
+@dataclass
+class HostRateLimitState:
+    """
+    Snapshot of the rate limiting of a host.
+
+    Attributes:
+        host                : The host name.
+        paused_for          : The number of seconds left before requests to the host resume, 0 if they are not paused.
+        requests            : The number of requests sent to the host, retries included.
+        retries             : The number of requests sent again to the host after a failed attempt.
+        rate_limited        : The number of responses of the host asking to retry later.
+        throttled_seconds   : The total time requests and downloads waited for the request and byte rates.
+    """
+
+    host: str
+    paused_for: float
+    requests: int
+    retries: int
+    rate_limited: int
+    throttled_seconds: float
+
+
+RateLimitCallback: TypeAlias = Callable[[HostRateLimitState], Awaitable[None]]
+"""
+Callback invoked with the state of a host when its traffic is paused or resumed.
+"""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    Returns:
+        The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class TokenBucket:
+    """
+    Token bucket refilled at a constant rate.
+
+    Tokens are reserved rather than waited for: a reservation may overdraw the bucket, and the caller then waits
+    for the debt to be refilled. Concurrent callers are therefore served in the order they reserved.
+
+    Attributes:
+        rate        : The number of tokens added per second.
+        capacity    : The maximum number of tokens, which is the largest burst allowed.
+    """
+
+    rate: float
+    capacity: float
+
+    _tokens: float = field(init=False)
+    _updated: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.capacity <= 0:
+            raise ValueError(f"Invalid token bucket: rate={self.rate}, capacity={self.capacity}")  # noqa: TRY003
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes tokens from the bucket.
+
+        Returns:
+            The number of seconds to wait before using them.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self.rate)
+
+
+@dataclass
+class _Host:
+    name: str
+    requests_bucket: TokenBucket | None
+    bytes_bucket: TokenBucket | None
+    paused_until: float = 0.0
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    throttled_seconds: float = 0.0
+    resumer: asyncio.Task[None] | None = None
+
+
+@dataclass
+class HostRateLimiter:
+    """
+    Shares request and bandwidth budgets between all the requests sent to each host.
+
+    Every host gets its own token buckets of `requests_per_second` requests and `bytes_per_second` response bytes,
+    each allowing bursts of `burst` seconds worth of tokens. When a host answers with a Retry-After header, all the
+    traffic to that host is paused for that long, instead of every in-flight request retrying on its own.
+
+    Attributes:
+        requests_per_second : Optional maximum number of requests per second sent to each host.
+        bytes_per_second    : Optional maximum number of response bytes per second read from each host.
+        burst               : The number of seconds worth of requests or bytes that can be sent at once.
+        max_pause           : The longest pause honored from a Retry-After header.
+        on_state_change     : Optional callback invoked with the state of a host when it is paused or resumed.
+    """
+
+    requests_per_second: float | None = None
+    bytes_per_second: float | None = None
+    burst: float = 1.0
+    max_pause: float = MAX_RETRY_AFTER
+    on_state_change: RateLimitCallback | None = None
+
+    _hosts: dict[str, _Host] = field(init=False, default_factory=dict)
+
+    def state(self, host: str) -> HostRateLimitState:
+        """Returns the current state of a host."""
+        return self._state(self._host(host))
+
+    def states(self) -> list[HostRateLimitState]:
+        """Returns the current state of every host requests were sent to."""
+        return [self._state(state) for state in self._hosts.values()]
+
+    async def acquire(self, host: str, retry: bool = False) -> None:
+        """Waits until a request, or a retry of a request if `retry` is set, can be sent to a host."""
+        state = self._host(host)
+        if retry:
+            state.retries += 1
+        while (delay := state.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        if state.requests_bucket and (delay := state.requests_bucket.reserve(1)):
+            state.throttled_seconds += delay
+            await asyncio.sleep(delay)
+        state.requests += 1
+
+    async def consume(self, host: str, size: int) -> None:
+        """Waits until `size` more response bytes can be read from a host."""
+        state = self._host(host)
+        if state.bytes_bucket and (delay := state.bytes_bucket.reserve(size)):
+            state.throttled_seconds += delay
+            await asyncio.sleep(delay)
+
+    async def pause(self, host: str, seconds: float) -> None:
+        """
+        Records that a host asked to retry later, and pauses the requests to it for a number of seconds, unless it
+        is already paused for longer.
+        """
+        state = self._host(host)
+        state.rate_limited += 1
+        seconds = min(seconds, self.max_pause)
+        paused_until = time.monotonic() + seconds
+        if seconds <= 0 or paused_until <= state.paused_until:
+            return
+
+        log.info("Pausing requests to %s for %.1fs as asked by the server", host, seconds)
+        state.paused_until = paused_until
+        if state.resumer:
+            state.resumer.cancel()
+        state.resumer = asyncio.create_task(self._resume(state, seconds))
+        await self._notify(state)
+
+    def close(self) -> None:
+        """Stops the pending notifications of hosts resuming."""
+        for state in self._hosts.values():
+            if state.resumer:
+                state.resumer.cancel()
+
+    async def _resume(self, state: _Host, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+        # The event loop may wake up a hair before the pause ends
+        state.paused_until = min(state.paused_until, time.monotonic())
+        log.info("Resuming requests to %s", state.name)
+        await self._notify(state)
+
+    async def _notify(self, state: _Host) -> None:
+        if self.on_state_change:
+            await self.on_state_change(self._state(state))
+
+    def _host(self, host: str) -> _Host:
+        if host not in self._hosts:
+            self._hosts[host] = _Host(
+                host,
+                self._bucket(self.requests_per_second),
+                self._bucket(self.bytes_per_second),
+            )
+        return self._hosts[host]
+
+    def _bucket(self, rate: float | None) -> TokenBucket | None:
+        if rate is None:
+            return None
+        return TokenBucket(rate, max(rate * self.burst, 1.0))
+
+    def _state(self, state: _Host) -> HostRateLimitState:
+        return HostRateLimitState(
+            host=state.name,
+            paused_for=max(0.0, state.paused_until - time.monotonic()),
+            requests=state.requests,
+            retries=state.retries,
+            rate_limited=state.rate_limited,
+            throttled_seconds=state.throttled_seconds,
+        )
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport sending requests through a `HostRateLimiter`.
+
+    It sits beneath the retry transport, so that every attempt of a request waits for its host's budget, and a
+    Retry-After header seen by any attempt pauses the other requests to the same host. Since the retry transport
+    sends the same request object again, attempts of a request already seen are counted as retries.
+
+    Args:
+        transport   : The transport sending the requests.
+        limiter     : The limiter shared by the requests.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: HostRateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+        self._sent: weakref.WeakSet[httpx.Request] = weakref.WeakSet()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        await self.limiter.acquire(host, retry=request in self._sent)
+        self._sent.add(request)
+        response = await self.transport.handle_async_request(request)
+        if response.status_code in RETRY_AFTER_STATUS_CODES:
+            # Counted even without Retry-After, in which case the host is not paused
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            await self.limiter.pause(host, retry_after or 0.0)
+        if self.limiter.bytes_per_second:
+            response.stream = _ThrottledStream(response.stream, self.limiter, host)
+        return response
+
+    async def aclose(self) -> None:
+        self.limiter.close()
+        await self.transport.aclose()
+
+
+class _ThrottledStream(httpx.AsyncByteStream):
+    """Response body reading its chunks no faster than the byte rate of its host."""
+
+    def __init__(self, stream: httpx.SyncByteStream | httpx.AsyncByteStream, limiter: HostRateLimiter, host: str):
+        self._stream = stream
+        self._limiter = limiter
+        self._host = host
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if not isinstance(self._stream, httpx.AsyncByteStream):
+            raise TypeError("Attempted to read a synchronous response body asynchronously")  # noqa: TRY003
+        async for chunk in self._stream:
+            await self._limiter.consume(self._host, len(chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        if isinstance(self._stream, httpx.AsyncByteStream):
+            await self._stream.aclose()
@@ -13,10 +13,6 @@ from logging.handlers import QueueHandler, QueueListener
 from queue import Queue
 from re import Pattern
 
-import aiofiles
-import dacite
-import httpx
-import rich_click as click
 from rich import traceback
 from rich.console import Console
 from rich.logging import RichHandler
@@ -116,12 +112,18 @@ def setup(
     Returns:
         Tuple of configured root logger and the rich Console instance.
     """
-    suppress = [click, httpx, aiofiles, asyncio, json, dacite]
     console = Console()
 
     if not enable_traceback:
         sys.tracebacklimit = 0
     else:
+        # Only imported to hide their frames from tracebacks, so that plain runs do not pay for their import
+        import aiofiles
+        import dacite
+        import httpx
+        import rich_click as click
+
+        suppress = [click, httpx, aiofiles, asyncio, json, dacite]
         traceback.install(
             console=console,
             show_locals=False,
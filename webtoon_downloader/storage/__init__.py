@@ -1,13 +1,28 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
+from pathlib import Path
 from types import TracebackType
-from typing import Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
+from .blobs import Blob, BlobStore
 from .exceptions import StreamWriteError
 from .file import AioFolderWriter
-from .pdf import AioPdfWriter
-from .zip import AioFileBufferedZipWriter, AioZipWriter
+from .volume import AioVolumeChapterWriter, AioVolumeWriter
+from .zip import AioFileBufferedZipWriter, AioStreamingZipWriter, AioZipWriter
+
+if TYPE_CHECKING:
+    from .pdf import AioPdfWriter
+
+
+def __getattr__(name: str) -> Any:
+    # PyMuPDF and Pillow take longer to import than the rest of the package, so they are only imported with the
+    # PDF writer once it is used
+    if name == "AioPdfWriter":
+        from .pdf import AioPdfWriter
+
+        return AioPdfWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")  # noqa: TRY003
 
 
 @runtime_checkable
@@ -51,11 +66,37 @@ class AioWriter(Protocol):
         """
 
 
+@runtime_checkable
+class AioLinker(Protocol):
+    """
+    Protocol for writers able to write an existing file as an item without copying its bytes, such as
+    `AioFolderWriter` with hard links.
+    """
+
+    async def link(self, source: Path, item_name: str) -> int:  # pyright: ignore[reportReturnType]
+        """
+        Writes an existing file as an item.
+
+        Args:
+            source      : The file to write.
+            item_name   : The name of the item to be written.
+
+        Returns:
+            The number of bytes of the item.
+        """
+
+
 __all__ = [
     "AioFileBufferedZipWriter",
     "AioFolderWriter",
+    "AioLinker",
     "AioPdfWriter",
+    "AioStreamingZipWriter",
+    "AioVolumeChapterWriter",
+    "AioVolumeWriter",
     "AioWriter",
     "AioZipWriter",
+    "Blob",
+    "BlobStore",
     "StreamWriteError",
 ]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import secrets
+import shutil
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+SOURCES_FILENAME = "sources.jsonl"
+"""Name of the file of the blob store recording which blob each downloaded URL gave."""
+
+
+@dataclass(frozen=True)
+class Blob:
+    """
+    An image held by a `BlobStore`.
+
+    Attributes:
+        sha256  : The SHA-256 hex digest of the image, naming the blob.
+        size    : The number of bytes of the image.
+        suffix  : The file extension of the image, such as `.jpg`.
+    """
+
+    sha256: str
+    size: int
+    suffix: str
+
+
+@dataclass
+class _Source:
+    """Record of the blob a URL gave, for a variant of the image such as its quality and format."""
+
+    url: str
+    variant: str
+    sha256: str
+    size: int
+    suffix: str
+
+
+@dataclass
+class BlobStore:
+    """
+    Content-addressed store of page images, shared by the chapters and the series downloaded into it.
+
+    Each distinct image is stored once in `blobs/`, named after its SHA-256 digest, however many pages it appears
+    on. The store also records the blob every URL gave in `SOURCES_FILENAME`, as JSON lines, so that a URL already
+    downloaded is not fetched again. Both survive across runs.
+
+    Args:
+        directory: The directory holding the store. It is created on first use.
+    """
+
+    directory: Path
+
+    _sources: dict[tuple[str, str], Blob] = field(init=False, default_factory=dict)
+    _loaded: bool = field(init=False, default=False)
+    _lock: asyncio.Lock = field(init=False, default_factory=asyncio.Lock)
+
+    def path(self, blob: Blob) -> Path:
+        """Returns the path of the file holding a blob."""
+        return self.directory / "blobs" / blob.sha256[:2] / blob.sha256
+
+    async def lookup(self, url: str, variant: str) -> Blob | None:
+        """
+        Returns the blob a URL gave for a variant of its image, or None if it was not downloaded or its blob is gone.
+        """
+        async with self._lock:
+            await self._ensure_loaded()
+            blob = self._sources.get((url, variant))
+        if blob is None or not await asyncio.to_thread(self.path(blob).exists):
+            return None
+        return blob
+
+    async def put(self, data: bytes, url: str, variant: str, suffix: str) -> Blob:
+        """
+        Stores an image downloaded from a URL, unless the same image is already stored.
+
+        Args:
+            data    : The bytes of the image.
+            url     : The URL the image was downloaded from.
+            variant : The variant of the image, such as its quality and format.
+            suffix  : The file extension of the image.
+
+        Returns:
+            The blob holding the image.
+        """
+        blob = Blob(hashlib.sha256(data).hexdigest(), len(data), suffix)
+        # Blobs are content-addressed and renamed into place once complete, so they are written without the lock
+        await asyncio.to_thread(self._write_blob, blob, data)
+        async with self._lock:
+            await self._ensure_loaded()
+            await asyncio.to_thread(self._append_source, _Source(url, variant, blob.sha256, blob.size, suffix))
+            self._sources[url, variant] = blob
+        return blob
+
+    async def read(self, blob: Blob) -> bytes:
+        """Returns the bytes of a blob."""
+        return await asyncio.to_thread(self.path(blob).read_bytes)
+
+    async def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            await asyncio.to_thread(self._load_sources)
+            self._loaded = True
+
+    def _load_sources(self) -> None:
+        """Synchronously reads the sources file. When a URL was recorded more than once, the last record wins."""
+        path = self.directory / SOURCES_FILENAME
+        if not path.exists():
+            return
+        with path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    source = _Source(**json.loads(line))
+                except (ValueError, TypeError):
+                    log.debug("Blob store: skipping unreadable source record")
+                    continue
+                self._sources[source.url, source.variant] = Blob(source.sha256, source.size, source.suffix)
+        log.debug("Blob store: loaded %d sources", len(self._sources))
+
+    def _write_blob(self, blob: Blob, data: bytes) -> None:
+        """
+        Synchronously writes a blob, unless it is already stored. Concurrent writes of the same blob each write their
+        own temporary file, and the last one renamed into place wins, with the same bytes.
+        """
+        path = self.path(blob)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{path.name}.{os.getpid()}.{secrets.token_hex(4)}.part")
+        try:
+            partial.write_bytes(data)
+            partial.replace(path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def _append_source(self, source: _Source) -> None:
+        """Synchronously records the blob a URL gave."""
+        with (self.directory / SOURCES_FILENAME).open("a", encoding="utf-8") as file:
+            file.write(json.dumps(asdict(source)) + "\n")
+
+
+def link_or_copy(source: Path, destination: Path) -> int:
+    """
+    Synchronously hard-links a file to a destination, replacing it, or copies it where hard links are not supported,
+    such as across file systems.
+
+    Returns:
+        The size of the file.
+    """
+    partial = destination.with_name(f"{destination.name}.{os.getpid()}.part")
+    partial.unlink(missing_ok=True)
+    try:
+        os.link(source, partial)
+    except OSError:
+        shutil.copyfile(source, partial)
+    partial.replace(destination)
+    return destination.stat().st_size
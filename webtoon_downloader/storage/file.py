@@ -1,31 +1,159 @@
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+import asyncio
+import contextlib
+import os
+import secrets
+import threading
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from os import PathLike
 from pathlib import Path
 from types import TracebackType
 
-import aiofiles
-
+from .blobs import link_or_copy
 from .exceptions import stream_error_handler
 
+DEFAULT_WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+"""Number of bytes of a file buffered in memory before they are written. Most pages are written in a single call."""
+
+PARTIAL_SUFFIX = ".part"
+"""Suffix of the temporary name files are written under until they are complete."""
+
+WRITER_THREADS = 4
+"""Number of threads of the pool shared by the folder writers."""
+
+_writer_executor: ThreadPoolExecutor | None = None
+_writer_executor_lock = threading.Lock()
+
+
+def _get_writer_executor() -> ThreadPoolExecutor:
+    """Returns the thread pool shared by the folder writers, starting it on first use."""
+    global _writer_executor
+    with _writer_executor_lock:
+        if _writer_executor is None:
+            _writer_executor = ThreadPoolExecutor(max_workers=WRITER_THREADS, thread_name_prefix="folder-writer")
+        return _writer_executor
+
+
+def _iov_max() -> int:
+    """Returns the maximum number of buffers a single `os.writev` call accepts."""
+    try:
+        return os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 1024
+
+
+_IOV_MAX = _iov_max()
+
+
+def _write_all(fd: int, chunks: Sequence[bytes]) -> None:
+    """
+    Writes chunks to a file descriptor without joining them, with one `os.writev` call per `IOV_MAX` chunks.
+
+    Where `os.writev` is not available, such as on Windows, the chunks are joined and written with `os.write`.
+    Partial writes are resumed.
+    """
+    views = [memoryview(chunk) for chunk in chunks if chunk]
+    if not hasattr(os, "writev"):
+        views = [memoryview(b"".join(views))] if views else []
+    while views:
+        batch = views[:_IOV_MAX]
+        written = os.writev(fd, batch) if hasattr(os, "writev") else os.write(fd, batch[0])
+        done = 0
+        while done < len(batch) and written >= len(batch[done]):
+            written -= len(batch[done])
+            done += 1
+        del views[:done]
+        if written:
+            views[0] = views[0][written:]
+
+
+class _PartialFile:
+    """
+    File written from a thread pool under a temporary name, and renamed to its final name once complete.
+
+    The file is opened by its first write. Its operations hold a lock, so that a file discarded while a write is still
+    running in another thread is only closed once the write returns.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.partial_path = path.with_name(f"{path.name}.{os.getpid()}.{secrets.token_hex(4)}{PARTIAL_SUFFIX}")
+        self._fd: int | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def write(self, chunks: Sequence[bytes]) -> None:
+        """Appends chunks to the file."""
+        with self._lock:
+            self._write(chunks)
+
+    def commit(self, chunks: Sequence[bytes]) -> None:
+        """Appends the last chunks to the file, closes it and renames it to its final name."""
+        with self._lock:
+            try:
+                self._write(chunks)
+                fd, self._fd = self._fd, None
+                if fd is not None:
+                    os.close(fd)
+                os.replace(self.partial_path, self.path)
+                self._closed = True
+            except BaseException:
+                self._discard()
+                raise
+
+    def discard(self) -> None:
+        """Closes the file and removes it."""
+        with self._lock:
+            self._discard()
+
+    def _write(self, chunks: Sequence[bytes]) -> None:
+        if self._closed:
+            raise RuntimeError(f"Partial file {self.partial_path} is already closed")  # noqa: TRY003
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+            self._fd = os.open(self.partial_path, flags, 0o666)
+        _write_all(self._fd, chunks)
+
+    def _discard(self) -> None:
+        self._closed = True
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        with contextlib.suppress(FileNotFoundError):
+            self.partial_path.unlink()
+
 
 @dataclass
 class AioFolderWriter:
     """
     Asynchronous file writer for handling byte streams and writing them to files.
 
+    The chunks of a file are buffered in memory and written with a single `os.writev` call once the stream ends, or
+    each time `buffer_size` bytes are buffered, so that a page costs one thread pool round trip rather than one per
+    chunk. Files are written under a temporary name ending with `PARTIAL_SUFFIX` and renamed once complete, so that
+    an interrupted write never leaves a truncated file under the final name.
+
     Args:
-        container: The directory path where files will be written.
+        container   : The directory path where files will be written.
+        buffer_size : Number of bytes of a file buffered in memory before they are written.
+        executor    : Thread pool the files are written in. Defaults to a small pool shared by the folder writers,
+                      apart from the loop's default executor.
     """
 
     container: str | PathLike
+    buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE
+    executor: Executor | None = None
 
     _container: Path = field(init=False)
 
     def __post_init__(self) -> None:
         self._container = Path(self.container)
+        if self.buffer_size <= 0:
+            raise ValueError(f"Write buffer size must be positive, got {self.buffer_size}")  # noqa: TRY003
 
     @stream_error_handler
     async def __aenter__(self) -> AioFolderWriter:
@@ -47,14 +175,46 @@ class AioFolderWriter:
         Raises:
             StreamWriteError: If an error occurs during writing to the stream.
         """
-        full_path = self._container / item_name
-        full_path.parent.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        partial = _PartialFile(self._container / item_name)
+        chunks: list[bytes] = []
+        buffered = 0
         written = 0
-        async with aiofiles.open(full_path, mode="wb") as file:
+        try:
             async for chunk in stream:
-                await file.write(chunk)
-                written += len(chunk)
-        return written
+                chunks.append(chunk)
+                buffered += len(chunk)
+                if buffered >= self.buffer_size:
+                    await loop.run_in_executor(executor, partial.write, chunks)
+                    written += buffered
+                    chunks, buffered = [], 0
+            await loop.run_in_executor(executor, partial.commit, chunks)
+        except BaseException:
+            # Also run when cancelled: the temporary file is removed once any write still running in the pool returns
+            await asyncio.shield(loop.run_in_executor(executor, partial.discard))
+            raise
+        return written + buffered
+
+    @stream_error_handler
+    async def link(self, source: Path, item_name: str) -> int:
+        """
+        Writes an existing file as an item by hard-linking it, so that its bytes are not copied.
+
+        Args:
+            source      : The file to link, such as a blob of a `BlobStore`. It must not be modified afterwards.
+            item_name   : The name of the file to be written.
+
+        Returns:
+            The size of the file.
+        """
+        full_path = self._container / item_name
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), link_or_copy, source, full_path)
+
+    def _get_executor(self) -> Executor:
+        return self.executor if self.executor is not None else _get_writer_executor()
 
     @stream_error_handler
     async def __aexit__(
@@ -1,19 +1,39 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import hashlib
 import io
-from collections.abc import AsyncIterator
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
-from io import BytesIO
 from os import PathLike
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from types import TracebackType
-from typing import IO, NamedTuple
+from typing import IO, Any, NamedTuple, TypeVar, cast
 
 import fitz
 from PIL import Image
 
+from webtoon_downloader.core.imageinfo import read_image_size
+
 from .exceptions import stream_error_handler
 
+T = TypeVar("T")
+
+DEFAULT_REORDER_BUFFER_SIZE = 32 * 1024 * 1024
+"""Default number of bytes of out-of-order pages kept in memory before they are spilled to a temporary file."""
+
+DEFAULT_CHECKPOINT_SIZE = 16 * 1024 * 1024
+"""Default number of bytes of pages inserted into the document before it is saved to disk and released."""
+
+_NUMBER = re.compile(r"\d+")
+
 
 class ImageDimension(NamedTuple):
     """
@@ -28,114 +48,273 @@ class ImageDimension(NamedTuple):
     height: int
 
 
+class PageKey(NamedTuple):
+    """
+    Position of a page in the PDF, given by the numbers in its item name, such as `012_07.jpg` for page 7 of
+    chapter 12. Pages are ordered by the numbers before the last one, then by the last number, then by item name.
+
+    Args:
+        prefix  : The numbers of the item name before the last one, such as the chapter number.
+        number  : The last number of the item name, or infinity if it has no number.
+        name    : The item name of the page.
+    """
+
+    prefix: tuple[int, ...]
+    number: float
+    name: str
+
+    @classmethod
+    def from_name(cls, item_name: str) -> PageKey:
+        numbers = [int(number) for number in _NUMBER.findall(str(PurePosixPath(item_name).with_suffix("")))]
+        if not numbers:
+            return cls((), float("inf"), item_name)
+        return cls(tuple(numbers[:-1]), numbers[-1], item_name)
+
+
 class PageData(NamedTuple):
     """
     Represents the data for a page to be added to a PDF.
 
     Args:
-        name        : The name of the page.
-        stream      : The stream of image bytes.
+        key         : The position of the page in the PDF.
         dimension   : The dimensions of the image.
+        size        : The number of bytes of the image.
+        data        : The bytes of the image, or None if they were spilled to the temporary file.
+        offset      : The offset of the image bytes in the temporary file, if they were spilled.
     """
 
-    name: str
-    stream: BytesIO
+    key: PageKey
     dimension: ImageDimension
+    size: int
+    data: bytes | None = None
+    offset: int = 0
+
+
+def _decode_image_dimension(data: bytes) -> ImageDimension:
+    """Reads the dimensions of an image whose headers could not be parsed, by opening it with Pillow."""
+    with Image.open(io.BytesIO(data)) as img:
+        return ImageDimension(*img.size)
 
 
 @dataclass
 class AioPdfWriter:
     """
-    Asynchronous writer for creating PDFs from image streams.
+    Asynchronous writer for creating PDFs from image streams, without holding every page in memory.
+
+    Pages are inserted into the document as soon as the page before them has arrived, in the order given by the
+    numbers in their item name (see `PageKey`), so that the pages of several chapters can be written to the same
+    document. Pages arriving ahead of their turn wait in a reorder buffer, and are spilled to a
+    temporary file once the buffer holds more than `reorder_buffer_size` bytes. Image dimensions are read from the
+    image headers, without decoding the images.
+
+    The document is built in a temporary `.part` file, saved incrementally every `checkpoint_size` bytes of inserted
+    pages and reopened, so that the pages already saved are released from memory. It is moved to the container once
+    complete. Nothing is written if the writer exits with an error.
+
+    Identical images, such as the credits repeated at the end of every chapter of a volume, are embedded once and
+    referenced by each of their pages.
 
     Args:
-        container: The BytesIO or PathLike object where the PDF will be written.
+        container           : The BytesIO or PathLike object where the PDF will be written.
+        reorder_buffer_size : The number of bytes of out-of-order pages kept in memory.
+        checkpoint_size     : The number of bytes of inserted pages held in memory before the document is saved.
+        executor            : Optional thread pool the document is built in. Defaults to the loop's default executor.
     """
 
     container: io.BytesIO | IO[bytes] | PathLike[str]
+    reorder_buffer_size: int = DEFAULT_REORDER_BUFFER_SIZE
+    checkpoint_size: int = DEFAULT_CHECKPOINT_SIZE
+    executor: Executor | None = None
 
     _doc: fitz.Document = field(init=False)
-    _pages_data: list[PageData] = field(init=False)
+    _path: Path = field(init=False)
+    _temporary_directory: tempfile.TemporaryDirectory[str] | None = field(init=False, default=None)
+    _saved: bool = field(init=False, default=False)
+    _unsaved_size: int = field(init=False, default=0)
+    _inserted: list[PageKey] = field(init=False, default_factory=list)
+    _next_pages: dict[tuple[int, ...], int] = field(init=False, default_factory=dict)
+    _pending: dict[PageKey, PageData] = field(init=False, default_factory=dict)
+    _spill_file: IO[bytes] | None = field(init=False, default=None)
+    _spill_lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+    _flusher: asyncio.Task[None] | None = field(init=False, default=None)
+    _image_xrefs: dict[str, int] = field(init=False, default_factory=dict)
 
     @stream_error_handler
     async def __aenter__(self) -> AioPdfWriter:
         container = self.container
-        if isinstance(container, str):
-            Path(container).parent.mkdir(parents=True, exist_ok=True)
-        elif isinstance(container, PathLike):
-            fspath = container.__fspath__()
-            if isinstance(fspath, str):
-                Path(fspath).parent.mkdir(parents=True, exist_ok=True)
-        self._pages_data = []
+        if isinstance(container, str | PathLike) and isinstance(fspath := os.fspath(container), str):
+            destination = Path(fspath)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            self._path = destination.with_name(f"{destination.name}.part")
+        else:
+            self._temporary_directory = tempfile.TemporaryDirectory(prefix="webtoon-pdf-")
+            self._path = Path(self._temporary_directory.name) / "document.pdf"
         self._doc = fitz.open()
         return self
 
     @stream_error_handler
     async def write(self, stream: AsyncIterator[bytes], item_name: str) -> int:
         """
-        Writes an asynchronous byte stream to a PDF file.
+        Writes an image stream as a page of the PDF.
 
         Args:
             stream      : The asynchronous byte stream to write.
-            item_name   : The item name is only used for sorting the pages that are added to the PDF document.
+            item_name   : The item name is only used for ordering the pages of the PDF document.
 
         Returns:
             The total number of bytes written to the file.
         """
-        bytes_io_stream = BytesIO()
-        written = 0
-        async for chunk in stream:
-            bytes_io_stream.write(chunk)
-            written += len(chunk)
-        bytes_io_stream.seek(0)
-
-        # Determine image size
-        with Image.open(bytes_io_stream) as img:
-            img_width, img_height = img.size
-
-        # Reset stream position after reading
-        bytes_io_stream.seek(0)
-
-        # Store the image stream along with its item name and size
-        self._pages_data.append(
-            PageData(
-                name=item_name,
-                stream=bytes_io_stream,
-                dimension=ImageDimension(width=img_width, height=img_height),
-            )
-        )
-        return written
+        data = b"".join([chunk async for chunk in stream])
+        size = read_image_size(data)
+        dimension = ImageDimension(*size) if size else await self._run_in_executor(_decode_image_dimension, data)
 
-    @stream_error_handler
-    async def __aexit__(
-        self,
-        exc_type: type[BaseException] | None,
-        exc: BaseException | None,
-        traceback: TracebackType | None,
-    ) -> None:
-        """
-        Completes the PDF creation process by adding pages sorted by item name.
-        """
-        # Sort the stored page data by item name
-        self._pages_data.sort(key=lambda x: x[0])
-        # Add each image to the PDF
-        for page in self._pages_data:
-            self._add_image_to_pdf(page)
+        key = PageKey.from_name(item_name)
+        page = PageData(key, dimension, len(data), data)
+        is_early = key.number > self._next_pages.get(key.prefix, 1)
+        if is_early and self._buffered_size() + len(data) > self.reorder_buffer_size:
+            page = await self._run_in_executor(self._spill, page, data)
+        self._pending[key] = page
 
-        if self._doc.page_count > 0:
-            self._doc.save(self.container)
-        self._doc.close()
+        self._schedule_flush()
+        return len(data)
+
+    async def _run_in_executor(self, func: Callable[..., T], *args: Any) -> T:
+        """Runs a blocking function in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def _schedule_flush(self) -> None:
+        """Starts inserting the pages whose turn has come, unless a previous insertion failed."""
+        if self._flusher is not None and self._flusher.done() and (error := self._flusher.exception()):
+            raise error
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        """Inserts the pages whose turn has come, until none are left."""
+        while ready := self._pop_ready():
+            await self._run_in_executor(self._insert_pages, ready)
+
+    def _pop_ready(self) -> list[PageData]:
+        """Removes the pages numbered before the first missing page number of their prefix from the reorder buffer."""
+        arrived = {(key.prefix, key.number) for key in self._pending}
+        for prefix in {key.prefix for key in self._pending}:
+            while (prefix, self._next_pages.get(prefix, 1)) in arrived:
+                self._next_pages[prefix] = self._next_pages.get(prefix, 1) + 1
+        ready = sorted(page for key, page in self._pending.items() if self._is_ready(key))
+        for page in ready:
+            del self._pending[page.key]
+        return ready
+
+    def _is_ready(self, key: PageKey) -> bool:
+        """Returns True if every page numbered before the page of the same prefix has arrived."""
+        return key.number < self._next_pages.get(key.prefix, 1)
+
+    def _buffered_size(self) -> int:
+        """Returns the number of bytes of the pages waiting in memory for their turn."""
+        return sum(page.size for page in self._pending.values() if page.data is not None)
+
+    def _spill(self, page: PageData, data: bytes) -> PageData:
+        """Appends the image of a page to the temporary file, returning the page without its bytes."""
+        with self._spill_lock:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix="webtoon-pdf-")  # noqa: SIM115
+            offset = self._spill_file.seek(0, os.SEEK_END)
+            self._spill_file.write(data)
+        return page._replace(data=None, offset=offset)
+
+    def _read(self, page: PageData) -> bytes:
+        """Returns the image of a page, reading it back from the temporary file if it was spilled."""
+        if page.data is not None:
+            return page.data
+        with self._spill_lock:
+            spill_file = cast(IO[bytes], self._spill_file)
+            spill_file.seek(page.offset)
+            return spill_file.read(page.size)
+
+    def _insert_pages(self, pages: list[PageData]) -> None:
+        """Synchronously inserts pages at their position in the document, saving it once enough was inserted."""
+        for page in pages:
+            self._add_image_to_pdf(page)
+            self._unsaved_size += page.size
+            if self._unsaved_size >= self.checkpoint_size:
+                self._checkpoint()
 
     def _add_image_to_pdf(self, page_data: PageData) -> None:
         """
-        Adds an image using its original size to the PDF document.
+        Adds an image using its original size to the PDF document, at the position given by its key.
+
+        An image already embedded in the document is referenced rather than embedded again.
 
         Args:
             page_data: The data of the page to be added.
         """
-        page = self._doc.new_page(-1, width=page_data.dimension.width, height=page_data.dimension.height)  # pyright: ignore[reportAttributeAccessIssue]
+        index = bisect.bisect(self._inserted, page_data.key)
+        self._inserted.insert(index, page_data.key)
+        width, height = page_data.dimension
+        page = self._doc.new_page(index, width=width, height=height)  # pyright: ignore[reportAttributeAccessIssue]
+        rect = fitz.Rect(0, 0, width, height)
+        data = self._read(page_data)
+        digest = hashlib.sha256(data).hexdigest()
+        if (xref := self._image_xrefs.get(digest)) is not None:
+            page.insert_image(rect, xref=xref)
+        else:
+            self._image_xrefs[digest] = page.insert_image(rect, stream=data)
+
+    def _checkpoint(self) -> None:
+        """Saves the document to the `.part` file and reopens it, releasing the pages held in memory."""
+        self._save()
+        self._doc.close()
+        self._doc = fitz.open(self._path)
 
-        page.insert_image(
-            fitz.Rect(0, 0, page_data.dimension.width, page_data.dimension.height),
-            stream=page_data.stream,
-        )
+    def _save(self) -> None:
+        if self._saved:
+            self._doc.saveIncr()
+        else:
+            self._doc.save(self._path)
+            self._saved = True
+        self._unsaved_size = 0
+
+    def _complete(self) -> None:
+        """Synchronously inserts the remaining pages, saves the document and moves it to the container."""
+        self._insert_pages(sorted(self._pending.values()))
+        self._pending.clear()
+        if self._doc.page_count == 0:
+            return
+
+        self._save()
+        self._doc.close()
+        if isinstance(self.container, str | PathLike):
+            self._path.replace(self.container)
+        else:
+            with self._path.open("rb") as document:
+                shutil.copyfileobj(document, self.container)
+
+    def _cleanup(self) -> None:
+        """Releases the document and the temporary files."""
+        if not self._doc.is_closed:
+            self._doc.close()
+        self._path.unlink(missing_ok=True)
+        if self._spill_file is not None:
+            self._spill_file.close()
+        if self._temporary_directory is not None:
+            self._temporary_directory.cleanup()
+
+    @stream_error_handler
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Completes the PDF creation process by adding the remaining pages sorted by item name.
+        """
+        try:
+            if self._flusher is not None:
+                # The pages being inserted must be done with the document before it is released
+                await asyncio.gather(self._flusher, return_exceptions=exc_type is not None)
+            if exc_type is None:
+                await self._run_in_executor(self._complete)
+        finally:
+            self._cleanup()
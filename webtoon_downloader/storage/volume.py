@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import TYPE_CHECKING, cast
+
+from .exceptions import StreamWriteError, stream_error_handler
+
+if TYPE_CHECKING:
+    from . import AioWriter
+
+
+@dataclass
+class AioVolumeWriter:
+    """
+    Shares a single writer between the chapters of a volume, so that they are all stored in one file.
+
+    Each chapter writes through its own `AioVolumeChapterWriter`, returned by `chapter()`, which can be used like any
+    other writer. The volume writer is entered along with the first chapter. Once `chapters` chapters have exited, it
+    is exited in a background task, so that finalizing the volume file overlaps with the download of the next volume.
+    Use `wait_closed` to wait for the volume file to be complete.
+
+    If any chapter exits with an error, the volume writer is exited with that error too.
+
+    Args:
+        writer      : The writer of the volume file.
+        chapters    : The number of chapters of the volume.
+        on_enter    : Optional callback invoked with the writer once entered, e.g. to write volume metadata.
+    """
+
+    writer: AioWriter
+    chapters: int
+    on_enter: Callable[[AioWriter], Awaitable[None]] | None = None
+
+    _entered: asyncio.Task[None] | None = field(init=False, default=None)
+    _exited: int = field(init=False, default=0)
+    _error: BaseException | None = field(init=False, default=None)
+    _closing: asyncio.Task[None] | None = field(init=False, default=None)
+
+    def chapter(self) -> AioVolumeChapterWriter:
+        """Returns the writer of a chapter of the volume."""
+        return AioVolumeChapterWriter(self)
+
+    @property
+    def closed(self) -> bool:
+        """True once the volume writer was exited, or is being exited."""
+        return self._closing is not None
+
+    async def _enter(self) -> None:
+        if self._entered is None:
+            self._entered = asyncio.create_task(self._enter_writer())
+        await asyncio.shield(self._entered)
+
+    async def _enter_writer(self) -> None:
+        await self.writer.__aenter__()
+        if self.on_enter:
+            await self.on_enter(self.writer)
+
+    def _exit_chapter(self, exc: BaseException | None) -> None:
+        self._exited += 1
+        if exc is not None and self._error is None:
+            self._error = exc
+        if self._exited >= self.chapters:
+            self._close()
+
+    def _close(self) -> None:
+        """Starts exiting the volume writer, unless it is already being exited."""
+        if self._closing is None:
+            self._closing = asyncio.create_task(self._exit_writer())
+
+    async def _exit_writer(self) -> None:
+        if self._entered is None:
+            return
+        await self._entered
+        error = self._error
+        await self.writer.__aexit__(type(error) if error else None, error, error.__traceback__ if error else None)
+        if error is not None:
+            raise StreamWriteError(f"Volume is incomplete: {error}") from error  # noqa: TRY003
+
+    async def wait_closed(self) -> None:
+        """
+        Waits for the volume writer to be exited once all its chapters have exited.
+
+        Raises:
+            StreamWriteError: If a chapter of the volume failed, or the volume could not be finalized.
+        """
+        if self._closing is None:
+            raise StreamWriteError(  # noqa: TRY003
+                f"Volume is incomplete: {self._exited} of {self.chapters} chapters written"
+            )
+        await asyncio.shield(self._closing)
+
+    async def abort(self) -> None:
+        """Exits the volume writer as failed if some of its chapters never exited, and waits for it to be exited."""
+        if self._closing is None:
+            if self._error is None:
+                self._error = StreamWriteError(f"{self.chapters - self._exited} chapters were not written")
+            self._close()
+        await asyncio.gather(cast(asyncio.Task[None], self._closing), return_exceptions=True)
+
+
+@dataclass
+class AioVolumeChapterWriter:
+    """
+    Writer of a single chapter of a volume, sharing the volume's writer. See `AioVolumeWriter`.
+
+    Args:
+        volume: The volume the chapter belongs to.
+    """
+
+    volume: AioVolumeWriter
+
+    @stream_error_handler
+    async def __aenter__(self) -> AioVolumeChapterWriter:
+        await self.volume._enter()
+        return self
+
+    async def write(self, stream: AsyncIterator[bytes], item_name: str) -> int:
+        """
+        Writes a stream of bytes to the volume.
+
+        Args:
+            stream      : An asynchronous iterator yielding bytes to be written.
+            item_name   : The name of the item in the volume. It must be unique across the chapters of the volume.
+
+        Returns:
+            The number of bytes written.
+        """
+        return await self.volume.writer.write(stream, item_name)
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.volume._exit_chapter(exc)
@@ -3,13 +3,15 @@ from __future__ import annotations
 import asyncio
 import io
 import tempfile
+import time
 import zipfile
 from collections.abc import AsyncIterator
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from os import PathLike
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from types import TracebackType
-from typing import Literal, TypeAlias
+from typing import Literal, NamedTuple, TypeAlias
 
 import aiofiles
 
@@ -28,6 +30,11 @@ Container type for Zip files
 - `io.BytesIO`: Any Byte like object
 """
 
+DEFAULT_COMPRESSED_SUFFIXES = frozenset({".xml", ".txt", ".json"})
+"""
+Suffixes of the text members that are worth compressing. Images are already compressed and are stored as is.
+"""
+
 
 def _open_zip_file(container: ZipContainer, mode: ZipWriteMode) -> zipfile.ZipFile:
     """Returns a ZipFile object from the provided container type and file open mode"""
@@ -50,10 +57,12 @@ class AioZipWriter:
     Attributes:
         container   : The path where the in-memory ZIP archive will be saved upon completion.
         mode        : The mode for creating the ZIP archive.
+        executor    : Optional thread pool the archive is written in. Defaults to the loop's default executor.
     """
 
     container: ZipContainer
     mode: ZipWriteMode = "w"
+    executor: Executor | None = None
 
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     _zip_file: zipfile.ZipFile = field(init=False)
@@ -75,16 +84,12 @@ class AioZipWriter:
         Returns:
             The number of bytes written.
         """
-        data = b""
-        written = 0
-
-        async for chunk in stream:
-            data += chunk
-            written += len(chunk)
+        data = b"".join([chunk async for chunk in stream])
+        written = len(data)
 
         async with self._lock:
             loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, self._zip_file.writestr, item_name, data)
+            await loop.run_in_executor(self.executor, self._zip_file.writestr, item_name, data)
 
         return written
 
@@ -107,10 +112,12 @@ class AioFileBufferedZipWriter(AioZipWriter):
     Attributes:
         container   : The path to the ZIP file to be created or modified.
         mode        : The mode for creating the ZIP archive.
+        executor    : Optional thread pool the archive is written in. Defaults to the loop's default executor.
     """
 
     container: ZipContainer
     mode: ZipWriteMode = "w"
+    executor: Executor | None = None
 
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     _zip_file: zipfile.ZipFile = field(init=False)
@@ -139,7 +146,7 @@ class AioFileBufferedZipWriter(AioZipWriter):
             self._temp_files.append(temp_file)
 
         try:
-            async with aiofiles.open(temp_file, mode="wb") as file:
+            async with aiofiles.open(temp_file, mode="wb", executor=self.executor) as file:
                 async for chunk in stream:
                     await file.write(chunk)
                     written += len(chunk)
@@ -163,7 +170,7 @@ class AioFileBufferedZipWriter(AioZipWriter):
 
         async with self._lock:
             loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, _write_to_zip)
+            await loop.run_in_executor(self.executor, _write_to_zip)
 
     @stream_error_handler
     async def __aexit__(
@@ -176,3 +183,146 @@ class AioFileBufferedZipWriter(AioZipWriter):
         # Cleanup of temporary files, if any were not handled already
         for temp_file in self._temp_files:
             temp_file.unlink(missing_ok=True)
+
+
+class _PendingZipEntry(NamedTuple):
+    """
+    An entry waiting to be written to the ZIP archive.
+
+    Args:
+        name    : The name of the entry inside the archive.
+        chunks  : The chunks of the entry's content, in order.
+        done    : Future resolved once the entry is written to the archive.
+    """
+
+    name: str
+    chunks: list[bytes]
+    done: asyncio.Future[None]
+
+
+@dataclass
+class AioStreamingZipWriter:
+    """
+    An asynchronous writer for creating ZIP and CBZ archives, tuned for already-compressed images.
+
+    The chunks of an entry are collected in memory until its stream ends, then written one by one into the archive,
+    without being concatenated into a single buffer first. Image members are written with `ZIP_STORED` since
+    deflating JPEG/PNG data costs CPU time for a negligible gain, and only members whose suffix is in
+    `compressed_suffixes` (such as `ComicInfo.xml`) are deflated.
+
+    Instead of every write waiting on a lock for its turn, completed entries are queued and a single flusher writes
+    everything queued so far in page order, in one executor call. The central directory is sorted by name on close,
+    so archive readers list the pages in order regardless of the order they finished downloading in.
+
+    Attributes:
+        container           : The path or buffer where the ZIP archive will be written.
+        mode                : The mode for creating the ZIP archive.
+        compressed_suffixes : Suffixes of the members to compress with `ZIP_DEFLATED`.
+        executor            : Optional thread pool the archive is written in. Defaults to the loop's default executor.
+    """
+
+    container: ZipContainer
+    mode: ZipWriteMode = "w"
+    compressed_suffixes: frozenset[str] = DEFAULT_COMPRESSED_SUFFIXES
+    executor: Executor | None = None
+
+    _zip_file: zipfile.ZipFile = field(init=False)
+    _pending: list[_PendingZipEntry] = field(init=False, default_factory=list)
+    _flusher: asyncio.Task[None] | None = field(init=False, default=None)
+
+    @stream_error_handler
+    async def __aenter__(self) -> AioStreamingZipWriter:
+        self._zip_file = _open_zip_file(self.container, self.mode)
+        return self
+
+    @stream_error_handler
+    async def write(self, stream: AsyncIterator[bytes], item_name: str) -> int:
+        """
+        Asynchronously writes the given byte stream as a member of the ZIP archive.
+
+        Args:
+            stream      : An asynchronous iterator yielding bytes to be written.
+            item_name   : The name of the member to be created inside the ZIP archive.
+
+        Returns:
+            The number of bytes written.
+        """
+        chunks = [chunk async for chunk in stream]
+        done = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingZipEntry(item_name, chunks, done))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+
+        await done
+        return sum(len(chunk) for chunk in chunks)
+
+    async def _flush(self) -> None:
+        """Writes the queued entries in page order, until none are left."""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch = sorted(self._pending, key=lambda entry: str(entry.name))
+            self._pending = []
+            try:
+                errors = await loop.run_in_executor(self.executor, self._write_entries, batch)
+            except BaseException as exc:
+                # Such as a pool already shut down: the writes waiting on the batch, and on the entries queued since,
+                # fail rather than wait forever
+                self._fail_pending([*batch, *self._pending], exc)
+                self._pending = []
+                raise
+            for entry, error in zip(batch, errors, strict=True):
+                if entry.done.done():
+                    continue
+                if error is None:
+                    entry.done.set_result(None)
+                else:
+                    entry.done.set_exception(error)
+
+    @staticmethod
+    def _fail_pending(entries: list[_PendingZipEntry], exc: BaseException) -> None:
+        """Fails the entries not written yet with the given error, or cancels them if the flusher was cancelled."""
+        for entry in entries:
+            if entry.done.done():
+                continue
+            if isinstance(exc, asyncio.CancelledError):
+                entry.done.cancel()
+            else:
+                entry.done.set_exception(exc)
+
+    def _write_entries(self, entries: list[_PendingZipEntry]) -> list[Exception | None]:
+        """Synchronously writes the given entries to the archive, returning the error of each entry if any."""
+        errors: list[Exception | None] = []
+        for entry in entries:
+            try:
+                self._write_entry(entry)
+                errors.append(None)
+            except Exception as exc:
+                errors.append(exc)
+        return errors
+
+    def _write_entry(self, entry: _PendingZipEntry) -> None:
+        """Synchronously streams the chunks of an entry into the archive."""
+        zinfo = zipfile.ZipInfo(entry.name, date_time=time.localtime(time.time())[:6])
+        if PurePosixPath(entry.name).suffix.lower() in self.compressed_suffixes:
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+        else:
+            zinfo.compress_type = zipfile.ZIP_STORED
+
+        with self._zip_file.open(zinfo, mode="w") as member:
+            for chunk in entry.chunks:
+                member.write(chunk)
+
+    @stream_error_handler
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        try:
+            if self._flusher is not None:
+                await self._flusher
+        finally:
+            # Also run when the flusher failed, so that the archive and its file are closed
+            self._zip_file.filelist.sort(key=lambda info: info.filename)
+            self._zip_file.close()
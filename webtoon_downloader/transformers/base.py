@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 
 class AioImageTransformer(Protocol):
@@ -18,3 +18,20 @@ class AioImageTransformer(Protocol):
         Returns:
             The transformed image stream and modified target name.
         """
+
+
+@runtime_checkable
+class AioBufferTransformer(Protocol):
+    """Protocol method to transform a fully downloaded image buffer and modify its name."""
+
+    async def transform_buffer(self, image_buffer: bytes, target_name: str) -> tuple[bytes, str]:
+        """
+        Transforms and returns target image and name, without splitting the image into chunks.
+
+        Args:
+            image_buffer    : The bytes of the image.
+            target_name     : The target file name for the image.
+
+        Returns:
+            The transformed image bytes and modified target name.
+        """
@@ -6,9 +6,16 @@ from collections.abc import AsyncIterator, Callable
 from dataclasses import dataclass, field
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
-from PIL import Image
+from webtoon_downloader.core.imageinfo import sniff_image_format
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from PIL import Image
+
+    from webtoon_downloader.transformers.pool import ProcessPoolTranscoder
 
 log = logging.getLogger(__name__)
 
@@ -41,18 +48,79 @@ async def _bytesio_to_async_gen(bytes_io: BytesIO, chunk_size: int = 1024) -> As
         yield chunk
 
 
+def has_transparency(image: Image.Image) -> bool:
+    """Returns True if the image has an alpha channel or a transparent color."""
+    return (
+        # modes that include transparency
+        image.mode in ("RGBA", "LA", "PA", "RGBa", "La")
+        # transparency specified in info attribute
+        or (image.mode in ("1", "L", "I", "P", "RGB") and "transparency" in image.info)
+    )
+
+
+def transcode_image(image_buffer: bytes | memoryview, target_format: _ValidImageFormats) -> bytes:
+    """
+    Synchronously converts an image to the target format.
+
+    This is a module level function so that it can also run in worker processes.
+
+    Args:
+        image_buffer    : The bytes of the image.
+        target_format   : The format to convert the image to.
+
+    Returns:
+        The bytes of the converted image.
+    """
+    # Pillow is imported on first use, since images in the target format are never decoded
+    from PIL import Image
+
+    with Image.open(BytesIO(image_buffer)) as source:
+        image: Image.Image = source
+        if target_format == "JPEG":
+            # converts transparency to white if source is transparent
+            if has_transparency(image):
+                log.warning("Image has transparency that will be discarded when converting to JPEG")
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.split()[3])  # use alpha channel as mask
+                image = background
+            else:
+                image = image.convert("RGB")
+        output_stream = BytesIO()
+        image.save(output_stream, format=target_format)
+        return output_stream.getvalue()
+
+
+async def _buffer_to_async_gen(buffer: bytes) -> AsyncIterator[bytes]:
+    """
+    Wraps a buffer in an asynchronous generator yielding it as a single chunk.
+
+    Args:
+        buffer: The bytes to yield.
+
+    Yields:
+        The whole buffer, once.
+    """
+    yield buffer
+
+
 @dataclass
 class AioImageFormatTransformer:
     """
     Transformer class for converting image formats asynchronously.
 
     Args:
-        target_format: The target image format to convert to.
+        target_format   : The target image format to convert to.
+        transcoder      : Optional process pool to convert images in. Defaults to `executor`.
+        executor        : Optional thread pool to convert images in. Defaults to the event loop's default executor.
     """
 
     target_format: ImageFormat
+    transcoder: ProcessPoolTranscoder | None = None
+    executor: Executor | None = None
 
     _target_format: _ValidImageFormats = field(init=False)
+    _pending: int = field(init=False, default=0)
 
     def __post_init__(self) -> None:
         if self.target_format.upper() in ["JPG", "JPEG"]:
@@ -60,6 +128,11 @@ class AioImageFormatTransformer:
         else:
             self._target_format = "PNG"
 
+    @property
+    def pending(self) -> int:
+        """The number of images waiting to be converted or being converted."""
+        return self._pending
+
     async def transform(self, image_stream: AsyncIterator[bytes], target_name: str) -> tuple[AsyncIterator[bytes], str]:
         """
         Transforms the format of the given image stream to the target format and updates the target name if necessary.
@@ -71,76 +144,66 @@ class AioImageFormatTransformer:
         Returns:
             The transformed image stream and the updated target name.
         """
-        target_name = self._update_target_name(target_name)
-        bytes_io_stream = BytesIO()
-        async for chunk in image_stream:
-            bytes_io_stream.write(chunk)
-        bytes_io_stream.seek(0)
+        image_buffer = b"".join([chunk async for chunk in image_stream])
+        transformed_buffer, target_name = await self.transform_buffer(image_buffer, target_name)
+        return _buffer_to_async_gen(transformed_buffer), target_name
 
-        # Determine if transformation is necessary
-        transform_needed = await self._run_in_executor(self._is_transformation_needed, bytes_io_stream)
+    async def transform_buffer(self, image_buffer: bytes, target_name: str) -> tuple[bytes, str]:
+        """
+        Transforms the format of the given image buffer to the target format and updates the target name if necessary.
 
-        if transform_needed:
-            log.debug("Running image conversion to %s", self.target_format)
-            transformed_stream = await self._run_in_executor(self._sync_transform, bytes_io_stream)
-        else:
-            log.debug('No transformation needed to convert to %s the target "%s"', self.target_format, target_name)
-            transformed_stream = bytes_io_stream
-            transformed_stream.seek(0)
+        When the image is already in the target format, the buffer is returned as is, without being copied or decoded.
 
-        return _bytesio_to_async_gen(transformed_stream), target_name
+        Args:
+            image_buffer    : The bytes of the image.
+            target_name     : The initial target name of the image.
 
-    def _is_transformation_needed(self, image_stream: BytesIO) -> bool:
+        Returns:
+            The transformed image bytes and the updated target name.
+        """
+        target_name = self._update_target_name(target_name)
+        if not self._is_transformation_needed(image_buffer):
+            log.debug('No transformation needed to convert to %s the target "%s"', self.target_format, target_name)
+            return image_buffer, target_name
+
+        log.debug("Running image conversion to %s", self.target_format)
+        self._pending += 1
+        try:
+            if self.transcoder is not None:
+                transformed_buffer = await self.transcoder.transcode(image_buffer, self._target_format)
+            else:
+                transformed_buffer = await self._run_in_executor(self._sync_transform, image_buffer)
+        finally:
+            self._pending -= 1
+        return transformed_buffer, target_name
+
+    def _is_transformation_needed(self, image_buffer: bytes) -> bool:
         """
-        Determines if a transformation to the target format is needed for the image.
+        Determines if a transformation to the target format is needed for the image, by reading its magic bytes.
 
         Args:
-            image_stream: The stream of bytes representing the image.
+            image_buffer: The bytes of the image.
 
         Returns:
-            True if the image format is different from the target format, False otherwise.
+            True if the image format is different from the target format or unknown, False otherwise.
         """
+        return sniff_image_format(image_buffer) != self._target_format
 
-        try:
-            with Image.open(image_stream) as image:
-                return image.format != self._target_format
-        except OSError:
-            return True  # Proceed with transformation if format detection fails
-
-    def _sync_transform(self, image_stream: BytesIO) -> BytesIO:
+    def _sync_transform(self, image_buffer: bytes) -> bytes:
         """
         Synchronously transforms the image format.
 
         Args:
-            image_stream: The stream of bytes representing the image.
+            image_buffer: The bytes of the image.
 
         Returns:
-            BytesIO stream of the transformed image.
+            The bytes of the transformed image.
         """
-        with Image.open(image_stream) as image:
-            if self._target_format == "JPEG":
-                # converts transparency to white if source is transparent
-                if self.has_transparency(image):
-                    log.warning("Image has transparency that will be discarded when converting to JPEG")
-                    image = image.convert("RGBA")
-                    background = Image.new("RGB", image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[3])  # use alpha channel as mask
-                    image = background
-                else:
-                    image = image.convert("RGB")
-            output_stream = BytesIO()
-            image.save(output_stream, format=self._target_format)
-            output_stream.seek(0)
-            return output_stream
+        return transcode_image(image_buffer, self._target_format)
 
     @staticmethod
     def has_transparency(image: Image.Image) -> bool:
-        return (
-            # modes that include transparency
-            image.mode in ("RGBA", "LA", "PA", "RGBa", "La")
-            # transparency specified in info attribute
-            or (image.mode in ("1", "L", "I", "P", "RGB") and "transparency" in image.info)
-        )
+        return has_transparency(image)
 
     def _update_target_name(self, target_name: str) -> str:
         """
@@ -155,9 +218,9 @@ class AioImageFormatTransformer:
         return str(Path(target_name).with_suffix(self._target_format_suffix()))
 
     async def _run_in_executor(self, func: Callable, *args: Any) -> Any:
-        """Executes a function in anexecutor"""
+        """Executes a function in the executor"""
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, func, *args)
+        return await loop.run_in_executor(self.executor, func, *args)
 
     def _target_format_suffix(self) -> str:
         """Returns the file suffix representation for the target format"""
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import cast
+
+from webtoon_downloader.transformers.image import _ValidImageFormats, transcode_image
+
+log = logging.getLogger(__name__)
+
+
+def _view(block: SharedMemory) -> memoryview:
+    """Returns the buffer of an attached shared memory block."""
+    return cast(memoryview, block.buf)
+
+
+def _transcode_shared(input_name: str, input_size: int, target_format: _ValidImageFormats) -> bytes:
+    """
+    Worker entry point transcoding an image held in shared memory.
+
+    The input block is owned by the parent process, which keeps it open until the conversion returns. The converted
+    image is returned through the pool's result pipe rather than a block created by the worker, since on Windows a
+    block is destroyed as soon as its last handle is closed, before the parent could attach to it.
+
+    Args:
+        input_name      : Name of the shared memory block holding the source image.
+        input_size      : Size of the source image in bytes. The block may be larger than the image.
+        target_format   : The format to convert the image to.
+
+    Returns:
+        The bytes of the converted image.
+    """
+    source = SharedMemory(name=input_name)
+    try:
+        with _view(source)[:input_size] as image_view:
+            return transcode_image(image_view, target_format)
+    finally:
+        source.close()
+
+
+@dataclass
+class ProcessPoolTranscoder:
+    """
+    Transcodes images in a pool of worker processes, so that decoding and encoding run in parallel
+    instead of contending for the GIL with the event loop.
+
+    Source images are handed to the workers through shared memory blocks owned by the parent process rather than
+    being pickled through the pool's pipes. Converted images come back through the pool's result pipe. At most `max_in_flight` images are queued or being converted at once,
+    which bounds the memory held by pending conversions.
+
+    Attributes:
+        workers         : Number of worker processes. Defaults to the number of CPUs.
+        max_in_flight   : Maximum number of images submitted to the pool at once. Defaults to twice the number of workers.
+    """
+
+    workers: int | None = None
+    max_in_flight: int | None = None
+
+    _executor: ProcessPoolExecutor | None = field(init=False, default=None)
+    _semaphore: asyncio.Semaphore = field(init=False)
+    _in_flight: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        if self.workers is None:
+            self.workers = os.cpu_count() or 1
+        if self.workers <= 0:
+            raise ValueError(f"Number of transcoding workers must be positive, got {self.workers}")  # noqa: TRY003
+        if self.max_in_flight is None:
+            self.max_in_flight = self.workers * 2
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    @property
+    def in_flight(self) -> int:
+        """The number of images currently queued or being converted by the pool."""
+        return self._in_flight
+
+    async def transcode(self, image_buffer: bytes, target_format: _ValidImageFormats) -> bytes:
+        """
+        Converts an image to the target format in a worker process.
+
+        Args:
+            image_buffer    : The bytes of the image.
+            target_format   : The format to convert the image to.
+
+        Returns:
+            The bytes of the converted image.
+        """
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                return await self._transcode(image_buffer, target_format)
+            finally:
+                self._in_flight -= 1
+
+    async def _transcode(self, image_buffer: bytes, target_format: _ValidImageFormats) -> bytes:
+        loop = asyncio.get_running_loop()
+        source = SharedMemory(create=True, size=max(1, len(image_buffer)))
+        try:
+            _view(source)[: len(image_buffer)] = image_buffer
+            future = loop.run_in_executor(
+                self._get_executor(), _transcode_shared, source.name, len(image_buffer), target_format
+            )
+            return await future
+        finally:
+            source.close()
+            source.unlink()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Returns the process pool, starting it on first use."""
+        if self._executor is None:
+            # Workers must share the parent's resource tracker, otherwise the input blocks they attach to
+            # would be reported as leaked, and unlinked a second time, when they exit.
+            resource_tracker.ensure_running()
+            log.debug("Starting image transcoding pool with %d workers", self.workers)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stops the worker processes. The pool is restarted if the transcoder is used again."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None